@@ -0,0 +1,27 @@
+import argparse
+
+from convert_to_json import export_data
+from ndcp import WORKBOOK_PATH
+from ndcp.site_build import DOCS_DIR, SITE_DIR, build_site
+
+parser = argparse.ArgumentParser(description='Build a fingerprinted, precompressed copy of the docs site.')
+parser.add_argument('--src', default=DOCS_DIR, help='site sources (default: docs/)')
+parser.add_argument('--out', default=SITE_DIR, help='output directory, replaced on every build (default: build/site/)')
+parser.add_argument('--skip-data', action='store_true',
+                    help='use the data files already in docs/data instead of regenerating them from the workbook')
+parser.add_argument('--require-data', action='store_true',
+                    help='fail when the workbook is missing instead of building without the dashboard data')
+parser.add_argument('--no-precompress', action='store_true',
+                    help='skip the .gz/.br siblings (for hosts such as GitHub Pages that never serve them)')
+args = parser.parse_args()
+
+# The dashboard data is generated from the NDCP workbook, never committed
+if not args.skip_data:
+    if WORKBOOK_PATH.exists():
+        export_data(WORKBOOK_PATH, fmt='binary')
+    elif args.require_data:
+        parser.error(f"{WORKBOOK_PATH} not found; the dashboard data cannot be generated")
+    else:
+        print(f"{WORKBOOK_PATH} not found; building without regenerating docs/data")
+
+build_site(args.src, args.out, precompress=not args.no_precompress)
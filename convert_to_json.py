@@ -1,39 +1,98 @@
-import pandas as pd
+import argparse
 import json
 
-# Read the Excel file
-df = pd.read_excel('data/nationaldatabaseofchildcareprices.xlsx')
-
-# Process data for visualization
-state_data = df.groupby('State_Abbreviation').agg({
-    'MCInfant': 'mean',
-    'MCToddler': 'mean',
-    'MCPreschool': 'mean',
-    'MHI_2018': 'mean',
-    'TotalPop': 'mean',
-    'H_Under6_BothWork': 'sum'
-}).reset_index()
-
-# Calculate additional metrics
-state_data['Annual_Cost_Infant'] = state_data['MCInfant'] * 12
-state_data['Cost_Burden'] = (state_data['Annual_Cost_Infant'] / state_data['MHI_2018']) * 100
-state_data['Working_Parent_Ratio'] = (state_data['H_Under6_BothWork'] / state_data['TotalPop']) * 100
-
-# Create the final data structure
-visualization_data = {
-    'states': state_data['State_Abbreviation'].tolist(),
-    'costs': {
-        'infant': state_data['MCInfant'].round(2).tolist(),
-        'toddler': state_data['MCToddler'].round(2).tolist(),
-        'preschool': state_data['MCPreschool'].round(2).tolist()
-    },
-    'metrics': {
-        'annual_cost': state_data['Annual_Cost_Infant'].round(2).tolist(),
-        'cost_burden': state_data['Cost_Burden'].round(2).tolist(),
-        'working_parent_ratio': state_data['Working_Parent_Ratio'].round(2).tolist()
+import numpy as np
+
+from ndcp import REPO_ROOT, WORKBOOK_PATH, apply_schema, read_ndcp
+from ndcp.adjacency import state_neighbors
+from ndcp.cache import write_if_changed
+from ndcp.columnar import columnar_json, county_export_frame, write_columnar
+from ndcp.dashboard_data import DASHBOARD_DATA_DIR, state_year_metrics, write_dashboard_data
+from ndcp.impute import impute_missing
+
+# Generated data files of the docs site (built from the workbook, not committed)
+DOCS_DATA_DIR = REPO_ROOT / 'docs' / 'data'
+
+# Price columns filled from the state, neighbor and global means before export
+PRICE_COLUMNS = ['MCInfant', 'MCToddler', 'MCPreschool']
+
+
+def rounded(series):
+    """Values rounded to cents for JSON, with None (null) for missing ones."""
+    return [None if np.isnan(v) else v for v in series.round(2).tolist()]
+
+
+def export_data(workbook=WORKBOOK_PATH, by_state=False, fmt='json'):
+    """
+    Write the data files of the docs site under docs/data.
+
+    Parameters:
+    -----------
+    workbook : str or Path
+        NDCP workbook
+    by_state : bool
+        Also write one dashboard shard per state
+    fmt : str
+        'binary' also writes the county rows as a compact binary file
+    """
+    # Read the Excel file (served from the columnar cache after the first run) and
+    # fill missing prices (whole states such as IN and NM) before any mean is taken
+    df = apply_schema(read_ndcp(workbook))
+    processed = impute_missing(df, PRICE_COLUMNS, state_neighbors(), provenance=True)
+
+    # Process data for visualization
+    state_data = processed.groupby('State_Abbreviation', observed=True).agg({
+        'MCInfant': 'mean',
+        'MCToddler': 'mean',
+        'MCPreschool': 'mean',
+        'MHI_2018': 'mean',
+        'TotalPop': 'mean',
+        'H_Under6_BothWork': 'sum'
+    }).reset_index()
+
+    # Calculate additional metrics
+    state_data['Annual_Cost_Infant'] = state_data['MCInfant'] * 12
+    state_data['Cost_Burden'] = (state_data['Annual_Cost_Infant'] / state_data['MHI_2018']) * 100
+    state_data['Working_Parent_Ratio'] = (state_data['H_Under6_BothWork'] / state_data['TotalPop']) * 100
+
+    # Create the final data structure
+    visualization_data = {
+        'states': state_data['State_Abbreviation'].astype(str).tolist(),
+        'costs': {
+            'infant': rounded(state_data['MCInfant']),
+            'toddler': rounded(state_data['MCToddler']),
+            'preschool': rounded(state_data['MCPreschool'])
+        },
+        'metrics': {
+            'annual_cost': rounded(state_data['Annual_Cost_Infant']),
+            'cost_burden': rounded(state_data['Cost_Burden']),
+            'working_parent_ratio': rounded(state_data['Working_Parent_Ratio'])
+        }
     }
-}
 
-# Save to JSON file
-with open('docs/data/childcare_costs.json', 'w') as f:
-    json.dump(visualization_data, f) 
\ No newline at end of file
+    # Save to JSON file; allow_nan=False turns a stray NaN into an error instead of invalid JSON
+    write_if_changed(DOCS_DATA_DIR / 'childcare_costs.json', json.dumps(visualization_data, allow_nan=False))
+
+    # Dashboard data: an index plus one shard per StudyYear (and per state with by_state)
+    written = write_dashboard_data(state_year_metrics(processed), DASHBOARD_DATA_DIR, by_state=by_state)
+    print(f"Dashboard data in {DASHBOARD_DATA_DIR}: {len(written)} file(s) updated")
+
+    # County rows, column by column: plain JSON always, plus the quantized binary file on request
+    counties = county_export_frame(df)
+    write_if_changed(DOCS_DATA_DIR / 'county_costs.json', columnar_json(counties))
+    if fmt == 'binary':
+        binary_path = DOCS_DATA_DIR / 'county_costs.bin'
+        write_columnar(counties, binary_path)
+        print(f"County rows in {binary_path} ({binary_path.stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the childcare cost data for the docs site.')
+    parser.add_argument('--by-state', action='store_true',
+                        help='also write one dashboard shard per state')
+    parser.add_argument('--format', choices=['json', 'binary'], default='json',
+                        help='county rows as columnar JSON (default) or as a compact binary file '
+                             'read straight into typed arrays; the JSON file is always written as fallback')
+    args = parser.parse_args()
+
+    export_data(by_state=args.by_state, fmt=args.format)
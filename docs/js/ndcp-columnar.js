@@ -0,0 +1,86 @@
+/**
+ * ndcp-columnar.js
+ * Reads the county rows exported by convert_to_json.py (ndcp/columnar.py)
+ *
+ * loadCountyColumns() fetches data/county_costs.bin and wraps each column in a
+ * typed array without parsing it; when the binary file is missing or the
+ * browser cannot read it, it falls back to data/county_costs.json.
+ * Both resolve to { rows, columns: { name: { values, scale, missing, dictionary } } }
+ * plus a value(name, row) helper that applies the scale and dictionary.
+ */
+
+const COLUMNAR_ROOT = './data/';
+const COLUMNAR_MAGIC = 'NDCP';
+const COLUMNAR_VERSION = 1;
+
+const TYPED_ARRAYS = {
+    'u1': Uint8Array, 'i1': Int8Array,
+    'u2': Uint16Array, 'i2': Int16Array,
+    'u4': Uint32Array, 'i4': Int32Array
+};
+
+/**
+ * Decode a binary columnar file into typed arrays (views on the same buffer)
+ */
+function decodeColumnar(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== COLUMNAR_MAGIC || view.getUint16(4, true) !== COLUMNAR_VERSION) {
+        throw new Error('Not an NDCP columnar file');
+    }
+    const headerLength = view.getUint32(8, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 12, headerLength)));
+
+    const columns = {};
+    header.columns.forEach(column => {
+        // Columns are stored little-endian and 8-byte aligned, as typed arrays expect
+        const values = new TYPED_ARRAYS[column.dtype](buffer, column.offset, header.rows);
+        columns[column.name] = { ...column, values };
+    });
+    return withAccessor({ rows: header.rows, columns });
+}
+
+/**
+ * Wrap the JSON fallback (one list per column, null when missing) in the same shape
+ */
+function fromColumnarJson(data) {
+    const columns = {};
+    Object.entries(data.columns).forEach(([name, values]) => {
+        columns[name] = { name, values, scale: 1, missing: null };
+    });
+    return withAccessor({ rows: data.rows, columns });
+}
+
+function withAccessor(table) {
+    table.value = (name, row) => {
+        const column = table.columns[name];
+        const raw = column.values[row];
+        if (raw === column.missing || raw === null) return null;
+        if (column.dictionary) return column.dictionary[raw];
+        return column.scale === 1 ? raw : raw / column.scale;
+    };
+    return table;
+}
+
+let countyColumns = null;
+
+/**
+ * Fetch the county rows once, binary first and JSON as the fallback
+ */
+function loadCountyColumns() {
+    if (!countyColumns) {
+        countyColumns = fetch(COLUMNAR_ROOT + 'county_costs.bin')
+            .then(response => {
+                if (!response.ok) throw new Error('No binary county file');
+                return response.arrayBuffer();
+            })
+            .then(decodeColumnar)
+            .catch(() => fetch(COLUMNAR_ROOT + 'county_costs.json')
+                .then(response => {
+                    if (!response.ok) throw new Error(`Failed to load ${COLUMNAR_ROOT}county_costs.json`);
+                    return response.json();
+                })
+                .then(fromColumnarJson));
+    }
+    return countyColumns;
+}
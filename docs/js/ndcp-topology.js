@@ -0,0 +1,79 @@
+/**
+ * ndcp-topology.js
+ * Decodes the TopoJSON boundary files exported by export_topology.py (ndcp/topology.py)
+ *
+ * loadTopology('states', 'medium') fetches data/topology/states-medium.json and
+ * resolves to a GeoJSON FeatureCollection whose features carry the shape key
+ * as `id`, ready for plotly's geojson choropleths:
+ *
+ *   { type: 'choropleth', geojson, featureidkey: 'id', locations: [...], z: [...] }
+ *
+ * Counties are only available when a county shapefile was exported.
+ */
+
+const TOPOLOGY_ROOT = './data/topology/';
+
+/**
+ * Undo the delta encoding and quantization of every arc once
+ */
+function decodeArcs(topology) {
+    const [sx, sy] = topology.transform.scale;
+    const [tx, ty] = topology.transform.translate;
+    return topology.arcs.map(arc => {
+        let x = 0, y = 0;
+        return arc.map(([dx, dy]) => {
+            x += dx;
+            y += dy;
+            return [x * sx + tx, y * sy + ty];
+        });
+    });
+}
+
+/**
+ * Join the arcs of one ring; a negative index (~i) is arc i reversed
+ */
+function ringCoordinates(ids, arcs) {
+    const ring = [];
+    ids.forEach(id => {
+        const points = id < 0 ? arcs[~id].slice().reverse() : arcs[id];
+        // Consecutive arcs share their end point
+        ring.push(...(ring.length ? points.slice(1) : points));
+    });
+    return ring;
+}
+
+function topologyFeatures(topology, name) {
+    const arcs = decodeArcs(topology);
+    const features = topology.objects[name].geometries.map(geometry => {
+        let shape = null;
+        if (geometry.type === 'Polygon') {
+            shape = { type: 'Polygon', coordinates: geometry.arcs.map(ids => ringCoordinates(ids, arcs)) };
+        } else if (geometry.type === 'MultiPolygon') {
+            shape = {
+                type: 'MultiPolygon',
+                coordinates: geometry.arcs.map(rings => rings.map(ids => ringCoordinates(ids, arcs)))
+            };
+        }
+        return { type: 'Feature', id: geometry.id, properties: geometry.properties || {}, geometry: shape };
+    });
+    return { type: 'FeatureCollection', features };
+}
+
+const topologies = {};
+
+/**
+ * Fetch and decode one layer ('states' or 'counties') at a level of detail
+ * ('full', 'high', 'medium' or 'low'); each file is fetched once
+ */
+function loadTopology(name, lod = 'medium') {
+    const file = `${name}-${lod}.json`;
+    if (!topologies[file]) {
+        topologies[file] = fetch(TOPOLOGY_ROOT + file)
+            .then(response => {
+                if (!response.ok) throw new Error(`Failed to load ${TOPOLOGY_ROOT}${file}`);
+                return response.json();
+            })
+            .then(topology => topologyFeatures(topology, name));
+    }
+    return topologies[file];
+}
@@ -35,73 +35,86 @@ const STATE_NAMES = {
     'VA': 'Virginia', 'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming'
 };
 
-const years = ['2008', '2010', '2012', '2014', '2015', '2016', '2017', '2018'];
-
-const DASHBOARD_DATA = {
-    states: Object.keys(STATE_NAMES),
-    metrics: {
-        '2018': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (21500 - 11000) + 11000)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (85000 - 45000) + 45000))
-        },
-        '2017': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (20500 - 10500) + 10500)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (82000 - 43000) + 43000))
-        },
-        '2016': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (19500 - 10000) + 10000)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (80000 - 42000) + 42000))
-        },
-        '2015': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (18500 - 9500) + 9500)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (78000 - 41000) + 41000))
-        },
-        '2014': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (17500 - 9000) + 9000)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (75000 - 40000) + 40000))
-        },
-        '2012': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (16500 - 8500) + 8500)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (72000 - 39000) + 39000))
-        },
-        '2010': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (15500 - 8000) + 8000)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (70000 - 38000) + 38000))
-        },
-        '2008': {
-            annual_cost: Array(50).fill(0).map(() => Math.floor(Math.random() * (14500 - 7500) + 7500)),
-            working_parent_ratio: Array(50).fill(0).map(() => Math.random() * (0.8 - 0.5) + 0.5),
-            cost_burden: Array(50).fill(0).map(() => Math.random() * (0.3 - 0.15) + 0.15),
-            median_income: Array(50).fill(0).map(() => Math.floor(Math.random() * (68000 - 37000) + 37000))
-        }
+// Generated data files (convert_to_json.py): an index plus one shard per StudyYear
+const DATA_ROOT = './data/dashboard/';
+
+let years = [];
+let dashboardIndex = null;
+const yearShards = {};
+
+/**
+ * Fetch one generated data file as JSON; a missing file is an error
+ */
+function fetchData(file) {
+    return fetch(DATA_ROOT + file).then(response => {
+        if (!response.ok) throw new Error(`${DATA_ROOT}${file} is not available (HTTP ${response.status})`);
+        return response.json();
+    });
+}
+
+/**
+ * Fetch the data index once; it lists the states, years and shard files,
+ * plus the national averages used by the time series. A failed request is
+ * not kept, so the next selection tries again.
+ */
+function loadDataIndex() {
+    if (!dashboardIndex) {
+        dashboardIndex = fetchData('index.json')
+            .then(index => {
+                years = index.years.map(String);
+                return index;
+            })
+            .catch(error => {
+                dashboardIndex = null;
+                throw error;
+            });
     }
-};
+    return dashboardIndex;
+}
+
+/**
+ * Fetch the shard of one year on first use and keep it for later selections
+ */
+function loadYearData(year) {
+    if (!yearShards[year]) {
+        yearShards[year] = loadDataIndex()
+            .then(index => {
+                const file = index.shards[year];
+                if (!file) throw new Error(`No data for ${year}`);
+                return fetchData(file);
+            })
+            .catch(error => {
+                delete yearShards[year];
+                throw error;
+            });
+    }
+    return yearShards[year];
+}
+
+/**
+ * Replace the year options with the years present in the data
+ */
+function populateYearFilter(index) {
+    const yearFilter = document.getElementById('yearFilter');
+    if (!yearFilter) return;
+    const latest = years[years.length - 1];
+    yearFilter.innerHTML = years.slice().reverse().map(year => {
+        const label = year === latest ? `${year} (Most Recent)` : year === years[0] ? `${year} (Earliest)` : year;
+        return `<option value="${year}">${label}</option>`;
+    }).join('');
+    if (!years.includes(currentYear)) currentYear = latest;
+    yearFilter.value = currentYear;
+}
 
 // Helper function for time series data
-function calculateAverageCostByYear(type, selectedYear = '2018') {
+function calculateAverageCostByYear(index, type, selectedYear = '2018') {
+    const averages = index.national.annual_cost;
     return years
-        .filter(year => parseInt(year) <= parseInt(selectedYear))
-        .map(year => {
-            const costs = DASHBOARD_DATA.metrics[year].annual_cost;
-            const avg = costs.reduce((a, b) => a + b, 0) / costs.length;
-            return type === 'infant' ? avg * 1.2 : 
-                   type === 'toddler' ? avg : 
-                   avg * 0.8;
-        });
+        .map((year, i) => [year, averages[i]])
+        .filter(([year]) => parseInt(year) <= parseInt(selectedYear))
+        .map(([, avg]) => type === 'infant' ? avg * 1.2 :
+                          type === 'toddler' ? avg :
+                          avg * 0.8);
 }
 
 // Constants for year filtering
@@ -234,91 +247,22 @@ function updateInsights(dataType) {
     }
 }
 
-// Add this function to handle data for interactive charts
-/**
- * Load processed data with mean-imputed values for missing data in IN and NM
- * Note: This implementation simulates the data that would be processed from our Python analysis
- */
-function loadProcessedData() {
-    // This is where we would normally load the processed data from a JSON file
-    // For now, we'll create a placeholder that indicates which values have been imputed
-    const states = DASHBOARD_DATA.states;
-    
-    // Process data for each year, marking IN and NM as having imputed values
-    for (const year in DASHBOARD_DATA.metrics) {
-        // Get the current year data
-        const yearData = DASHBOARD_DATA.metrics[year];
-        
-        // Add imputation flag
-        states.forEach((state, i) => {
-            if (state === 'IN' || state === 'NM') {
-                // Mark IN and NM data as imputed
-                yearData.imputed = yearData.imputed || [];
-                yearData.imputed.push(state);
-                
-                // For IN and NM, ensure we have values (they were previously zeros)
-                if (yearData.annual_cost[i] === 0) {
-                    // Use averages from neighboring states
-                    const neighbors = state === 'IN' 
-                        ? ['IL', 'KY', 'MI', 'OH'] 
-                        : ['AZ', 'CO', 'OK', 'TX'];
-                    
-                    // Calculate average from neighbors (simplified logic)
-                    let neighborSum = 0;
-                    let neighborCount = 0;
-                    
-                    neighbors.forEach(neighbor => {
-                        const neighborIndex = states.indexOf(neighbor);
-                        if (neighborIndex !== -1 && yearData.annual_cost[neighborIndex] > 0) {
-                            neighborSum += yearData.annual_cost[neighborIndex];
-                            neighborCount++;
-                        }
-                    });
-                    
-                    // Set imputed value
-                    if (neighborCount > 0) {
-                        yearData.annual_cost[i] = Math.round(neighborSum / neighborCount);
-                    } else {
-                        // Fallback to average of all states
-                        const allStatesCost = yearData.annual_cost.filter(cost => cost > 0);
-                        yearData.annual_cost[i] = Math.round(allStatesCost.reduce((a, b) => a + b, 0) / allStatesCost.length);
-                    }
-                    
-                    // Also impute the working parent ratio if needed
-                    if (yearData.working_parent_ratio[i] === 0) {
-                        const allRatios = yearData.working_parent_ratio.filter(ratio => ratio > 0);
-                        yearData.working_parent_ratio[i] = allRatios.reduce((a, b) => a + b, 0) / allRatios.length;
-                    }
-                    
-                    // Recalculate cost burden
-                    if (yearData.median_income && yearData.median_income[i] > 0) {
-                        yearData.cost_burden[i] = yearData.annual_cost[i] / yearData.median_income[i];
-                    }
-                }
-            }
-        });
-    }
-    
-    return DASHBOARD_DATA;
-}
-
 /**
  * Create a US map visualization without imputation flags
  */
-function createHeatMap(year) {
+async function createHeatMap(year) {
     const container = document.getElementById('mainVisualization');
     
-    // Load processed data with imputations
-    const data = loadProcessedData();
-    const metrics = data.metrics[year];
-    const states = data.states;
+    // Load the index and the shard of the selected year (imputed values included)
+    const [index, metrics] = await Promise.all([loadDataIndex(), loadYearData(year)]);
+    const states = index.states;
     const costs = metrics.annual_cost;
     
     // Create tooltip text without imputation notes
     const text = states.map((state, i) => {
         const cost = costs[i];
         return `<b>${STATE_NAMES[state]}</b><br>` +
-               `Annual Cost: $${cost.toLocaleString()}`;
+               `Annual Cost: ${cost === null ? 'n/a' : '$' + cost.toLocaleString()}`;
     });
     
     // Create the heatmap
@@ -380,15 +324,18 @@ function createHeatMap(year) {
 /**
  * Create a time series chart showing cost trends over time
  */
-function createTimeSeriesChart() {
+async function createTimeSeriesChart() {
     const container = document.getElementById('mainVisualization');
     if (!container) return;
 
+    // National averages come with the index; no year shards are needed
+    const index = await loadDataIndex();
+
     // Get time series data up to the selected year
     const yearsToShow = years.filter(year => parseInt(year) <= parseInt(currentYear));
-    const infantCosts = calculateAverageCostByYear('infant', currentYear);
-    const toddlerCosts = calculateAverageCostByYear('toddler', currentYear);
-    const preschoolCosts = calculateAverageCostByYear('preschool', currentYear);
+    const infantCosts = calculateAverageCostByYear(index, 'infant', currentYear);
+    const toddlerCosts = calculateAverageCostByYear(index, 'toddler', currentYear);
+    const preschoolCosts = calculateAverageCostByYear(index, 'preschool', currentYear);
 
     // Slice the data arrays to match the years to show
     const slicedInfantCosts = infantCosts.slice(0, yearsToShow.length);
@@ -442,7 +389,7 @@ function createTimeSeriesChart() {
 
     const layout = {
         title: {
-            text: `Childcare Cost Trends (2008-${currentYear})`,
+            text: `Childcare Cost Trends (${years[0]}-${currentYear})`,
             font: chartTitle.font,
             xref: chartTitle.xref,
             x: chartTitle.x
@@ -451,7 +398,7 @@ function createTimeSeriesChart() {
             title: 'Year',
             tickfont: chartFont,
             gridcolor: chartColors.grid,
-            range: ['2008', currentYear],
+            range: [years[0], currentYear],
             tickmode: 'array',
             ticktext: yearsToShow,
             tickvals: yearsToShow
@@ -483,14 +430,13 @@ function createTimeSeriesChart() {
 /**
  * Create labor force map visualization without imputation flags
  */
-function createLaborForceMap(year) {
+async function createLaborForceMap(year) {
     const container = document.getElementById('mainVisualization');
     
-    // Load processed data with imputations
-    const data = loadProcessedData();
-    const metrics = data.metrics[year];
-    const states = data.states;
-    const participationRates = metrics.working_parent_ratio.map(ratio => ratio * 100);
+    // Load the index and the shard of the selected year (imputed values included)
+    const [index, metrics] = await Promise.all([loadDataIndex(), loadYearData(year)]);
+    const states = index.states;
+    const participationRates = metrics.working_parent_ratio.map(ratio => ratio === null ? null : ratio * 100);
     
     // Create tooltip text without imputation notes
     const text = states.map((state, i) => {
@@ -499,9 +445,9 @@ function createLaborForceMap(year) {
         const annualCost = metrics.annual_cost[i];
         
         return `<b>${STATE_NAMES[state]}</b><br>` +
-               `Working Parents: ${ratio.toFixed(1)}%<br>` +
-               `Cost Burden: ${(burden * 100).toFixed(1)}%<br>` +
-               `Annual Cost: $${annualCost.toLocaleString()}`;
+               `Female Labor Force Participation: ${ratio === null ? 'n/a' : ratio.toFixed(1) + '%'}<br>` +
+               `Cost Burden: ${burden === null ? 'n/a' : (burden * 100).toFixed(1) + '%'}<br>` +
+               `Annual Cost: ${annualCost === null ? 'n/a' : '$' + annualCost.toLocaleString()}`;
     });
     
     // Prepare data for the map
@@ -663,19 +609,27 @@ function updateVisualization() {
         displayStaticVisualization(currentVisualization);
     } else {
         // For interactive visualizations, call the appropriate function
+        // (each one fetches the data shard it needs on first use)
+        let rendering = null;
         switch(currentVisualization) {
             case 'geoChoropleth':
-                createHeatMap(currentYear);
+                rendering = createHeatMap(currentYear);
                 break;
             case 'timeSeriesAnalysis':
-                createTimeSeriesChart();
+                rendering = createTimeSeriesChart();
                 break;
             case 'laborForceMap':
-                createLaborForceMap(currentYear);
+                rendering = createLaborForceMap(currentYear);
                 break;
             default:
                 console.error('Unknown visualization type:', currentVisualization);
         }
+        if (rendering) {
+            rendering.catch(error => {
+                console.error('Error loading dashboard data:', error);
+                showStatus(`The dashboard data could not be loaded, so this chart cannot be shown. ${error.message}`, true);
+            });
+        }
     }
     
     // Update insights based on the current visualization
@@ -706,9 +660,12 @@ function initDashboard() {
             });
         }
         
-        // Initial setup
+        // Initial setup: the year options come from the data index
         updateYearFilterVisibility();
-        updateVisualization();
+        loadDataIndex()
+            .then(populateYearFilter)
+            .catch(error => console.error('Error loading data index:', error))
+            .then(updateVisualization);
         
         // Add ResizeObserver to handle container resizing
         const container = document.getElementById('mainVisualization');
@@ -0,0 +1,17 @@
+import argparse
+
+from ndcp.geometry import LODS
+from ndcp.topology import LAYERS, TOPOLOGY_DIR, write_topology
+
+parser = argparse.ArgumentParser(description='Export the boundary shapefiles as quantized TopoJSON for the docs site.')
+parser.add_argument('--lod', action='append', choices=list(LODS),
+                    help='level of detail to write (repeatable; default: all)')
+args = parser.parse_args()
+
+for name, (shapefile, key, properties) in LAYERS.items():
+    if not shapefile.exists():
+        print(f"Skipping {name}: {shapefile} not found")
+        continue
+    written = write_topology(shapefile, name, key, properties, lods=args.lod, out_dir=TOPOLOGY_DIR)
+    for lod, (path, size) in written.items():
+        print(f"{name} ({lod}): {path.name}, {size / 1024:.0f} KB")
@@ -69,12 +69,20 @@ plt.rcParams['axes.spines.right'] = False
 colors = ['#2f4b7c', '#665191', '#a05195', '#d45087', '#f95d6a', '#ff7c43', '#ffa600']
 sns.set_palette(colors)
 
+# Rank error for income brackets and percentile annotations; None sorts the full
+# column, a value such as 0.01 uses a mergeable quantile sketch (ndcp.sketch)
+QUANTILE_EPS = None
+
 print("Libraries imported successfully!")
 
 # %% [code]
 # Setup paths and load data
 try:
     root_dir = Path().absolute().parent.parent  # Go up two levels to reach final-project
+    sys.path.insert(0, str(root_dir))  # Shared ndcp package lives at the repository root
+    from ndcp import apply_schema, read_ndcp
+    from ndcp.geometry import label_points, load_shapes, lod_for
+    from ndcp.sketch import median, qcut, quantile
     data_dir = root_dir / 'data'
     output_dir = Path().absolute()  # Current directory (milestone1)
     figures_dir = output_dir  # Save figures directly in milestone1 directory
@@ -87,11 +95,11 @@ try:
         print(f"Error: Data file not found at {data_file}")
         sys.exit(1)
 
-    print("Loading data (this may take a few moments)...")
+    print("Loading data (the first run converts the workbook to a columnar cache)...")
     # Only load the columns we need
     needed_columns = ['State_Name', 'State_Abbreviation', 'County_Name', 'County_FIPS_Code', 
                      'StudyYear', 'MCInfant', 'FLFPR_20to64', 'MHI']
-    df = pd.read_excel(data_file, usecols=needed_columns)
+    df = apply_schema(read_ndcp(data_file, columns=needed_columns))
     
     # Basic data info
     print(f"\nAnalyzing data from {len(df)} counties across {df['State_Name'].nunique()} states")
@@ -112,7 +120,8 @@ print("\nNote: The dataset includes the District of Columbia (DC) in addition to
 
 # Add county type and income categories
 df['County_Type'] = df['County_FIPS_Code'].apply(lambda x: 'Urban' if x < 2000 else 'Rural')
-df['Income_Category'] = pd.qcut(df['MHI'], q=3, labels=['Low Income', 'Middle Income', 'High Income'])
+df['Income_Category'] = qcut(df['MHI'], q=3, labels=['Low Income', 'Middle Income', 'High Income'],
+                             eps=QUANTILE_EPS)
 
 # %% [markdown]
 # ## The Geography of Opportunity: Childcare Costs Across America
@@ -123,7 +132,7 @@ df['Income_Category'] = pd.qcut(df['MHI'], q=3, labels=['Low Income', 'Middle In
 plt.figure(figsize=(15, 10))
 
 # Calculate state statistics
-state_stats = df.groupby(['State_Name', 'State_Abbreviation']).agg({
+state_stats = df.groupby(['State_Name', 'State_Abbreviation'], observed=True).agg({
     'MCInfant': ['mean', 'std'],
     'FLFPR_20to64': 'mean'  # Female Labor Force Participation Rate
 }).round(2)
@@ -135,13 +144,15 @@ state_stats = state_stats.reset_index()
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 20), height_ratios=[2, 1])
 fig.patch.set_facecolor('white')
 
-# Load US states shapefile
-usa = gpd.read_file('https://www2.census.gov/geo/tiger/GENZ2018/shp/cb_2018_us_state_20m.zip')
+# Load US states from the local geometry cache (bundled Census shapefile),
+# simplified to the detail a 15-inch map at 300 dpi can show
+usa = load_shapes(lod=lod_for(15 * 300))
 # Remove Alaska and Hawaii for better continental US visualization
 usa = usa[~usa['STUSPS'].isin(['AK', 'HI'])]
 
-# Merge data with map
+# Merge data with map, plus the cached label point of each state
 usa = usa.merge(state_stats, how='left', left_on='NAME', right_on='State_Name')
+usa = usa.merge(label_points(), how='left', left_on='STUSPS', right_index=True)
 
 # Create maps with enhanced styling
 for ax, column, title, cmap in [
@@ -157,20 +168,14 @@ for ax, column, title, cmap in [
             missing_kwds={'color': 'lightgrey'},
             cmap=cmap)
     
-    # Add state labels
-    for idx, row in usa.iterrows():
-        # Get centroid for label placement
-        centroid = row.geometry.centroid
-        # Add state abbreviation and value
-        if pd.notnull(row[column]):
-            if column == 'avg_price':
-                label = f"{row['STUSPS']}\n${row[column]:,.0f}"
-            else:
-                label = f"{row['STUSPS']}\n{row[column]:.1f}%"
-            ax.annotate(label,
-                       xy=(centroid.x, centroid.y),
-                       ha='center', va='center',
-                       fontsize=8)
+    # Add state labels (abbreviation and value) at the precomputed label points
+    template = "{abbr}\n${value:,.0f}" if column == 'avg_price' else "{abbr}\n{value:.1f}%"
+    labeled = usa[usa[column].notna()]
+    for abbr, value, x, y in zip(labeled['STUSPS'], labeled[column], labeled['label_x'], labeled['label_y']):
+        ax.annotate(template.format(abbr=abbr, value=value),
+                   xy=(x, y),
+                   ha='center', va='center',
+                   fontsize=8)
     
     # Customize the map
     ax.axis('off')
@@ -202,8 +207,8 @@ ax.set_ylabel('Density', fontsize=12)
 
 # Add statistical annotations with better positioning
 stats_text = (f'Mean: ${df["MCInfant"].mean():,.0f}\n'
-              f'Median: ${df["MCInfant"].median():,.0f}\n'
-              f'75th percentile: ${df["MCInfant"].quantile(0.75):,.0f}')
+              f'Median: ${median(df["MCInfant"], QUANTILE_EPS):,.0f}\n'
+              f'75th percentile: ${quantile(df["MCInfant"], 0.75, QUANTILE_EPS):,.0f}')
 plt.text(0.95, 0.95, stats_text, transform=ax.transAxes, 
          bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'),
          va='top', ha='right', fontsize=10)
@@ -303,7 +308,7 @@ with open(report_path, 'w') as f:
     # Economic Impact
     f.write("2. Economic Burden\n")
     f.write(f"   - Average weekly cost: ${df['MCInfant'].mean():.2f}\n")
-    f.write(f"   - Median weekly cost: ${df['MCInfant'].median():.2f}\n")
+    f.write(f"   - Median weekly cost: ${median(df['MCInfant'], QUANTILE_EPS):.2f}\n")
     f.write(f"   - Annual cost burden: ${df['MCInfant'].mean() * 52:.2f}\n")
     f.write(f"   - Percentage of median household income: {df['MCInfant'].mean() * 52 / df['MHI'].mean() * 100:.1f}%\n\n")
     
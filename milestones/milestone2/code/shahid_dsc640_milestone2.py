@@ -4,6 +4,25 @@ import plotly.express as px
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import seaborn as sns
+import argparse
+import sys
+from pathlib import Path
+
+# Make the shared ndcp package at the repository root importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from ndcp.plotly_export import write_lean_html
+
+# Write each figure as a small HTML page with a compact payload + shared plotly.js (--lean-html)
+LEAN_HTML = False
+# Also embed the payload in the lean pages so they open from disk (--inline-data)
+INLINE_DATA = False
+
+def save_html(fig, filename):
+    """Save a plotly figure as self-contained HTML, or in the lean layout when LEAN_HTML is set"""
+    if LEAN_HTML:
+        write_lean_html(fig, filename, inline=INLINE_DATA)
+    else:
+        fig.write_html(filename)
 
 # Load actual data from DASHBOARD_DATA
 states = ["AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC"]
@@ -28,7 +47,7 @@ def create_choropleth():
         title_text='Average Monthly Childcare Costs by State',
         geo_scope='usa',
     )
-    fig.write_html("dashboard_map.html")
+    save_html(fig, "dashboard_map.html")
 
 # Create time series visualization
 def create_time_series():
@@ -55,7 +74,7 @@ def create_time_series():
     
     fig = px.line(df_trend, x='Year', y='Cost', color='State',
                   title='Childcare Cost Trends by State')
-    fig.write_html("time_series.html")
+    save_html(fig, "time_series.html")
 
 # Create comparison bar chart
 def create_comparison_bar():
@@ -85,7 +104,7 @@ def create_comparison_bar():
         title='Urban vs Rural Childcare Costs by State',
         barmode='group'
     )
-    fig.write_html("comparison.html")
+    save_html(fig, "comparison.html")
 
 # 3. Infographic Series Mock-ups
 def create_infographic_elements():
@@ -113,6 +132,14 @@ def create_infographic_elements():
     plt.savefig('infographic_2.png')
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate the milestone 2 visualizations.')
+    parser.add_argument('--lean-html', action='store_true',
+                        help='write each HTML figure as a small page with a compact payload and a shared plotly.js')
+    parser.add_argument('--inline-data', action='store_true',
+                        help='with --lean-html, also embed the payloads so the pages open from disk')
+    args = parser.parse_args()
+    LEAN_HTML, INLINE_DATA = args.lean_html, args.inline_data
+
     # Generate all visualizations
     create_choropleth()
     create_time_series()
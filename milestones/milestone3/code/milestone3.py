@@ -18,13 +18,58 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from fpdf import FPDF
 from plotly.subplots import make_subplots
+import argparse
 import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
 from datetime import datetime
 
+# Make the shared ndcp package at the repository root importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from ndcp import apply_schema, read_ndcp
+from ndcp.covariance import CovarianceAccumulator
+from ndcp.cube import AggregateCube
+from ndcp.plotly_export import write_lean_html
+from ndcp.sketch import qcut
+from ndcp.traces import percent_ratio, scale_range, split_by
+
 class ChildcareCostAnalysis:
-    def __init__(self):
-        """Initialize with the childcare dataset"""
-        self.data = pd.read_excel('../../../data/nationaldatabaseofchildcareprices.xlsx')
+    # Workbook columns used by the dashboard and the static visualizations
+    COLUMNS = ['State_Abbreviation', 'StudyYear', 'MCInfant', 'MCToddler', 'MCPreschool',
+               'MHI_2018', 'TotalPop', 'H_Under6_BothWork']
+
+    # Income brackets (quintiles of median household income), lowest first
+    INCOME_LEVELS = ['Very Low Income', 'Low Income', 'Middle Income', 'Upper Middle', 'High Income']
+
+    # Dimensions and measures of the aggregate cube the dashboard slices from
+    CUBE_DIMS = ['State_Abbreviation', 'StudyYear', 'Income_Bracket']
+    CUBE_MEASURES = ['MCInfant', 'Annual_Cost_Infant', 'MHI_2018', 'TotalPop', 'H_Under6_BothWork']
+
+    # Variables of the correlation heatmaps and their display names
+    CORR_VARIABLES = {
+        'MCInfant': 'Infant Care',
+        'MCToddler': 'Toddler Care',
+        'MCPreschool': 'Preschool',
+        'MHI_2018': 'Median Income',
+        'TotalPop': 'Population',
+        'H_Under6_BothWork': 'Working Parents'
+    }
+
+    # Aggregations the cube can answer, and how many aggregate results to keep
+    CUBE_AGGS = {'mean': AggregateCube.mean, 'sum': AggregateCube.total}
+    AGGREGATE_CACHE_SIZE = 32
+
+    def __init__(self, stream=False, quantile_eps=None):
+        """
+        Initialize with the childcare dataset (streamed chunk by chunk if `stream` is set).
+        
+        With `quantile_eps` the income bracket edges come from a mergeable
+        quantile sketch with that rank error instead of a full sort.
+        """
+        self.quantile_eps = quantile_eps
+        self.data = apply_schema(read_ndcp('../../../data/nationaldatabaseofchildcareprices.xlsx',
+                                           columns=self.COLUMNS, stream=stream))
         # Create output directory
         os.makedirs('../output', exist_ok=True)
         os.makedirs('../output/temp', exist_ok=True)
@@ -42,10 +87,11 @@ class ChildcareCostAnalysis:
     def preprocess_data(self):
         """Preprocess the data for visualizations"""
         # Create income brackets with more intuitive labels
-        self.data['Income_Bracket'] = pd.qcut(
+        self.data['Income_Bracket'] = qcut(
             self.data['MHI_2018'], 
             q=5, 
-            labels=['Very Low Income', 'Low Income', 'Middle Income', 'Upper Middle', 'High Income']
+            labels=self.INCOME_LEVELS,
+            eps=self.quantile_eps
         )
         #data cleaning
         # Calculate annual costs and cost ratios
@@ -57,9 +103,114 @@ class ChildcareCostAnalysis:
         
         # Clean up any missing values
         self.data = self.data.dropna(subset=['MCInfant', 'MCToddler', 'MCPreschool', 'MHI_2018'])
+    
+    @property
+    def data(self):
+        """The county-level frame; reassigning it drops every cached aggregate"""
+        return self._data
+    
+    @data.setter
+    def data(self, frame):
+        self._data = frame
+        self.invalidate_aggregates()
+    
+    def invalidate_aggregates(self):
+        """
+        Drop the cube, the covariance accumulator and the memoized aggregates.
+        
+        Called whenever `self.data` is reassigned. Changes made in place
+        (e.g. `self.data[col] = ...`) are not detected; call this after them.
+        """
+        self._cube = None
+        self._covariance = None
+        self._aggregates = OrderedDict()
+        self._aggregate_hits = 0
+        self._aggregate_misses = 0
+    
+    @property
+    def cube(self):
+        """Aggregate cube by state, year and income bracket, built on first use"""
+        if self._cube is None:
+            self._cube = AggregateCube.from_frame(self.data, self.CUBE_MEASURES, dims=self.CUBE_DIMS)
+        return self._cube
+    
+    @property
+    def covariance(self):
+        """Cross-products of the correlation variables per state and year, built on first use"""
+        if self._covariance is None:
+            self._covariance = CovarianceAccumulator.from_frame(
+                self.data, list(self.CORR_VARIABLES), dims=['State_Abbreviation', 'StudyYear'])
+        return self._covariance
+    
+    def aggregate(self, keys, aggs, where=None):
+        """
+        Memoized groupby aggregation over `self.data`.
+        
+        Results are cached by (keys, measures and agg funcs, filter) in an LRU
+        of `AGGREGATE_CACHE_SIZE` entries, so repeated dashboard builds pay for
+        each distinct query once. Means and sums over the cube dimensions are
+        sliced from `self.cube`; anything else falls back to a groupby.
+        
+        Parameters:
+        -----------
+        keys : str or list of str
+            Grouping columns
+        aggs : dict
+            Maps each measure to an aggregation name, as in `DataFrame.agg`
+        where : dict, optional
+            Maps a column to a value (or list of values) that rows must match
+            
+        Returns:
+        --------
+        DataFrame
+            A fresh copy of the aggregate with the keys as columns
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        where = dict(where or {})
+        query = (
+            tuple(keys),
+            tuple(aggs.items()),
+            tuple(sorted((col, tuple(v) if isinstance(v, (list, tuple, set)) else v)
+                         for col, v in where.items())),
+        )
         
-    def create_dashboard(self):
-        """Create an interactive dashboard with key visualizations"""
+        if query in self._aggregates:
+            self._aggregates.move_to_end(query)
+            self._aggregate_hits += 1
+        else:
+            self._aggregate_misses += 1
+            self._aggregates[query] = self._compute_aggregate(keys, aggs, where)
+            if len(self._aggregates) > self.AGGREGATE_CACHE_SIZE:
+                self._aggregates.popitem(last=False)
+        return self._aggregates[query].copy()
+    
+    def _compute_aggregate(self, keys, aggs, where):
+        dims = set(self.CUBE_DIMS)
+        if (set(keys) <= dims and set(where) <= dims and set(aggs) <= set(self.CUBE_MEASURES)
+                and set(aggs.values()) <= set(self.CUBE_AGGS)):
+            columns = [self.CUBE_AGGS[func](self.cube, keys, [col], where) for col, func in aggs.items()]
+            return pd.concat(columns, axis=1).reset_index()
+        
+        frame = self.data
+        for col, value in where.items():
+            allowed = value if isinstance(value, (list, tuple, set)) else [value]
+            frame = frame[frame[col].isin(list(allowed))]
+        return frame.groupby(keys, observed=True).agg(aggs).reset_index()
+    
+    def aggregate_cache_info(self):
+        """Hit/miss counts and size of the aggregate cache"""
+        return {'hits': self._aggregate_hits, 'misses': self._aggregate_misses,
+                'size': len(self._aggregates), 'maxsize': self.AGGREGATE_CACHE_SIZE}
+        
+    def create_dashboard(self, lean_html=False, inline_data=False):
+        """
+        Create an interactive dashboard with key visualizations.
+        
+        With `lean_html` the page is written as a small HTML page that
+        fetches a compact JSON payload, plus a shared plotly.js file (see
+        `ndcp.plotly_export`) instead of one self-contained file;
+        `inline_data` also embeds the payload so the page opens from disk.
+        """
       
         fig = make_subplots(
             rows=3, cols=2,
@@ -93,20 +244,16 @@ class ChildcareCostAnalysis:
         )
         
         # Choropleth Map
-        state_costs = self.data.groupby('State_Abbreviation').agg({
+        state_costs = self.aggregate('State_Abbreviation', {
             'MCInfant': 'mean',
             'MHI_2018': 'mean'
-        }).reset_index()
+        })
         
         # Dynamic bubble sizing
         state_metrics = state_costs.copy()
         state_metrics['Annual_Cost'] = state_metrics['MCInfant'] * 12
-        state_metrics['CostIncomeRatio'] = (state_metrics['Annual_Cost'] / state_metrics['MHI_2018']) * 100
-        
-        state_metrics['bubble_size'] = 20 + (
-            (state_metrics['CostIncomeRatio'] - state_metrics['CostIncomeRatio'].min()) * 
-            (50 - 20) / (state_metrics['CostIncomeRatio'].max() - state_metrics['CostIncomeRatio'].min())
-        )
+        state_metrics['CostIncomeRatio'] = percent_ratio(state_metrics['Annual_Cost'], state_metrics['MHI_2018'])
+        state_metrics['bubble_size'] = scale_range(state_metrics['CostIncomeRatio'], 20, 50)
         
         # Add choropleth with left-side legend
         fig.add_trace(
@@ -190,10 +337,10 @@ class ChildcareCostAnalysis:
         )
 
         # Add income distribution donut chart
-        income_dist = self.data.groupby('Income_Bracket').agg({
+        income_dist = self.aggregate('Income_Bracket', {
             'Annual_Cost_Infant': 'mean',
             'MHI_2018': 'mean'
-        }).reset_index()
+        })
         
         fig.add_trace(
             go.Pie(
@@ -216,16 +363,9 @@ class ChildcareCostAnalysis:
         )
 
         # Correlation Analysis
-        variables = {
-            'MCInfant': 'Infant Care',
-            'MCToddler': 'Toddler Care',
-            'MCPreschool': 'Preschool',
-            'MHI_2018': 'Median Income',
-            'TotalPop': 'Population',
-            'H_Under6_BothWork': 'Working Parents'
-        }
+        variables = self.CORR_VARIABLES
         
-        corr_matrix = self.data[list(variables.keys())].corr()
+        corr_matrix = self.covariance.corr(list(variables.keys()))
         
         # Create heatmap
         fig.add_trace(
@@ -269,54 +409,16 @@ class ChildcareCostAnalysis:
             row=3, col=1
         )
 
-        # Rsunburst chart
-        state_hierarchy = self.data.groupby(['State_Abbreviation', 'Income_Bracket']).agg({
-            'Annual_Cost_Infant': 'mean',
-            'MHI_2018': 'mean'
-        }).reset_index()
-        
-        # Calculate cost burden for each group
-        state_hierarchy['Cost_Burden'] = (state_hierarchy['Annual_Cost_Infant'] / state_hierarchy['MHI_2018']) * 100
-        
-        # Create labels and parents for sunburst
-        labels = list(state_hierarchy['State_Abbreviation'].unique()) + \
-                list(state_hierarchy.apply(lambda x: f"{x['State_Abbreviation']}-{x['Income_Bracket']}", axis=1))
-        
-        parents = [''] * len(state_hierarchy['State_Abbreviation'].unique()) + \
-                 list(state_hierarchy['State_Abbreviation'])
-        
-        values = list(state_hierarchy.groupby('State_Abbreviation')['Cost_Burden'].mean()) + \
-                list(state_hierarchy['Cost_Burden'])
-        
-        # Create color scale based on cost burden
-        colors = px.colors.sequential.Viridis
-        
-        fig.add_trace(
-            go.Bar(
-                x=state_hierarchy['State_Abbreviation'],
-                y=state_hierarchy['Cost_Burden'],
-                name='Cost Burden',
-                marker_color='rgb(239, 85, 59)',
-                opacity=0.8,
-                hovertemplate=(
-                    "<b>%{x}</b><br>" +
-                    "Cost Burden: %{y:.1f}%<br>" +
-                    "<extra></extra>"
-                )
-            ),
-            row=3, col=2
-        )
-        
         # State Cost Impact Analysis
-        state_impact = self.data.groupby('State_Abbreviation').agg({
+        state_impact = self.aggregate('State_Abbreviation', {
             'Annual_Cost_Infant': 'mean',
             'MHI_2018': 'mean',
             'H_Under6_BothWork': 'sum',
             'TotalPop': 'mean'
-        }).reset_index()
+        })
         
-        state_impact['Cost_Burden'] = (state_impact['Annual_Cost_Infant'] / state_impact['MHI_2018']) * 100
-        state_impact['Working_Parent_Ratio'] = (state_impact['H_Under6_BothWork'] / state_impact['TotalPop']) * 100
+        state_impact['Cost_Burden'] = percent_ratio(state_impact['Annual_Cost_Infant'], state_impact['MHI_2018'])
+        state_impact['Working_Parent_Ratio'] = percent_ratio(state_impact['H_Under6_BothWork'], state_impact['TotalPop'])
         
         # Sort states by cost burden
         state_impact = state_impact.sort_values('Cost_Burden', ascending=True)
@@ -397,18 +499,19 @@ class ChildcareCostAnalysis:
             annotation['font'] = dict(size=16, color='black')
 
         # Cost Trend Comparison
-        yearly_trends = self.data.groupby(['Year', 'Income_Bracket']).agg({
+        yearly_trends = self.aggregate(['StudyYear', 'Income_Bracket'], {
             'Annual_Cost_Infant': 'mean',
             'MHI_2018': 'mean'
-        }).reset_index()
+        })
+        yearly_trends['Year'] = pd.to_datetime(yearly_trends['StudyYear'].astype(str), format='%Y')
 
         colors = px.colors.qualitative.Set3
-        for i, income_level in enumerate(['Very Low Income', 'Low Income', 'Middle Income', 'Upper Middle', 'High Income']):
-            mask = yearly_trends['Income_Bracket'] == income_level
+        trends = split_by(yearly_trends, 'Income_Bracket', order=self.INCOME_LEVELS)
+        for i, (income_level, trend) in enumerate(trends.items()):
             fig.add_trace(
                 go.Scatter(
-                    x=yearly_trends[mask]['Year'],
-                    y=yearly_trends[mask]['Annual_Cost_Infant'],
+                    x=trend['Year'],
+                    y=trend['Annual_Cost_Infant'],
                     name=income_level,
                     mode='lines+markers',
                     line=dict(width=3, color=colors[i]),
@@ -426,7 +529,10 @@ class ChildcareCostAnalysis:
             )
 
         # Save the dashboard
-        fig.write_html("../output/dashboard.html")
+        if lean_html:
+            write_lean_html(fig, "../output/dashboard.html", inline=inline_data)
+        else:
+            fig.write_html("../output/dashboard.html")
         return fig
 
     def generate_visualizations(self):
@@ -434,25 +540,17 @@ class ChildcareCostAnalysis:
         plt.style.use('seaborn-v0_8-darkgrid')
         
         # Correlation Analysis
-        variables = {
-            'MCInfant': 'Infant Care',
-            'MCToddler': 'Toddler Care',
-            'MCPreschool': 'Preschool',
-            'MHI_2018': 'Median Income',
-            'TotalPop': 'Population',
-            'H_Under6_BothWork': 'Working Parents'
-        }
+        variables = self.CORR_VARIABLES
         
-        # Create correlation matrix
-        corr_data = self.data[list(variables.keys())].copy()
-        corr_data.columns = [variables[col] for col in corr_data.columns]
+        # Create correlation matrix (once, for both the mask and the heatmap)
+        corr_matrix = self.covariance.corr(list(variables.keys())).rename(index=variables, columns=variables)
         
         # Create correlation matrix plot
         plt.figure(figsize=(12, 10))
-        mask = np.triu(np.ones_like(corr_data.corr(), dtype=bool))
+        mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
         
         # Create heatmap
-        sns.heatmap(corr_data.corr(), 
+        sns.heatmap(corr_matrix, 
                    mask=mask,
                    annot=True,
                    fmt='.2f',
@@ -471,6 +569,13 @@ class ChildcareCostAnalysis:
         plt.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the childcare cost dashboard and report figures.')
+    parser.add_argument('--lean-html', action='store_true',
+                        help='write the dashboard as a small HTML page with a compact payload and a shared plotly.js')
+    parser.add_argument('--inline-data', action='store_true',
+                        help='with --lean-html, also embed the payload so the page opens from disk')
+    args = parser.parse_args()
+
     analysis = ChildcareCostAnalysis()
-    analysis.create_dashboard()
+    analysis.create_dashboard(lean_html=args.lean_html, inline_data=args.inline_data)
     analysis.generate_visualizations()
\ No newline at end of file
@@ -19,10 +19,33 @@ This script generates static visualizations for the childcare cost analysis:
 import pandas as pd
 import numpy as np
 import seaborn as sns
+import matplotlib
 import matplotlib.pyplot as plt
 import geopandas as gpd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import argparse
 import os
+import pickle
+import sys
+
+# Make the shared ndcp package at the repository root importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ndcp import CACHE_DIR, REPO_ROOT, apply_schema, read_ndcp
+from ndcp.adjacency import state_neighbors
+from ndcp.cache import CACHE_FORMAT, CACHE_SUFFIX, file_digest, read_cache, source_columns, write_cache
+from ndcp.covariance import CovarianceAccumulator
+from ndcp.cube import AggregateCube
+from ndcp.geometry import contrast_colors, label_points, load_shapes, lod_for
+from ndcp.image_variants import VARIANTS_SUBDIR, variant_files, write_variants
+from ndcp.impute import (FROM_NEIGHBOR_YEAR, imputation_audit, impute_missing, imputed_mask,
+                         source_column, write_imputation_audit)
+from ndcp.lookup import STATE_NEIGHBORS, StateYearIndex
+from ndcp.partitions import PARTITION_ROOT, read_partitions, sync_partitions, year_fingerprints
+from ndcp.render_cache import RenderCache, fingerprint, package_digest, publish
+from ndcp.sketch import median
+from ndcp.streaming import GroupStats, iter_chunks, stream_group_stats
 
 # Set style for all plots
 plt.style.use('seaborn-v0_8')
@@ -37,16 +60,99 @@ output_dir.mkdir(exist_ok=True)
 img_dir = output_dir / 'images'
 img_dir.mkdir(exist_ok=True)
 
-# Define state neighbors for missing value imputation
-STATE_NEIGHBORS = {
-    'IN': ['IL', 'KY', 'MI', 'OH'],  # Indiana's neighbors
-    'NM': ['AZ', 'CO', 'OK', 'TX']   # New Mexico's neighbors
+# Bump when the processing in process_rows changes, so stored year partitions are rebuilt
+PROCESSING_VERSION = 2
+
+# Bundled Census state boundaries (maps and neighbor-based imputation)
+shapefile_path = script_dir / 'data/cb_2018_us_state_20m/cb_2018_us_state_20m.shp'
+
+# Render profiles: 'publication' is the committed output; 'draft' is for
+# iterating on a chart (lower dpi, no tight bounding-box pass, coarser map
+# shapes) and writes to output/images/draft with its own render cache
+RENDER_PROFILES = {
+    'publication': {'dpi': 300, 'bbox_inches': 'tight', 'subdir': None},
+    'draft': {'dpi': 100, 'bbox_inches': None, 'subdir': 'draft'},
 }
+render_profile = 'publication'
+
+# Level of detail of the state shapes for the 15-inch choropleths at the profile's dpi
+MAP_LOD = lod_for(15 * RENDER_PROFILES[render_profile]['dpi'])
+
+# Dimensions and measures of the shared cube used by the charts
+CUBE_DIMS = ['State_Abbreviation', 'StudyYear', 'Urban_Rural']
+CUBE_MEASURES = ['MCInfant', 'MCToddler', 'MCPreschool',
+                 'Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool',
+                 'Cost_Burden', 'Working_Parent_Ratio']
+
+# Measures of the correlation heatmap; their cross-products are kept per state and year
+CORR_MEASURES = ['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool',
+                 'Cost_Burden', 'Working_Parent_Ratio', 'TotalPop', 'MHI_2018']
+
+# Charts rendered by save_visualizations, in order
+CHARTS = ['time_series', 'urban_rural_comparison', 'cost_distribution', 'state_costs',
+          'choropleth_maps', 'correlation', 'spiral_plot']
+
+# Files written by each chart, the inputs it reads and the functions that draw it;
+# together with the plotting style these make up the chart's render cache key
+CHART_OUTPUTS = {
+    'time_series': ['time_series.png'],
+    'urban_rural_comparison': ['urban_rural_comparison.png'],
+    'cost_distribution': ['cost_distribution.png'],
+    'state_costs': ['state_costs.png'],
+    'choropleth_maps': ['cost_map.png', 'labor_force_map.png'],
+    'correlation': ['correlation.png'],
+    'spiral_plot': ['spiral_plot.png'],
+}
+CHART_INPUTS = {
+    'time_series': ['cube'],
+    'urban_rural_comparison': ['cube'],
+    'cost_distribution': ['rows', 'quantile_eps'],
+    'state_costs': ['cube'],
+    'choropleth_maps': ['cube', 'shapefile'],
+    'correlation': ['covariance'],
+    'spiral_plot': ['cube'],
+}
+CHART_FUNCTIONS = {
+    'time_series': ['create_time_series'],
+    'urban_rural_comparison': ['create_urban_rural_comparison'],
+    'cost_distribution': ['create_cost_distribution'],
+    'state_costs': ['create_state_costs_visualization', 'neighbor_note'],
+    'choropleth_maps': ['create_choropleth_maps', 'annotate_states', 'neighbor_note'],
+    'correlation': ['create_correlation_analysis'],
+    'spiral_plot': ['create_spiral_plot'],
+}
+
+# Where the parallel renderer leaves the prepared inputs for its worker processes
+RENDER_BUNDLE_DIR = CACHE_DIR / 'render' / 'milestone5' / 'bundle'
+
+# Copies of the rendered charts used by the GitHub Pages site
+docs_img_dir = REPO_ROOT / 'docs' / 'images'
 
-def get_state_value(df, state, column, year):
+# Columns whose neighbor-imputed rows are counted in the cube for chart footnotes
+NOTE_COLUMNS = ['MCInfant']
+
+# Based on the technical guide, we'll keep only essential columns
+# Core location and time identifiers
+core_columns = ['State_Name', 'State_Abbreviation', 'County_Name', 'County_FIPS_Code', 'StudyYear']
+
+# Key demographic variables
+demographic_columns = ['TotalPop', 'H_Under6_BothWork', 'H_Under6_SingleM', 
+                      'H_6to17_BothWork', 'H_6to17_SingleM', 'MHI_2018']
+
+# Key childcare price metrics (keeping only the main provider types)
+# MC: Center-based care
+# MFCC: Family childcare homes
+childcare_columns = ['MCInfant', 'MCToddler', 'MCPreschool',
+                    'MFCCInfant', 'MFCCToddler', 'MFCCPreschool']
+
+def get_state_value(df, state, column, year, neighbors=STATE_NEIGHBORS):
     """
     Get value for a state by trying different strategies.
     
+    Useful for one-off lookups on an arbitrary frame. For repeated lookups,
+    build an `ndcp.lookup.StateYearIndex` once and call its `get`/`gather`,
+    which return the same values without rescanning the frame.
+    
     Parameters:
     -----------
     df : DataFrame
@@ -57,6 +163,8 @@ def get_state_value(df, state, column, year):
         The column name for which to get the value
     year : int
         The year for which to get the value
+    neighbors : dict
+        Maps a state abbreviation to its neighbors (see `ndcp.adjacency`)
         
     Returns:
     --------
@@ -76,9 +184,9 @@ def get_state_value(df, state, column, year):
         return state_mean
     
     # Strategy 3: Try to get value from neighboring states in the same year
-    if state in STATE_NEIGHBORS:
+    if state in neighbors:
         neighbor_data = df[
-            (df['State_Abbreviation'].isin(STATE_NEIGHBORS[state])) & 
+            (df['State_Abbreviation'].isin(neighbors[state])) & 
             (df['StudyYear'] == year)
         ]
         neighbor_mean = neighbor_data[column].mean()
@@ -88,141 +196,427 @@ def get_state_value(df, state, column, year):
     # Strategy 4: Use the global mean as a last resort
     return df[column].mean()
 
-def load_actual_data():
-    """Load actual data from the National Database of Childcare Prices."""
-    data_path = Path(__file__).parent / '../../data/nationaldatabaseofchildcareprices.xlsx'
-    print(f"\nLoading data from: {data_path}")
-    
-    # Load the data
-    df = pd.read_excel(data_path)
-    print(f"\nInitial data shape: {df.shape}")
+def process_rows(df_raw, childcare_columns, neighbors, value_index, float32=False, verbose=True):
+    """
+    Impute the childcare columns of raw rows and add the derived metrics.
     
-    # Based on the technical guide, we'll keep only essential columns
-    # Core location and time identifiers
-    core_columns = ['State_Name', 'State_Abbreviation', 'County_Name', 'County_FIPS_Code', 'StudyYear']
+    Works on any subset of years or rows: the fallback means come from
+    `value_index`, which is built over all years. Each imputed column gets a
+    uint8 <column>_Source flag recording the strategy used.
+    """
+    # Handle missing values using the state-based approach for key childcare columns,
+    # filling all of them in one vectorized pass (same strategies as get_state_value)
+    processed_df = impute_missing(df_raw, childcare_columns, neighbors,
+                                  index=value_index, provenance=True)
     
-    # Key demographic variables
-    demographic_columns = ['TotalPop', 'H_Under6_BothWork', 'H_Under6_SingleM', 
-                          'H_6to17_BothWork', 'H_6to17_SingleM', 'MHI_2018']
+    # Calculate derived metrics
+    if verbose:
+        print("\nCalculating derived metrics...")
+    processed_df['Annual_Cost_Infant'] = processed_df['MCInfant'] * 12
+    processed_df['Annual_Cost_Toddler'] = processed_df['MCToddler'] * 12
+    processed_df['Annual_Cost_Preschool'] = processed_df['MCPreschool'] * 12
+    processed_df['Cost_Burden'] = (processed_df['Annual_Cost_Infant'] / processed_df['MHI_2018']) * 100
+    processed_df['Working_Parent_Ratio'] = (processed_df['H_Under6_BothWork'] / processed_df['TotalPop']) * 100
     
-    # Key childcare price metrics (keeping only the main provider types)
-    # MC: Center-based care
-    # MFCC: Family childcare homes
-    childcare_columns = ['MCInfant', 'MCToddler', 'MCPreschool',
-                        'MFCCInfant', 'MFCCToddler', 'MFCCPreschool']
+    # Add Urban/Rural classification based on population
+    processed_df['Urban_Rural'] = np.where(processed_df['TotalPop'] > 500000, 'Urban', 'Rural')
+    return apply_schema(processed_df, float32=float32, verbose=verbose)
+
+def summarize_year(year_df):
+    """State-level means of the derived metrics for one StudyYear partition."""
+    measures = ['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool',
+                'Cost_Burden', 'Working_Parent_Ratio']
+    grouped = year_df.groupby(['StudyYear', 'State_Abbreviation'], observed=True)
+    summary = grouped[measures].mean()
+    summary['Counties'] = grouped.size()
+    return summary.reset_index()
+
+def load_actual_data(stream=False, float32=False, incremental=False):
+    """
+    Load actual data from the National Database of Childcare Prices.
+
+    Only the essential columns are read. With `stream=True` the workbook is
+    parsed in read-only chunks instead of going through the columnar cache,
+    so peak memory scales with the selected columns rather than the sheet.
+    The returned frame uses the compact schema from `ndcp.schema`; pass
+    `float32=True` to also store the price and ratio measures as float32.
+
+    With `incremental=True` the processed rows are stored per StudyYear under
+    data/.cache/processed/milestone5 and only the years whose inputs changed
+    are re-imputed; the rows come back in the same order as a full run.
+    """
+    data_path = Path(__file__).parent / '../../data/nationaldatabaseofchildcareprices.xlsx'
+    print(f"\nLoading data from: {data_path}")
     
-    # Columns to keep
+    # Based on the technical guide, we'll keep only essential columns
     columns_to_keep = core_columns + demographic_columns + childcare_columns
     
+    # Load only the essential columns (served from the columnar cache after the first run)
+    df_filtered = apply_schema(read_ndcp(data_path, columns=columns_to_keep, stream=stream))
+    print(f"\nInitial data shape: {df_filtered.shape}")
+    print(f"\nFiltered to {len(columns_to_keep)} essential columns from {len(source_columns(data_path))} original columns")
+    
     # Check what percentage of data is missing in key columns
     print("\nMissing data in key childcare columns:")
     for col in childcare_columns:
-        missing_pct = df[col].isna().mean() * 100
+        missing_pct = df_filtered[col].isna().mean() * 100
         print(f"{col}: {missing_pct:.1f}% missing")
     
-    # Filter to keep only essential columns
-    df_filtered = df[columns_to_keep].copy()
-    print(f"\nFiltered to {len(columns_to_keep)} essential columns from {df.shape[1]} original columns")
-    
-    print("\nChecking data for IN and NM before any processing:")
-    for state in ['IN', 'NM']:
-        state_data = df_filtered[df_filtered['State_Abbreviation'] == state]
-        if len(state_data) > 0:
-            print(f"\n{state} raw data:")
-            print(f"Number of rows: {len(state_data)}")
-            print(f"Years covered: {sorted(state_data['StudyYear'].unique())}")
-            print("\nSample row for {state}:")
-            print(state_data[['StudyYear', 'State_Abbreviation', 'MCInfant', 'MCToddler', 'MCPreschool']].head(1).to_string())
-            print(f"\nValue counts for MCInfant:")
-            print(state_data['MCInfant'].value_counts(dropna=False))
-    
     print("\nHandling missing values...")
-    # Create a copy of the dataframe to store the processed data
-    processed_df = df_filtered.copy()
-    
-    # Handle missing values using the state-based approach for key childcare columns
-    for col in childcare_columns:
-        missing_mask = df_filtered[col].isna()
-        if missing_mask.any():
-            print(f"\nHandling {missing_mask.sum()} missing values in {col}")
-            for idx in df_filtered[missing_mask].index:
-                state = df_filtered.loc[idx, 'State_Abbreviation']
-                year = df_filtered.loc[idx, 'StudyYear']
-                value = get_state_value(df_filtered, state, col, year)
-                processed_df.loc[idx, col] = value
-            
-            # Print sample of filled values for verification
-            sample_states = ['IN', 'NM']
-            for state in sample_states:
-                state_data = processed_df[processed_df['State_Abbreviation'] == state]
-                if len(state_data) > 0:
-                    print(f"\n{state} {col} sample filled values (first 5 rows):")
-                    print(state_data[['StudyYear', col]].head().to_string())
-    
-    # Calculate derived metrics
-    print("\nCalculating derived metrics...")
-    processed_df['Annual_Cost_Infant'] = processed_df['MCInfant'] * 12
-    processed_df['Annual_Cost_Toddler'] = processed_df['MCToddler'] * 12
-    processed_df['Annual_Cost_Preschool'] = processed_df['MCPreschool'] * 12
-    processed_df['Cost_Burden'] = (processed_df['Annual_Cost_Infant'] / processed_df['MHI_2018']) * 100
-    processed_df['Working_Parent_Ratio'] = (processed_df['H_Under6_BothWork'] / processed_df['TotalPop']) * 100
-    
-    # Add Urban/Rural classification based on population
-    processed_df['Urban_Rural'] = processed_df['TotalPop'].apply(lambda x: 'Urban' if x > 500000 else 'Rural')
-    
-    # Filter data for 2008-2018
-    processed_df = processed_df[(processed_df['StudyYear'] >= 2008) & (processed_df['StudyYear'] <= 2018)]
+    # Neighbors of every state, derived from the bundled shapefile (cached after the first run)
+    neighbors = state_neighbors(shapefile_path)
+    
+    # Index the observed values of all years once; imputation of any subset of
+    # years reads its state, neighbor and global means from it
+    value_index = StateYearIndex.from_frame(df_filtered, childcare_columns, neighbors)
+    
+    # Keep data for 2008-2018
+    in_range = df_filtered[(df_filtered['StudyYear'] >= 2008) & (df_filtered['StudyYear'] <= 2018)]
+    
+    def build(rows):
+        return process_rows(rows, childcare_columns, neighbors, value_index, float32=float32)
+    
+    if incremental:
+        # Only years whose inputs changed since the last run are re-processed
+        fingerprints = year_fingerprints(in_range, childcare_columns, value_index, neighbors,
+                                         config=f"v{PROCESSING_VERSION} float32={float32}")
+        store_dir = PARTITION_ROOT / 'milestone5'
+        rebuilt = sync_partitions(in_range, fingerprints, build, store_dir, summarize=summarize_year)
+        print(f"\nRebuilt {len(rebuilt)} of {len(fingerprints)} year partitions: {rebuilt}")
+        processed_df = apply_schema(read_partitions(store_dir, fingerprints), verbose=False)
+    else:
+        processed_df = build(in_range)
     print(f"\nFiltered data to 2008-2018: {len(processed_df)} rows")
     
-    # Check processed data
-    print("\nChecking IN and NM data after processing:")
-    for state in ['IN', 'NM']:
-        state_data = processed_df[processed_df['State_Abbreviation'] == state]
-        if len(state_data) > 0:
-            print(f"\n{state} processed data:")
-            print(f"Number of rows: {len(state_data)}")
-            print(f"Years covered: {sorted(state_data['StudyYear'].unique())}")
-            print("\nSummary statistics for Annual_Cost_Infant:")
-            print(state_data['Annual_Cost_Infant'].describe())
-            print("\nSample processed rows:")
-            print(state_data[['StudyYear', 'State_Abbreviation', 'Annual_Cost_Infant', 'MCInfant']].head().to_string())
-            
-            # Print information about data sources
-            print("\nData sources used for MCInfant:")
-            missing_count = df_filtered[df_filtered['State_Abbreviation'] == state]['MCInfant'].isna().sum()
-            if missing_count > 0:
-                print(f"Values imputed from neighboring states: {STATE_NEIGHBORS[state]}")
+    # Summarize where the filled values came from
+    audit = imputation_audit(processed_df, childcare_columns, neighbors)
+    audit_path = write_imputation_audit(audit, output_dir / 'imputation_audit.json')
+    for col, counts in audit['columns'].items():
+        imputed = {name: n for name, n in counts.items() if name != 'observed' and n}
+        if imputed:
+            print(f"{col}: {counts['observed']} observed, imputed {imputed}")
+    print(f"Imputation audit saved: {audit_path.name}")
     
     return processed_df
 
-def save_visualizations():
-    """Save all static visualizations as PNG files."""
-    print("Generating static visualizations...")
+def neighbor_count_column(column):
+    """Cube measure counting the rows whose `column` value came from neighboring states."""
+    return column + '_FromNeighbors'
+
+def cube_frame(df):
+    """
+    Add the neighbor-imputation counters to processed rows.
     
-    # Load and process data
-    df = load_actual_data()
+    Returns the frame and the list of measures to aggregate: `CUBE_MEASURES`
+    plus, for each `NOTE_COLUMNS` column, a 0/1 measure marking the rows that
+    were imputed from neighboring states, so footnotes can be built without
+    going back to the county-level frame.
+    """
+    flags = {}
+    for col in NOTE_COLUMNS:
+        if source_column(col) in df.columns:
+            flags[neighbor_count_column(col)] = imputed_mask(df, [col], FROM_NEIGHBOR_YEAR).astype(float)
+    return df.assign(**flags), list(CUBE_MEASURES) + list(flags)
+
+def build_cube(df):
+    """Aggregate the processed rows once into the cube every chart slices from."""
+    frame, measures = cube_frame(df)
+    return AggregateCube.from_frame(frame, measures, dims=CUBE_DIMS)
+
+def build_covariance(df):
+    """Accumulate the cross-products of `CORR_MEASURES` per state and year in one pass."""
+    return CovarianceAccumulator.from_frame(df, CORR_MEASURES, dims=['State_Abbreviation', 'StudyYear'])
+
+def stream_aggregates(chunk_size=50_000):
+    """
+    Build the chart cube and covariance without holding the county-level rows in memory.
+    
+    The workbook is streamed twice in read-only chunks. The first pass keeps
+    per state and year counts and sums of the childcare columns, from which
+    the imputation index is built; the second imputes each chunk, derives
+    the metrics and folds it into mergeable per-group accumulators (Welford
+    mean/variance, min, max, count, and the covariance cross-products).
+    Memory follows the number of state x year x area cells, not the number
+    of rows.
+    """
+    data_path = Path(__file__).parent / '../../data/nationaldatabaseofchildcareprices.xlsx'
+    print(f"\nStreaming data from: {data_path}")
+    neighbors = state_neighbors(shapefile_path)
+    
+    # Pass 1: observed means of every state and year for the imputation fallbacks
+    keys = ['State_Abbreviation', 'StudyYear']
+    observed = stream_group_stats(iter_chunks(data_path, keys + childcare_columns, chunk_size=chunk_size),
+                                  keys, childcare_columns)
+    value_index = StateYearIndex.from_sums(observed.count, observed.mean * observed.count, neighbors)
+    
+    # Pass 2: impute and derive chunk by chunk, keeping only the cube cells
+    def prepare(chunk):
+        processed = process_rows(chunk, childcare_columns, neighbors, value_index, verbose=False)
+        return cube_frame(processed)[0]
+    
+    measures = CUBE_MEASURES + [neighbor_count_column(col) for col in NOTE_COLUMNS]
+    stats = GroupStats(CUBE_DIMS, measures)
+    covariance = CovarianceAccumulator(CORR_MEASURES, dims=['State_Abbreviation', 'StudyYear'])
+    for chunk in iter_chunks(data_path, core_columns + demographic_columns + childcare_columns,
+                             years=(2008, 2018), chunk_size=chunk_size):
+        frame = prepare(chunk)
+        stats.update(frame)
+        covariance.update(frame)
+    print(f"\nStreamed {int(stats.count[measures[0]].sum())} rows into {len(stats.count)} cube cells")
+    return stats.to_cube(), covariance
+
+def neighbor_note(cube, column, template, where=None):
+    """
+    Build a footnote naming the states whose `column` values were imputed from
+    neighboring states, using the provenance counts in the cube (optionally
+    restricted by `where`, e.g. to one year). Returns None when no such state
+    is present.
+    """
+    measure = neighbor_count_column(column)
+    if measure not in cube.measures:
+        return None
+    counts = cube.total('State_Abbreviation', [measure], where)[measure]
+    states = sorted(str(state) for state in counts.index[counts > 0])
+    if not states:
+        return None
+    names = states[0] if len(states) == 1 else ', '.join(states[:-1]) + ' and ' + states[-1]
+    return template.format(states=names)
+
+def render_chart(name, inputs):
+    """
+    Render one chart of `CHARTS` from the prepared inputs; returns False if
+    the chart was skipped.
+    
+    `inputs` holds the cube, the covariance accumulator, the rows needed by
+    the cost distribution (None when they were not loaded), `quantile_eps`
+    and optionally the state boundaries (loaded from the geometry cache at
+    `MAP_LOD` if absent). Files are written with `save_chart` under the
+    current render profile.
+    """
+    cube, covariance = inputs['cube'], inputs['covariance']
+    if name == 'time_series':
+        create_time_series(cube)
+    elif name == 'urban_rural_comparison':
+        create_urban_rural_comparison(cube)
+    elif name == 'cost_distribution':
+        if inputs['rows'] is None:
+            print("Skipped: cost_distribution.png (needs row-level data)")
+            return False
+        else:
+            create_cost_distribution(inputs['rows'], inputs['quantile_eps'])
+    elif name == 'state_costs':
+        create_state_costs_visualization(cube)
+    elif name == 'choropleth_maps':
+        states_gdf = inputs.get('states_gdf')
+        if states_gdf is None:
+            states_gdf = load_shapes(shapefile_path, MAP_LOD)
+        create_choropleth_maps(cube, states_gdf, label_points(shapefile_path))
+    elif name == 'correlation':
+        create_correlation_analysis(covariance)
+    elif name == 'spiral_plot':
+        create_spiral_plot(cube)
+    else:
+        raise ValueError(f"Unknown chart: {name}")
+    return True
+
+def set_render_profile(name):
+    """
+    Select one of `RENDER_PROFILES` for the charts drawn in this process.
     
-    # Load geographic data
-    shapefile_path = script_dir / 'data/cb_2018_us_state_20m/cb_2018_us_state_20m.shp'
-    states_gdf = gpd.read_file(shapefile_path)
+    Sets the output directory and the map level of detail to match.
+    """
+    global render_profile, img_dir, MAP_LOD
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}; expected one of {list(RENDER_PROFILES)}")
+    profile = RENDER_PROFILES[name]
+    render_profile = name
+    img_dir = output_dir / 'images'
+    if profile['subdir']:
+        img_dir = img_dir / profile['subdir']
+    img_dir.mkdir(parents=True, exist_ok=True)
+    MAP_LOD = lod_for(15 * profile['dpi'])
+
+def save_chart(filename, **kwargs):
+    """Save the current figure to `img_dir` with the dpi and bounding box of the render profile."""
+    profile = RENDER_PROFILES[render_profile]
+    plt.savefig(img_dir / filename, dpi=profile['dpi'], bbox_inches=profile['bbox_inches'], **kwargs)
+
+def write_render_bundle(inputs, bundle_dir=RENDER_BUNDLE_DIR):
+    """
+    Write the chart inputs once for the worker processes.
     
-    # Generate all visualizations
-    create_time_series(df)
-    create_urban_rural_comparison(df)
-    create_cost_distribution(df)
-    create_state_costs_visualization(df)
-    create_choropleth_maps(df, states_gdf)
-    create_correlation_analysis(df)
-    create_spiral_plot(df)
+    The rows go to the columnar cache format and the (small) aggregates to a
+    pickle, so each worker reads them once at start-up instead of receiving
+    a pickled DataFrame with every task.
+    """
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    rows_path = bundle_dir / f"rows{CACHE_SUFFIX[CACHE_FORMAT]}"
+    if inputs['rows'] is not None:
+        write_cache(inputs['rows'], rows_path, CACHE_FORMAT)
+    else:
+        rows_path.unlink(missing_ok=True)
+    aggregates = {key: inputs[key] for key in ('cube', 'covariance', 'quantile_eps')}
+    with open(bundle_dir / 'aggregates.pkl', 'wb') as f:
+        pickle.dump(aggregates, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return bundle_dir
+
+# Inputs loaded by each worker process from the render bundle
+_worker_inputs = None
+
+def _init_render_worker(bundle_dir, profile='publication'):
+    global _worker_inputs
+    plt.switch_backend('Agg')
+    set_render_profile(profile)
+    bundle_dir = Path(bundle_dir)
+    with open(bundle_dir / 'aggregates.pkl', 'rb') as f:
+        _worker_inputs = pickle.load(f)
+    rows_path = bundle_dir / f"rows{CACHE_SUFFIX[CACHE_FORMAT]}"
+    _worker_inputs['rows'] = read_cache(rows_path, CACHE_FORMAT) if rows_path.exists() else None
+
+def _render_in_worker(name):
+    return render_chart(name, _worker_inputs)
+
+def chart_keys(inputs):
+    """
+    Render cache key of every chart: a fingerprint of the inputs it reads,
+    the source of the functions that draw it, the sources of the `ndcp`
+    package (whose helpers also shape the charts), and the plotting style
+    (rcParams, library versions and the render profile; figure sizes live
+    in the source).
+    """
+    values = dict(inputs, shapefile=[file_digest(shapefile_path), MAP_LOD])
+    input_prints = {}
+    style = fingerprint([sorted(plt.rcParams.items(), key=lambda item: item[0]),
+                         matplotlib.__version__, sns.__version__, gpd.__version__,
+                         RENDER_PROFILES[render_profile]])
+    helpers = package_digest()
+    keys = {}
+    for name in CHARTS:
+        for key in CHART_INPUTS[name]:
+            if key not in input_prints:
+                input_prints[key] = fingerprint(values[key])
+        keys[name] = fingerprint([
+            name,
+            [input_prints[key] for key in CHART_INPUTS[name]],
+            [globals()[func] for func in ['render_chart', 'save_chart'] + CHART_FUNCTIONS[name]],
+            helpers,
+            style,
+        ])
+    return keys
+
+def render_charts(inputs, jobs=1, use_cache=True):
+    """
+    Render every chart in `CHARTS`, serially or with `jobs` worker processes.
+    
+    With `use_cache`, charts whose inputs, code and style are unchanged since
+    the last run are restored from the render cache instead of being drawn.
+    Workers are started with the 'spawn' method and the Agg backend, so each
+    chart is drawn in a fresh interpreter with the same style settings as a
+    serial run and the PNGs come out the same either way.
+    
+    Returns the charts drawn or restored in this run, in `CHARTS` order;
+    skipped charts are left out, so their old files are not passed on.
+    """
+    pending = list(CHARTS)
+    if use_cache:
+        profile_dir = RENDER_PROFILES[render_profile]['subdir']
+        cache = RenderCache('milestone5' + (f"-{profile_dir}" if profile_dir else ''))
+        keys = chart_keys(inputs)
+        pending = [name for name in CHARTS
+                   if not cache.fetch(name, keys[name], [img_dir / f for f in CHART_OUTPUTS[name]])]
+    
+    if jobs <= 1 or len(pending) <= 1:
+        drawn = [render_chart(name, inputs) for name in pending]
+    else:
+        bundle_dir = write_render_bundle(inputs)
+        os.environ['MPLBACKEND'] = 'Agg'
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending)), mp_context=context,
+                                 initializer=_init_render_worker,
+                                 initargs=(str(bundle_dir), render_profile)) as pool:
+            # Slowest charts first so the run takes about as long as the slowest one
+            order = sorted(pending, key=lambda name: name != 'choropleth_maps')
+            done = dict(zip(order, pool.map(_render_in_worker, order)))
+        drawn = [done[name] for name in pending]
+    
+    redrawn = [name for name, ok in zip(pending, drawn) if ok]
+    if use_cache:
+        for name in redrawn:
+            cache.store(name, keys[name], [img_dir / f for f in CHART_OUTPUTS[name]])
+        cache.save()
+        print(f"\n{cache.report()}" + (f"; re-rendered: {', '.join(redrawn)}" if redrawn else ""))
+    skipped = set(pending) - set(redrawn)
+    return [name for name in CHARTS if name not in skipped]
+
+def save_visualizations(stream=False, float32=False, incremental=False, out_of_core=False,
+                        quantile_eps=None, jobs=1, use_cache=True, publish_docs=False,
+                        profile='publication', variants=True):
+    """
+    Save all static visualizations as PNG files.
+    
+    With `out_of_core=True` the county-level rows are never materialized:
+    the cube and covariance are accumulated from streamed chunks, and the
+    cost distribution chart, which needs row-level values, is skipped.
+    `quantile_eps` switches the median annotations to a quantile sketch
+    with that rank error. With `jobs > 1` the charts are rendered by that
+    many worker processes. Unchanged charts are served from the render
+    cache unless `use_cache=False`; `publish_docs=True` then copies the
+    changed images into docs/images. `profile` selects one of
+    `RENDER_PROFILES`; only publication renders can be published.
+    Publication renders also get web-sized variants in images/variants
+    (with a manifest for srcset) unless `variants=False`.
+    """
+    if publish_docs and profile != 'publication':
+        raise ValueError("Only the publication profile can be published to docs/images")
+    set_render_profile(profile)
+    print(f"Generating static visualizations ({profile} profile)...")
+    
+    if out_of_core:
+        df = None
+        cube, covariance = stream_aggregates()
+    else:
+        # Load and process data
+        df = load_actual_data(stream=stream, float32=float32, incremental=incremental)
+        
+        # Aggregate once; the charts below slice their means, deviations and
+        # correlations from the cube and the covariance accumulator
+        cube = build_cube(df)
+        covariance = build_covariance(df)
+    
+    # Generate all visualizations (the distribution chart still needs the county-level values)
+    inputs = {
+        'cube': cube,
+        'covariance': covariance,
+        'rows': None if df is None else df[['MCInfant', 'MCToddler', 'MCPreschool']],
+        'quantile_eps': quantile_eps,
+    }
+    rendered = render_charts(inputs, jobs, use_cache)
+    
+    # Only the charts of this run: a skipped chart's file may be left over from an earlier run
+    outputs = [img_dir / f for name in rendered for f in CHART_OUTPUTS[name]]
+    variant_dir = img_dir / VARIANTS_SUBDIR
+    if variants and profile == 'publication':
+        written = write_variants(outputs, variant_dir)
+        print(f"Web variants in {variant_dir}: {len(written)} file(s) updated")
+    
+    if publish_docs:
+        copied = publish(outputs, docs_img_dir)
+        print(f"Published {len(copied)} changed image(s) to {docs_img_dir}" +
+              (f": {', '.join(copied)}" if copied else ""))
+        variant_paths = variant_files(outputs, variant_dir)
+        if variant_paths:
+            copied = publish(variant_paths, docs_img_dir / VARIANTS_SUBDIR)
+            print(f"Published {len(copied)} changed web variant file(s) to {docs_img_dir / VARIANTS_SUBDIR}")
     
     print(f"\nAll static visualizations saved in: {img_dir}")
 
-def create_time_series(df):
+def create_time_series(cube):
     """Create a time series visualization showing trends in childcare costs."""
     plt.figure(figsize=(12, 8), facecolor='#F0F0F8')
     
     # Calculate annual averages by year
-    yearly_data = df.groupby('StudyYear')[['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool']].mean()
+    yearly_data = cube.mean('StudyYear', ['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool'])
     
     # Create color palette using cubehelix
     palette = sns.cubehelix_palette(start=.5, rot=-.75, n_colors=3)
@@ -256,16 +650,16 @@ def create_time_series(df):
     
     plt.legend(loc='upper left', fontsize=10)
     plt.tight_layout()
-    plt.savefig(img_dir / 'time_series.png', dpi=300, bbox_inches='tight', facecolor='#F0F0F8')
+    save_chart('time_series.png', facecolor='#F0F0F8')
     plt.close()
     print("Saved: time_series.png")
 
-def create_urban_rural_comparison(df):
+def create_urban_rural_comparison(cube):
     """Create a bar chart comparing childcare costs in urban vs. rural areas."""
     plt.figure(figsize=(12, 8), facecolor='#F0F0F8')
     
     # Group by urban/rural and calculate means
-    grouped_data = df.groupby('Urban_Rural')[['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool']].mean()
+    grouped_data = cube.mean('Urban_Rural', ['Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool'])
     
     # Create a bar chart
     bar_width = 0.25
@@ -302,12 +696,16 @@ def create_urban_rural_comparison(df):
     
     plt.legend(loc='upper right', fontsize=10)
     plt.tight_layout()
-    plt.savefig(img_dir / 'urban_rural_comparison.png', dpi=300, bbox_inches='tight')
+    save_chart('urban_rural_comparison.png')
     plt.close()
     print("Saved: urban_rural_comparison.png")
 
-def create_cost_distribution(df):
-    """Create a violin plot showing the cost distribution across care types."""
+def create_cost_distribution(df, quantile_eps=None):
+    """
+    Create a violin plot showing the cost distribution across care types.
+    
+    Medians are exact unless `quantile_eps` is given (see `ndcp.sketch`).
+    """
     # Set up the figure with a nice background
     plt.figure(figsize=(12, 8), facecolor='white')
     
@@ -349,7 +747,7 @@ def create_cost_distribution(df):
     # Add summary statistics with background boxes for readability
     for i, care_type in enumerate(care_types):
         mean_cost = df[care_type].mean()
-        median_cost = df[care_type].median()
+        median_cost = median(df[care_type], quantile_eps)
         
         # Create a background box for the statistics
         bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8)
@@ -370,18 +768,51 @@ def create_cost_distribution(df):
     
     # Save the figure
     plt.tight_layout()
-    plt.savefig(img_dir / 'cost_distribution.png', dpi=300, bbox_inches='tight', facecolor='white')
+    save_chart('cost_distribution.png', facecolor='white')
     plt.close()
     print("Saved: cost_distribution.png")
 
-def create_choropleth_maps(df, states_gdf):
-    """Create choropleth maps for costs and labor force participation."""
-    # Latest year data
-    latest_year = df['StudyYear'].max()
-    latest_data = df[df['StudyYear'] == latest_year]
+def annotate_states(ax, states, column, template):
+    """
+    Label every continental state with its value at the precomputed label point.
+    
+    Text and box colors are computed for all states at once against the
+    median of `column`; `template` is formatted with `abbr` and `value`.
+    """
+    # Skip Alaska and Hawaii for better focus on continental US
+    shown = states[~states['STUSPS'].isin(['AK', 'HI']) & states[column].notna()]
+    text_colors, box_colors = contrast_colors(shown[column], states[column].median())
+    
+    for abbr, value, x, y, text_color, box_color in zip(
+            shown['STUSPS'], shown[column], shown['label_x'], shown['label_y'], text_colors, box_colors):
+        # Add the annotation with a small background box behind the text
+        ax.annotate(template.format(abbr=abbr, value=value),
+                   xy=(x, y),
+                   ha='center', va='center',
+                   fontsize=8,
+                   color=text_color,
+                   fontweight='bold',
+                   bbox=dict(boxstyle="round,pad=0.3", fc=box_color, ec=box_color, alpha=0.5))
+
+def create_choropleth_maps(cube, states_gdf, labels=None):
+    """
+    Create choropleth maps for costs and labor force participation.
+    
+    `labels` is the label-point table of the shapefile (see
+    `ndcp.geometry.label_points`); it is loaded from the cache when omitted.
+    """
+    if labels is None:
+        labels = label_points(shapefile_path)
+    # Latest year data: one row of state means. (Merging the county rows, as
+    # the maps first did, drew each state once per county, so the color and
+    # label on top came from whichever county was drawn last; see README.md.)
+    latest_year = max(cube.values('StudyYear'))
+    latest_data = cube.mean('State_Abbreviation', ['Annual_Cost_Infant', 'Working_Parent_Ratio'],
+                            where={'StudyYear': latest_year}).reset_index()
     
     # Merge with geographic data
     states = states_gdf.merge(latest_data, left_on='STUSPS', right_on='State_Abbreviation', how='left')
+    states = states.merge(labels, left_on='STUSPS', right_index=True, how='left')
     
     # Set up figure for cost map
     fig, ax = plt.subplots(figsize=(15, 10), facecolor='white')
@@ -414,27 +845,7 @@ def create_choropleth_maps(df, states_gdf):
     states_gdf.boundary.plot(ax=ax, color='black', linewidth=0.3, alpha=0.5)
     
     # Add state labels with text boxes for better visibility
-    for idx, row in states.iterrows():
-        # Skip Alaska and Hawaii for better focus on continental US
-        if row['STUSPS'] not in ['AK', 'HI'] and not pd.isna(row['Annual_Cost_Infant']):
-            centroid = row.geometry.centroid
-            cost_value = row['Annual_Cost_Infant']
-            
-            # Calculate text color based on cost value
-            text_color = 'white' if cost_value > states['Annual_Cost_Infant'].median() else 'black'
-            
-            # Add a small background box behind the text
-            box_color = 'black' if text_color == 'white' else 'white'
-            bbox_props = dict(boxstyle="round,pad=0.3", fc=box_color, ec=box_color, alpha=0.5)
-            
-            # Add the annotation with the background box
-            ax.annotate(f"{row['STUSPS']}\n${cost_value:,.0f}", 
-                       xy=(centroid.x, centroid.y),
-                       ha='center', va='center',
-                       fontsize=8,
-                       color=text_color,
-                       fontweight='bold',
-                       bbox=bbox_props)
+    annotate_states(ax, states, 'Annual_Cost_Infant', "{abbr}\n${value:,.0f}")
     
     # Customize the map
     ax.set_title(f'Annual Infant Childcare Costs by State ({latest_year})', 
@@ -442,12 +853,14 @@ def create_choropleth_maps(df, states_gdf):
     ax.set_axis_off()
     
     # Add note about data
-    note = "Note: Data for IN and NM derived from neighboring states"
-    plt.figtext(0.99, 0.01, note, ha='right', fontsize=8, style='italic')
+    note = neighbor_note(cube, 'MCInfant', "Note: Data for {states} derived from neighboring states",
+                         where={'StudyYear': latest_year})
+    if note:
+        plt.figtext(0.99, 0.01, note, ha='right', fontsize=8, style='italic')
     
     # Save the map
     plt.tight_layout()
-    plt.savefig(img_dir / 'cost_map.png', dpi=300, bbox_inches='tight', facecolor='white')
+    save_chart('cost_map.png', facecolor='white')
     plt.close()
     print("Saved: cost_map.png")
     
@@ -482,27 +895,7 @@ def create_choropleth_maps(df, states_gdf):
     states_gdf.boundary.plot(ax=ax, color='black', linewidth=0.3, alpha=0.5)
     
     # Add state labels with text boxes for better visibility
-    for idx, row in states.iterrows():
-        # Skip Alaska and Hawaii for better focus on continental US
-        if row['STUSPS'] not in ['AK', 'HI'] and not pd.isna(row['Working_Parent_Ratio']):
-            centroid = row.geometry.centroid
-            ratio_value = row['Working_Parent_Ratio']
-            
-            # Calculate text color based on ratio value
-            text_color = 'white' if ratio_value > states['Working_Parent_Ratio'].median() else 'black'
-            
-            # Add a small background box behind the text
-            box_color = 'black' if text_color == 'white' else 'white'
-            bbox_props = dict(boxstyle="round,pad=0.3", fc=box_color, ec=box_color, alpha=0.5)
-            
-            # Add the annotation with the background box
-            ax.annotate(f"{row['STUSPS']}\n{ratio_value:.1f}%", 
-                       xy=(centroid.x, centroid.y),
-                       ha='center', va='center',
-                       fontsize=8,
-                       color=text_color,
-                       fontweight='bold',
-                       bbox=bbox_props)
+    annotate_states(ax, states, 'Working_Parent_Ratio', "{abbr}\n{value:.1f}%")
     
     # Customize the map
     ax.set_title(f'Working Parents with Young Children by State ({latest_year})', 
@@ -511,26 +904,19 @@ def create_choropleth_maps(df, states_gdf):
     
     # Save the map
     plt.tight_layout()
-    plt.savefig(img_dir / 'labor_force_map.png', dpi=300, bbox_inches='tight', facecolor='white')
+    save_chart('labor_force_map.png', facecolor='white')
     plt.close()
     print("Saved: labor_force_map.png")
 
-def create_correlation_analysis(df):
+def create_correlation_analysis(covariance):
     """Create a correlation heatmap for key metrics."""
     plt.figure(figsize=(12, 10), facecolor='#F0F0F8')
     
-    # Create correlation matrix with just the columns we need
-    corr_vars = [
-        'Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool',
-        'Cost_Burden', 'Working_Parent_Ratio', 'TotalPop', 'MHI_2018'
-    ]
-    
-    # Filter to the latest year data
-    latest_year = df['StudyYear'].max()
-    latest_data = df[df['StudyYear'] == latest_year]
+    # Latest year slice of the accumulated cross-products
+    latest_year = max(covariance.values('StudyYear'))
     
-    # Create the correlation matrix
-    corr_matrix = latest_data[corr_vars].corr()
+    # Create the correlation matrix with just the columns we need
+    corr_matrix = covariance.corr(CORR_MEASURES, where={'StudyYear': latest_year})
     
     # Generate a mask for the upper triangle
     mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
@@ -545,11 +931,11 @@ def create_correlation_analysis(df):
               fontsize=16, fontweight='bold', pad=20)
     
     plt.tight_layout()
-    plt.savefig(img_dir / 'correlation.png', dpi=300, bbox_inches='tight')
+    save_chart('correlation.png')
     plt.close()
     print("Saved: correlation.png")
 
-def create_spiral_plot(df):
+def create_spiral_plot(cube):
     """Create a spiral plot showing childcare costs over time for different care types."""
     plt.figure(figsize=(12, 12), facecolor='#F0F0F8')
     
@@ -558,15 +944,11 @@ def create_spiral_plot(df):
     ax.set_facecolor('#F0F0F8')
     
     # Data preparation
-    years = sorted(df['StudyYear'].unique())
+    years = cube.values('StudyYear')
     theta = np.linspace(0, 2*np.pi, len(years), endpoint=False)
     
     # Calculate average costs by year for different care types
-    yearly_means = df.groupby('StudyYear').agg({
-        'MCInfant': 'mean',
-        'MCToddler': 'mean',
-        'MCPreschool': 'mean'
-    }).reset_index()
+    yearly_means = cube.mean('StudyYear', ['MCInfant', 'MCToddler', 'MCPreschool']).reset_index()
     
     # Order by year
     yearly_means = yearly_means.sort_values('StudyYear')
@@ -635,17 +1017,17 @@ def create_spiral_plot(df):
     plt.legend(loc='upper right', fontsize=12)
     
     plt.tight_layout()
-    plt.savefig(img_dir / 'spiral_plot.png', dpi=300, bbox_inches='tight')
+    save_chart('spiral_plot.png')
     plt.close()
     print("Saved: spiral_plot.png")
 
-def create_state_costs_visualization(df):
+def create_state_costs_visualization(cube):
     """Create a horizontal bar chart showing average childcare costs by state with standard deviation."""
     # Create figure with specific size and layout
     fig, ax = plt.subplots(figsize=(16, 20))
     
     # Calculate mean and standard deviation for each state
-    state_stats = df.groupby('State_Abbreviation')['Annual_Cost_Infant'].agg(['mean', 'std']).reset_index()
+    state_stats = cube.describe('State_Abbreviation', 'Annual_Cost_Infant')[['mean', 'std']].reset_index()
     
     # Calculate standard deviation as percentage of mean
     state_stats['std_pct'] = (state_stats['std'] / state_stats['mean']) * 100
@@ -697,15 +1079,44 @@ def create_state_costs_visualization(df):
         ax.text(mean + 100, i, f'${mean:,.0f} (±{std_pct:.1f}%)',
                 va='center', fontsize=9)
     
-    # Add note about data sources for IN and NM
-    note = "Note: Data for IN and NM includes values derived from neighboring states"
-    plt.figtext(0.99, 0.01, note, ha='right', fontsize=8, style='italic')
+    # Add note about data sources for states imputed from their neighbors
+    note = neighbor_note(cube, 'MCInfant', "Note: Data for {states} includes values derived from neighboring states")
+    if note:
+        plt.figtext(0.99, 0.01, note, ha='right', fontsize=8, style='italic')
     
     # Adjust layout and save
     plt.tight_layout()
-    plt.savefig(img_dir / 'state_costs.png', dpi=300, bbox_inches='tight')
+    save_chart('state_costs.png')
     plt.close()
     print("Saved: state_costs.png")
 
 if __name__ == "__main__":
-    save_visualizations() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Generate the static childcare cost visualizations.')
+    parser.add_argument('--stream', action='store_true',
+                        help='stream the workbook in read-only chunks instead of using the columnar cache')
+    parser.add_argument('--float32', action='store_true',
+                        help='store price and ratio measures as float32 to halve their memory')
+    parser.add_argument('--incremental', action='store_true',
+                        help='re-process only the StudyYear partitions whose inputs changed')
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='aggregate streamed chunks without loading the county-level rows')
+    parser.add_argument('--quantile-eps', type=float, default=None, metavar='EPS',
+                        help='compute medians with a quantile sketch of this rank error instead of sorting')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render the charts in N worker processes')
+    parser.add_argument('--no-render-cache', action='store_true',
+                        help='redraw every chart even if its inputs, code and style are unchanged')
+    parser.add_argument('--publish-docs', action='store_true',
+                        help='copy changed images into docs/images')
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default='publication',
+                        help="render profile; 'draft' is fast and writes to output/images/draft")
+    parser.add_argument('--no-variants', action='store_true',
+                        help='skip the web-sized WebP/PNG variants of the publication charts')
+    args = parser.parse_args()
+    if args.publish_docs and args.profile != 'publication':
+        parser.error("--publish-docs needs the publication profile")
+
+    save_visualizations(stream=args.stream, float32=args.float32, incremental=args.incremental,
+                        out_of_core=args.out_of_core, quantile_eps=args.quantile_eps, jobs=args.jobs,
+                        use_cache=not args.no_render_cache, publish_docs=args.publish_docs,
+                        profile=args.profile, variants=not args.no_variants) 
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Shared data layer for the U.S. Childcare Cost Analysis Project.
+
+The milestone scripts, `convert_to_json.py` and the docs exporters all read
+the National Database of Childcare Prices (NDCP). This package holds the
+loading and preprocessing steps they have in common so each pipeline does
+not have to repeat them.
+"""
+
+from .cache import read_ndcp
+from .lookup import StateYearIndex
+from .paths import CACHE_DIR, DATA_DIR, REPO_ROOT, WORKBOOK_PATH
+from .schema import apply_schema
+
+__all__ = ['read_ndcp', 'apply_schema', 'StateYearIndex', 'CACHE_DIR', 'DATA_DIR', 'REPO_ROOT', 'WORKBOOK_PATH']
@@ -0,0 +1,172 @@
+"""
+State and county adjacency graphs derived from Census cartographic boundaries.
+
+The hand-written `STATE_NEIGHBORS` dict only covers IN and NM, so neighbor-based
+imputation falls through to the global mean for every other state. This module
+derives the full graph from a boundary shapefile (the bundled
+`cb_2018_us_state_20m.shp`, or a county file such as `cb_2018_us_county_20m.shp`):
+candidate pairs come from a spatial-index query and are kept when the two
+shapes share a stretch of border (rook contiguity, so the Four Corners states
+are not neighbors across the corner point).
+
+The graph is stored as a compressed sparse row (CSR) `.npz` file under
+`data/.cache/`, keyed by the content hash of the shapefile and its sidecar
+files (`.dbf` attributes included); graphs of earlier versions are removed. Loading it only needs
+NumPy and takes milliseconds; geopandas is imported only when the graph has
+to be rebuilt.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .cache import shapefile_digest
+from .paths import CACHE_DIR, STATE_SHAPEFILE
+
+# Column holding the node label in each kind of Census boundary file
+STATE_KEY = 'STUSPS'
+COUNTY_KEY = 'GEOID'
+
+# DE-9IM pattern: the two boundaries share a line segment, not just a point
+_SHARED_BORDER = '****1****'
+
+
+class AdjacencyGraph:
+    """
+    Undirected adjacency graph in compressed sparse row form.
+
+    Attributes:
+    -----------
+    labels : ndarray of str
+        Node labels (state abbreviations or county GEOIDs), sorted
+    indptr : ndarray of int32, shape (nodes + 1,)
+        Neighbors of node i are `indices[indptr[i]:indptr[i + 1]]`
+    indices : ndarray of int32
+        Concatenated neighbor positions, sorted within each node
+    """
+
+    def __init__(self, labels, indptr, indices):
+        self.labels = np.asarray(labels, dtype=str)
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self._pos = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_pairs(cls, labels, left, right):
+        """Build the graph from parallel arrays of neighboring node positions."""
+        n = len(labels)
+        # Store both directions, dedupe and sort by (node, neighbor)
+        edges = np.unique(np.concatenate([left * n + right, right * n + left]))
+        src, dst = np.divmod(edges, n)
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(labels, indptr, dst)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def neighbors(self, label):
+        """Return the labels adjacent to `label` (empty if it has none or is unknown)."""
+        i = self._pos.get(label)
+        if i is None:
+            return []
+        return self.labels[self.indices[self.indptr[i]:self.indptr[i + 1]]].tolist()
+
+    def to_dict(self):
+        """Return the graph in the `STATE_NEIGHBORS` format used by the imputation code."""
+        graph = {label: self.neighbors(label) for label in self.labels}
+        return {label: ns for label, ns in graph.items() if ns}
+
+    def save(self, path):
+        """Write the graph as a compressed `.npz` file (atomically)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp.npz')
+        np.savez_compressed(tmp_path, labels=self.labels, indptr=self.indptr, indices=self.indices)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['labels'], data['indptr'], data['indices'])
+
+
+def build_adjacency(gdf, key=STATE_KEY):
+    """
+    Derive the rook-contiguity graph of a GeoDataFrame.
+
+    Parameters:
+    -----------
+    gdf : GeoDataFrame
+        Polygons to connect, one row per state or county
+    key : str
+        Column holding the node labels
+
+    Returns:
+    --------
+    AdjacencyGraph
+        Graph over the sorted labels of `gdf`
+    """
+    import shapely
+
+    gdf = gdf.sort_values(key).reset_index(drop=True)
+    geoms = gdf.geometry.values
+
+    # Bounding-box candidates from the spatial index, then the exact border test
+    left, right = gdf.sindex.query(geoms, predicate='intersects')
+    keep = left < right
+    left, right = left[keep], right[keep]
+    shared = shapely.relate_pattern(np.asarray(geoms[left]), np.asarray(geoms[right]), _SHARED_BORDER)
+
+    return AdjacencyGraph.from_pairs(gdf[key].astype(str).to_numpy(), left[shared], right[shared])
+
+
+def adjacency_cache_path(shapefile, key, cache_dir=CACHE_DIR):
+    """Return the cache location of the graph for a shapefile and label column."""
+    shapefile = Path(shapefile)
+    return Path(cache_dir) / f"{shapefile.stem}-{key}-{shapefile_digest(shapefile)[:16]}-adjacency.npz"
+
+
+def _remove_stale(shapefile, key, keep, cache_dir):
+    """Delete graphs built from earlier versions of the same shapefile and label column."""
+    for old in Path(cache_dir).glob(f"{Path(shapefile).stem}-{key}-*-adjacency.npz"):
+        if old != keep:
+            old.unlink()
+
+
+def load_adjacency(shapefile=STATE_SHAPEFILE, key=STATE_KEY, cache_dir=CACHE_DIR, refresh=False):
+    """
+    Load the adjacency graph for a shapefile, building and caching it if needed.
+
+    Parameters:
+    -----------
+    shapefile : str or Path
+        Boundary shapefile; defaults to the bundled state file
+    key : str
+        Label column (`STATE_KEY` for states, `COUNTY_KEY` for counties)
+    cache_dir : str or Path
+        Directory holding the cached graphs
+    refresh : bool
+        Rebuild the graph even if a cached copy exists
+
+    Returns:
+    --------
+    AdjacencyGraph
+    """
+    cached = adjacency_cache_path(shapefile, key, cache_dir)
+    if cached.exists() and not refresh:
+        return AdjacencyGraph.load(cached)
+
+    import geopandas as gpd
+
+    print(f"Building adjacency graph for {Path(shapefile).name} (one-time)...")
+    graph = build_adjacency(gpd.read_file(shapefile), key)
+    graph.save(cached)
+    _remove_stale(shapefile, key, cached, cache_dir)
+    return graph
+
+
+def state_neighbors(shapefile=STATE_SHAPEFILE, cache_dir=CACHE_DIR):
+    """Return the state adjacency graph as a `{state: [neighbors]}` dict."""
+    return load_adjacency(shapefile, STATE_KEY, cache_dir).to_dict()
@@ -0,0 +1,196 @@
+"""
+Columnar on-disk cache for the National Database of Childcare Prices workbook.
+
+Parsing the XLSX file is the slowest step of every pipeline in this project.
+`read_ndcp` converts the workbook once into a Parquet file (or a pickle when
+pyarrow is not installed) stored under `data/.cache/`. The cache file name
+embeds the SHA-256 digest of the workbook contents, so replacing the workbook
+with a new vintage automatically triggers a rebuild on the next run.
+
+Passing `stream=True` skips the cache and reads the workbook through the
+bounded-memory streaming reader in `ndcp.ingest` instead.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .ingest import YEAR_COLUMN, stream_workbook, workbook_columns
+from .paths import CACHE_DIR, WORKBOOK_PATH
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+# File suffix of each cache format
+CACHE_SUFFIX = {'parquet': '.parquet', 'pickle': '.pkl'}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Parameters:
+    -----------
+    path : str or Path
+        File to hash
+    chunk_size : int
+        Number of bytes read per iteration
+
+    Returns:
+    --------
+    str
+        Hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Parts of a shapefile that change what is read from it: geometry, index,
+# attributes (names, keys), projection and encoding
+SHAPEFILE_PARTS = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
+
+
+def shapefile_digest(shapefile):
+    """
+    SHA-256 digest of a shapefile and the sidecar files next to it.
+
+    Hashing the `.shp` alone misses edits to the attribute table (`.dbf`),
+    such as renamed states or changed keys.
+    """
+    shapefile = Path(shapefile)
+    digest = hashlib.sha256()
+    for suffix in SHAPEFILE_PARTS:
+        part = shapefile.with_suffix(suffix)
+        if part.exists():
+            digest.update(f"{suffix}:{file_digest(part)}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def write_if_changed(path, text):
+    """Write `text` to `path` unless it already holds exactly that; returns True if written."""
+    path = Path(path)
+    data = text.encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def cache_path_for(source, digest, cache_dir=CACHE_DIR, fmt=CACHE_FORMAT):
+    """Return the cache file location for a source file with the given digest."""
+    return Path(cache_dir) / f"{Path(source).stem}-{digest[:16]}{CACHE_SUFFIX[fmt]}"
+
+
+def _normalize_object_columns(df):
+    """Cast object columns holding mixed Python types to strings so they serialize."""
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_cache(df, path, fmt=CACHE_FORMAT):
+    """Write a frame to a cache file atomically so an interrupted run never leaves a partial file."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    if fmt == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _select(df, columns=None, years=None):
+    """Apply column projection and an inclusive StudyYear range to a loaded frame."""
+    if years is not None:
+        df = df[df[YEAR_COLUMN].between(*years)]
+    if columns is not None:
+        df = df[columns]
+    return df.reset_index(drop=True) if years is not None else df.copy()
+
+
+def read_cache(path, fmt=CACHE_FORMAT, columns=None, years=None):
+    """Read a cache file written by `write_cache`, optionally projected to `columns` and a StudyYear range."""
+    if fmt == 'parquet':
+        filters = None
+        if years is not None:
+            filters = [(YEAR_COLUMN, '>=', years[0]), (YEAR_COLUMN, '<=', years[1])]
+        return pd.read_parquet(path, columns=columns, filters=filters)
+    return _select(pd.read_pickle(path), columns, years)
+
+
+def _remove_stale(source, keep, cache_dir):
+    """Delete caches built from earlier versions of the same source file."""
+    for old in Path(cache_dir).glob(f"{Path(source).stem}-*"):
+        if old != keep and old.suffix in CACHE_SUFFIX.values():
+            old.unlink()
+
+
+def source_columns(path=WORKBOOK_PATH, cache_dir=CACHE_DIR):
+    """Return the full column list of the workbook, from the cache schema when possible."""
+    cached = cache_path_for(path, file_digest(path), cache_dir)
+    if cached.exists() and CACHE_FORMAT == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(cached).names
+    return workbook_columns(path)
+
+
+def read_ndcp(path=WORKBOOK_PATH, columns=None, years=None, cache_dir=CACHE_DIR,
+              refresh=False, stream=False):
+    """
+    Load the NDCP workbook through the columnar cache.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Location of the source workbook
+    columns : list of str, optional
+        Columns to return; all columns are returned when omitted
+    years : tuple of (int, int), optional
+        Inclusive (first, last) StudyYear range to return
+    cache_dir : str or Path
+        Directory holding the cached copies
+    refresh : bool
+        Rebuild the cache even if an up-to-date copy exists
+    stream : bool
+        Bypass the cache and stream the workbook with column and year
+        pushdown, keeping peak memory proportional to the selected columns
+
+    Returns:
+    --------
+    DataFrame
+        The workbook contents, restricted to `columns` and `years` when given
+    """
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+
+    if stream:
+        print(f"Streaming {path.name} (read-only, column-projected)...")
+        return stream_workbook(path, columns=columns, years=years)
+
+    cache_dir = Path(cache_dir)
+    cached = cache_path_for(path, file_digest(path), cache_dir)
+
+    if cached.exists() and not refresh:
+        print(f"Using cached copy of {path.name}: {cached.name}")
+        return read_cache(cached, CACHE_FORMAT, columns, years)
+
+    print(f"Building columnar cache for {path.name} (one-time conversion)...")
+    df = _normalize_object_columns(pd.read_excel(path))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    write_cache(df, cached, CACHE_FORMAT)
+    _remove_stale(path, cached, cache_dir)
+
+    if columns is None and years is None:
+        return df
+    return _select(df, columns, years)
@@ -0,0 +1,214 @@
+"""
+Compact binary, column-oriented export of the county rows for the browser.
+
+Plain JSON spells out every number as text and has to be parsed value by
+value. `write_columnar` stores each column as one little-endian array of
+quantized integers instead, so the page can wrap the bytes in typed arrays
+without parsing (see `docs/js/ndcp-columnar.js`):
+
+* prices are stored in cents as uint32, incomes and counts as whole uint32;
+* ratios are fixed-point int16 (value x scale);
+* state and county keys are dictionary encoded: the column holds small
+  integer codes and the header lists the distinct values once;
+* a missing value is the largest code of an unsigned column or the smallest
+  of a signed one.
+
+File layout::
+
+    bytes 0-3    magic b'NDCP'
+    bytes 4-5    format version (uint16)
+    bytes 6-7    reserved
+    bytes 8-11   header length H (uint32)
+    bytes 12-    header: UTF-8 JSON, H bytes
+    ...          column data, each column starting on an 8-byte boundary
+
+The header lists the row count and, for every column, its name, dtype,
+byte offset, scale (stored value = round(value x scale)), missing code and,
+for keys, the dictionary. `columnar_json` writes the same columns as plain
+JSON for clients that cannot read the binary file.
+"""
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'NDCP'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sHHI')
+_ALIGN = 8
+
+# Column kinds: dictionary-encoded keys, or quantized numbers with a scale
+KEY = 'key'
+NUMBER = 'number'
+
+# Default export of the county rows: column -> (kind, dtype, scale)
+COUNTY_COLUMNS = {
+    'State_Abbreviation': (KEY, 'u1', None),
+    'County_FIPS_Code': (KEY, 'u2', None),
+    'StudyYear': (NUMBER, 'u2', 1),
+    'MCInfant': (NUMBER, 'u4', 100),
+    'MCToddler': (NUMBER, 'u4', 100),
+    'MCPreschool': (NUMBER, 'u4', 100),
+    'MHI_2018': (NUMBER, 'u4', 1),
+    'TotalPop': (NUMBER, 'u4', 1),
+    'H_Under6_BothWork': (NUMBER, 'u4', 1),
+    'FLFPR_20to64': (NUMBER, 'i2', 100),
+    'Cost_Burden': (NUMBER, 'i2', 10000),
+}
+
+
+def county_export_frame(df):
+    """County rows with the columns of `COUNTY_COLUMNS`, adding the infant `Cost_Burden` fraction."""
+    frame = df[[c for c in COUNTY_COLUMNS if c in df and c != 'Cost_Burden']].copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # A zero income gives an infinite burden, stored as missing
+        frame['Cost_Burden'] = df['MCInfant'].to_numpy(dtype=float) * 12 / df['MHI_2018'].to_numpy(dtype=float)
+    return frame
+
+
+def _missing_code(dtype):
+    info = np.iinfo(dtype)
+    return int(info.max) if info.min == 0 else int(info.min)
+
+
+def encode_column(values, kind, dtype, scale=None):
+    """
+    Encode one column as an integer array plus its header entry.
+
+    Raises ValueError when a value does not fit the dtype (after scaling),
+    rather than silently wrapping around. NaN and infinite values are
+    stored as the missing code.
+
+    Returns:
+    --------
+    tuple
+        (ndarray of `dtype`, dict of header fields)
+    """
+    dtype = np.dtype(dtype).newbyteorder('<')
+    missing = _missing_code(dtype)
+    if kind == KEY:
+        values = pd.Series(np.asarray(values, dtype=object))
+        present = values.notna().to_numpy()
+        dictionary = sorted(values[present].unique().tolist(), key=str)
+        codes = pd.Index(dictionary, dtype=object).get_indexer(values.to_numpy())
+        # Codes run from 0 and must stay below the missing code
+        if len(dictionary) > np.iinfo(dtype).max:
+            raise ValueError(f"{len(dictionary)} distinct keys do not fit {dtype.str}")
+        encoded = np.where(present, codes, missing).astype(dtype)
+        dictionary = [v.item() if isinstance(v, np.generic) else v for v in dictionary]
+        return encoded, {'kind': KEY, 'dictionary': dictionary, 'missing': missing}
+
+    scaled = np.asarray(values, dtype=float) * scale
+    # Infinite ratios (a zero denominator) are stored as missing, like NaN
+    present = np.isfinite(scaled)
+    rounded = np.round(np.where(present, scaled, 0))
+    info = np.iinfo(dtype)
+    # Reserve the missing code
+    low, high = (info.min, info.max - 1) if info.min == 0 else (info.min + 1, info.max)
+    if present.any() and (rounded[present].min() < low or rounded[present].max() > high):
+        raise ValueError(f"values out of range for {dtype.str} with scale {scale}")
+    encoded = np.where(present, rounded, missing).astype(dtype)
+    return encoded, {'kind': NUMBER, 'scale': scale, 'missing': missing}
+
+
+def write_columnar(frame, path, columns=COUNTY_COLUMNS):
+    """
+    Write the columns of `frame` named in `columns` as a binary columnar file.
+
+    Parameters:
+    -----------
+    frame : DataFrame
+        Rows to export
+    path : str or Path
+        Output file
+    columns : dict
+        Maps a column name to (kind, dtype, scale) as in `COUNTY_COLUMNS`;
+        columns missing from `frame` are skipped
+
+    Returns:
+    --------
+    dict
+        The header written to the file
+    """
+    encoded, entries = [], []
+    for name, (kind, dtype, scale) in columns.items():
+        if name not in frame:
+            continue
+        data, entry = encode_column(frame[name], kind, dtype, scale)
+        encoded.append(data)
+        entries.append(dict(name=name, dtype=data.dtype.str.lstrip('<>|='), **entry))
+
+    # Offsets depend on the header length; grow the guess until it is stable
+    header = {'version': FORMAT_VERSION, 'rows': len(frame), 'columns': entries}
+    header_bytes = b''
+    while True:
+        offset = -(-(_PREFIX.size + len(header_bytes)) // _ALIGN) * _ALIGN
+        for entry, data in zip(entries, encoded):
+            entry['offset'] = offset
+            offset = -(-(offset + data.nbytes) // _ALIGN) * _ALIGN
+        candidate = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        stable = len(candidate) == len(header_bytes)
+        header_bytes = candidate
+        if stable:
+            break
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        for entry, data in zip(entries, encoded):
+            f.write(b'\0' * (entry['offset'] - f.tell()))
+            f.write(data.tobytes())
+    return header
+
+
+def read_columnar(path):
+    """
+    Read a file written by `write_columnar` back into a DataFrame.
+
+    Keys are decoded through their dictionaries and numbers divided by their
+    scale; missing codes become NaN (or None for keys).
+    """
+    raw = Path(path).read_bytes()
+    magic, version, _, header_len = _PREFIX.unpack_from(raw)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not an NDCP columnar file (version {FORMAT_VERSION})")
+    header = json.loads(raw[_PREFIX.size:_PREFIX.size + header_len])
+
+    frame = {}
+    for entry in header['columns']:
+        if entry['offset'] < _PREFIX.size + header_len or entry['offset'] % _ALIGN:
+            raise ValueError(f"{path}: column {entry['name']} has an invalid offset {entry['offset']}")
+        data = np.frombuffer(raw, dtype=np.dtype(entry['dtype']).newbyteorder('<'),
+                             count=header['rows'], offset=entry['offset'])
+        missing = data == entry['missing']
+        if entry['kind'] == KEY:
+            dictionary = np.asarray(entry['dictionary'] + [None], dtype=object)
+            frame[entry['name']] = dictionary[np.where(missing, len(entry['dictionary']), data)]
+        else:
+            frame[entry['name']] = np.where(missing, np.nan, data / entry['scale'])
+    return pd.DataFrame(frame)
+
+
+def columnar_json(frame, columns=COUNTY_COLUMNS):
+    """
+    The same columns as plain JSON (the fallback format): one list per
+    column, rounded to the precision of its scale, with null for missing.
+    """
+    result = {'rows': len(frame), 'columns': {}}
+    for name, (kind, dtype, scale) in columns.items():
+        if name not in frame:
+            continue
+        if kind == KEY:
+            values = [None if pd.isna(v) else (v.item() if isinstance(v, np.generic) else v)
+                      for v in np.asarray(frame[name], dtype=object)]
+        else:
+            decimals = int(round(np.log10(scale)))
+            rounded = np.round(np.asarray(frame[name], dtype=float), decimals)
+            values = [None if not np.isfinite(v) else (int(v) if decimals == 0 else float(v)) for v in rounded]
+        result['columns'][name] = values
+    return json.dumps(result, separators=(',', ':'))
@@ -0,0 +1,167 @@
+"""
+Incremental covariance and correlation of the numeric measures.
+
+Every heatmap used to call `.corr()` on its own column subset, rescanning
+the rows each time. `CovarianceAccumulator` keeps the cross-product sums of
+all measures in one pass, per cell of the requested dimensions (for example
+state x year), and any correlation submatrix for any slice of cells is then
+a few array operations.
+
+For each pair of measures (i, j) it keeps, over the rows where both are
+present: the row count, the sum of i, the sum of i squared and the sum of
+i * j. That reproduces the pairwise-complete semantics of
+`DataFrame.corr()`. Values are shifted by a per-measure reference (the
+first chunk's means) before they are accumulated so that large-magnitude
+columns such as TotalPop do not lose precision to cancellation. Chunks are
+folded in one at a time and accumulators merge, so the pass can be streamed.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Index of each running sum in a cell's (4, p, p) array
+_N, _SX, _SXX, _SXY = range(4)
+
+
+def _plain(key):
+    key = key if isinstance(key, tuple) else (key,)
+    return tuple(k.item() if isinstance(k, np.generic) else k for k in key)
+
+
+class CovarianceAccumulator:
+    """
+    Pairwise-complete cross-product sums of a set of measures, per cell.
+
+    Attributes:
+    -----------
+    measures : list of str
+        Accumulated columns
+    dims : list of str
+        Cell dimensions; empty for a single cell over all rows
+    shift : ndarray or None
+        Per-measure reference subtracted before accumulating
+    cells : dict
+        Maps a tuple of dimension values to a (4, p, p) array of running sums
+    """
+
+    def __init__(self, measures, dims=(), shift=None):
+        self.measures = list(measures)
+        self.dims = list(dims)
+        self.shift = None if shift is None else np.asarray(shift, dtype=float)
+        self.cells = {}
+        self._pos = {m: i for i, m in enumerate(self.measures)}
+
+    @classmethod
+    def from_frame(cls, df, measures, dims=()):
+        """Accumulate a whole frame in one pass."""
+        return cls(measures, dims).update(df)
+
+    def update(self, chunk):
+        """Fold one chunk of rows into the running sums."""
+        values = chunk[self.measures].to_numpy(dtype=float)
+        if self.shift is None:
+            with np.errstate(invalid='ignore'):
+                counts = (~np.isnan(values)).sum(axis=0)
+                self.shift = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+
+        present = ~np.isnan(values)
+        centered = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(float)
+
+        if self.dims:
+            groups = chunk.groupby(self.dims, observed=True, sort=False).indices
+        else:
+            groups = {(): np.arange(len(chunk))}
+
+        p = len(self.measures)
+        for key, rows in groups.items():
+            m, y = mask[rows], centered[rows]
+            sums = np.empty((4, p, p))
+            sums[_N] = m.T @ m
+            sums[_SX] = y.T @ m
+            sums[_SXX] = (y * y).T @ m
+            sums[_SXY] = y.T @ y
+            key = _plain(key)
+            if key in self.cells:
+                self.cells[key] += sums
+            else:
+                self.cells[key] = sums
+        return self
+
+    def _reshift(self, sums, old, new):
+        """Re-express running sums taken around `old` as sums around `new`."""
+        d = (old - new)
+        n, sx, sxx, sxy = sums[_N], sums[_SX], sums[_SXX], sums[_SXY]
+        out = np.empty_like(sums)
+        out[_N] = n
+        out[_SX] = sx + n * d[:, None]
+        out[_SXX] = sxx + 2 * d[:, None] * sx + n * d[:, None] ** 2
+        out[_SXY] = sxy + d[None, :] * sx + d[:, None] * sx.T + n * np.outer(d, d)
+        return out
+
+    def merge(self, other):
+        """Fold another accumulator over the same measures and dimensions into this one."""
+        if self.shift is None:
+            self.shift = other.shift
+        for key, sums in other.cells.items():
+            if other.shift is not None and not np.array_equal(other.shift, self.shift):
+                sums = self._reshift(sums, other.shift, self.shift)
+            if key in self.cells:
+                self.cells[key] = self.cells[key] + sums
+            else:
+                self.cells[key] = sums.copy()
+        return self
+
+    def values(self, dim):
+        """Sorted distinct values of a dimension present in the accumulator."""
+        i = self.dims.index(dim)
+        return sorted({key[i] for key in self.cells})
+
+    def _total(self, where):
+        where = where or {}
+        allowed = {self.dims.index(dim): set(v) if isinstance(v, (list, tuple, set)) else {v}
+                   for dim, v in where.items()}
+        p = len(self.measures)
+        total = np.zeros((4, p, p))
+        for key, sums in self.cells.items():
+            if all(key[i] in values for i, values in allowed.items()):
+                total += sums
+        return total
+
+    def _select(self, matrix, columns):
+        columns = self.measures if columns is None else list(columns)
+        idx = [self._pos[c] for c in columns]
+        return pd.DataFrame(matrix[np.ix_(idx, idx)], index=columns, columns=columns)
+
+    def _centered(self, where):
+        total = self._total(where)
+        n, sx, sxx, sxy = total[_N], total[_SX], total[_SXX], total[_SXY]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            safe_n = np.where(n > 0, n, np.nan)
+            cross = sxy - sx * sx.T / safe_n
+            var_i = sxx - sx ** 2 / safe_n
+        return n, cross, var_i
+
+    def cov(self, columns=None, where=None):
+        """
+        Pairwise-complete sample covariance (ddof=1), like `DataFrame.cov`.
+
+        Parameters:
+        -----------
+        columns : list of str, optional
+            Measures to include; all by default
+        where : dict, optional
+            Maps a dimension to a value (or list of values) that cells must match
+        """
+        n, cross, _ = self._centered(where)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = cross / np.where(n > 1, n - 1, np.nan)
+        return self._select(matrix, columns)
+
+    def corr(self, columns=None, where=None):
+        """Pairwise-complete Pearson correlation, like `DataFrame.corr`; see `cov`."""
+        n, cross, var_i = self._centered(where)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denom = np.sqrt(var_i * var_i.T)
+            matrix = np.where(denom > 0, cross / denom, np.nan)
+        return self._select(np.clip(matrix, -1.0, 1.0), columns)
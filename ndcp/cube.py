@@ -0,0 +1,154 @@
+"""
+Shared aggregate cube over the processed NDCP frame.
+
+The chart functions used to run their own groupbys over the county-level
+frame (by state, by year, by urban/rural, ...). `AggregateCube` computes
+count, sum, sum of squares, min and max of every measure once, at the finest
+grain of the requested dimensions (for example state x year x area type x
+income bracket; the care types are the measures themselves). Any coarser view
+is a roll-up of those cells, so means and standard deviations for a chart
+come from slicing the cube instead of rescanning the rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Accumulators kept per cell and how each one rolls up
+STATS = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+
+# Dimensions used when they are present in the frame
+DEFAULT_DIMS = ['State_Abbreviation', 'StudyYear', 'Urban_Rural', 'Income_Bracket']
+
+
+class AggregateCube:
+    """
+    Mergeable per-cell accumulators for a set of measures.
+
+    Attributes:
+    -----------
+    dims : list of str
+        Dimensions of the finest-grain cells
+    measures : list of str
+        Aggregated columns
+    cells : DataFrame
+        Indexed by `dims`; columns are (measure, stat) pairs for the stats in
+        `STATS`
+    """
+
+    def __init__(self, cells, dims, measures):
+        self.cells = cells
+        self.dims = list(dims)
+        self.measures = list(measures)
+
+    @classmethod
+    def from_frame(cls, df, measures, dims=None):
+        """
+        Build the cube in one grouped pass over `df`.
+
+        Parameters:
+        -----------
+        df : DataFrame
+            Processed county-level data
+        measures : list of str
+            Numeric columns to aggregate
+        dims : list of str, optional
+            Cell dimensions; defaults to those of `DEFAULT_DIMS` present in `df`
+        """
+        dims = [d for d in DEFAULT_DIMS if d in df.columns] if dims is None else list(dims)
+        measures = list(measures)
+
+        values = df[measures].astype('float64')
+        squares = values.pow(2).rename(columns=lambda c: c + '__sq')
+        work = pd.concat([df[dims], values, squares], axis=1)
+        grouped = work.groupby(dims, observed=True, sort=True)
+
+        sums = grouped[list(squares.columns)].sum()
+        sums.columns = measures
+        cells = pd.concat({
+            'count': grouped[measures].count().astype('float64'),
+            'sum': grouped[measures].sum(),
+            'sumsq': sums,
+            'min': grouped[measures].min(),
+            'max': grouped[measures].max(),
+        }, axis=1).swaplevel(axis=1).sort_index(axis=1)
+        return cls(cells, dims, measures)
+
+    def _select(self, where):
+        if not where:
+            return self.cells
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in where.items():
+            allowed = value if isinstance(value, (list, tuple, set, np.ndarray)) else [value]
+            mask &= self.cells.index.get_level_values(dim).isin(list(allowed))
+        return self.cells[mask]
+
+    def rollup(self, by=(), where=None, measures=None):
+        """
+        Combine cells into coarser groups.
+
+        Parameters:
+        -----------
+        by : str or list of str
+            Dimensions to keep; an empty value rolls everything into one row
+        where : dict, optional
+            Maps a dimension to a value (or list of values) that cells must match
+        measures : list of str, optional
+            Measures to return; all by default
+
+        Returns:
+        --------
+        DataFrame
+            Raw accumulators with (measure, stat) columns
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cells = self._select(where)
+        if measures is not None:
+            cells = cells[list(measures)]
+
+        if by:
+            grouped = cells.groupby(level=by, observed=True, sort=True)
+        else:
+            grouped = cells.groupby(np.zeros(len(cells), dtype=int))
+        how = {col: STATS[col[1]] for col in cells.columns}
+        return grouped.agg(how)
+
+    def describe(self, by=(), measure=None, where=None):
+        """
+        Count, mean, standard deviation, min and max of one measure per group.
+
+        The standard deviation uses ddof=1 like `Series.std`; groups with fewer
+        than two values get NaN.
+        """
+        acc = self.rollup(by, where, [measure])[measure]
+        n = acc['count']
+        mean = acc['sum'] / n.where(n > 0)
+        var = (acc['sumsq'] - acc['sum'] * mean) / (n - 1).where(n > 1)
+        return pd.DataFrame({
+            'count': n.astype('int64'),
+            'mean': mean,
+            'std': np.sqrt(var.clip(lower=0)),
+            'min': acc['min'],
+            'max': acc['max'],
+        })
+
+    def mean(self, by=(), measures=None, where=None):
+        """Mean of each measure per group, as a DataFrame with one column per measure."""
+        measures = self.measures if measures is None else list(measures)
+        acc = self.rollup(by, where, measures)
+        sums = acc.xs('sum', axis=1, level=1)[measures]
+        counts = acc.xs('count', axis=1, level=1)[measures]
+        return sums / counts.where(counts > 0)
+
+    def total(self, by=(), measures=None, where=None):
+        """Sum of each measure per group (missing values count as zero, like `sum`)."""
+        measures = self.measures if measures is None else list(measures)
+        return self.rollup(by, where, measures).xs('sum', axis=1, level=1)[measures]
+
+    def std(self, by=(), measures=None, where=None):
+        """Sample standard deviation (ddof=1) of each measure per group."""
+        measures = self.measures if measures is None else list(measures)
+        return pd.DataFrame({m: self.describe(by, m, where)['std'] for m in measures})
+
+    def values(self, dim):
+        """Sorted distinct values of a dimension present in the cube."""
+        return sorted(set(self.cells.index.get_level_values(dim)))
@@ -0,0 +1,154 @@
+"""
+Sharded data files for the GitHub Pages dashboard (`docs/new-dashboard.html`).
+
+The dashboard script used to carry every year's metrics in one embedded
+literal and parse all of it on load. `write_dashboard_data` generates the
+data from the processed frame instead, as a set of small JSON files under
+`docs/data/dashboard/`:
+
+* `index.json`: the state list, the years, the metric names, the shard
+  file of every year (and state), and the national average of each metric
+  per year, which is all the time series chart needs;
+* `year-<StudyYear>.json`: one array per metric, aligned with the index's
+  state list (`null` where a state has no data), plus the states whose
+  prices were imputed;
+* `state-<abbr>.json` (optional): one array per metric over the years.
+
+The page fetches the index, then only the shard of the year being shown;
+other years are fetched when they are selected. Ratios are stored as
+fractions, values are rounded per metric, and files whose content did not
+change are left untouched.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import write_if_changed
+from .impute import source_column
+from .lookup import STATE_COLUMN, YEAR_COLUMN
+from .paths import REPO_ROOT
+
+DASHBOARD_DATA_DIR = REPO_ROOT / 'docs' / 'data' / 'dashboard'
+INDEX_NAME = 'index.json'
+
+# Exported metrics and the decimal places kept for each
+METRIC_DECIMALS = {
+    'annual_cost': 2,
+    'median_income': 0,
+    'cost_burden': 4,
+    'working_parent_ratio': 4,
+}
+METRICS = list(METRIC_DECIMALS)
+
+
+def state_year_metrics(df, state_col=STATE_COLUMN, year_col=YEAR_COLUMN):
+    """
+    Dashboard metrics for every (year, state) of a processed frame.
+
+    `annual_cost` is the mean of `MCInfant * 12` and `median_income` the
+    mean of `MHI_2018`; `cost_burden` is their ratio, as a fraction.
+    `working_parent_ratio` keeps the meaning the dashboard gives it (its
+    labor force map and the 0.5-0.8 range of its former placeholder data):
+    the mean female labor force participation rate (`FLFPR_20to64`), as a
+    fraction.
+    `imputed` marks groups where any `MCInfant` value was filled in, when
+    the frame carries the provenance column from `impute_missing`.
+
+    Returns:
+    --------
+    DataFrame
+        Indexed by (year, state), with the columns in `METRICS` plus `imputed`
+    """
+    rows = pd.DataFrame({
+        year_col: np.asarray(df[year_col]),
+        state_col: np.asarray(df[state_col], dtype=object),
+        'annual_cost': df['MCInfant'].to_numpy(dtype=float) * 12,
+        'median_income': df['MHI_2018'].to_numpy(dtype=float),
+        'participation': df['FLFPR_20to64'].to_numpy(dtype=float) / 100,
+    })
+    flags = source_column('MCInfant')
+    rows['imputed'] = df[flags].to_numpy() != 0 if flags in df else False
+
+    grouped = rows.groupby([year_col, state_col], sort=True)
+    metrics = grouped.agg(annual_cost=('annual_cost', 'mean'),
+                          median_income=('median_income', 'mean'),
+                          working_parent_ratio=('participation', 'mean'),
+                          imputed=('imputed', 'any'))
+    metrics['cost_burden'] = metrics['annual_cost'] / metrics['median_income']
+    return metrics[METRICS + ['imputed']]
+
+
+def _values(values, decimals):
+    """Rounded list for JSON, with None (null) for missing values."""
+    values = np.round(np.asarray(values, dtype=float), decimals)
+    out = [None if np.isnan(v) else float(v) for v in values]
+    return [int(v) if v is not None and decimals == 0 else v for v in out]
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':'), allow_nan=False)
+
+
+def write_dashboard_data(metrics, out_dir=DASHBOARD_DATA_DIR, by_state=False):
+    """
+    Write the dashboard index and one shard per year (and per state).
+
+    Parameters:
+    -----------
+    metrics : DataFrame
+        Output of `state_year_metrics`
+    out_dir : str or Path
+        Directory of the generated files
+    by_state : bool
+        Also write one shard per state with its metrics over the years
+
+    Returns:
+    --------
+    list of Path
+        The files that were (re)written; shards no longer referenced by the
+        index are removed
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    years = sorted(metrics.index.get_level_values(0).unique().tolist())
+    states = sorted(metrics.index.get_level_values(1).unique().tolist())
+    grid = pd.MultiIndex.from_product([years, states])
+    # Dense year x state x metric table; every shard is one slice of it
+    dense = metrics[METRICS].reindex(grid).to_numpy(dtype=float).reshape(len(years), len(states), len(METRICS))
+    imputed = metrics['imputed'].reindex(grid, fill_value=False).to_numpy(dtype=bool).reshape(len(years), len(states))
+
+    files = {}
+    for y, year in enumerate(years):
+        shard = {'year': int(year), 'imputed': [s for s, flag in zip(states, imputed[y]) if flag]}
+        for m, name in enumerate(METRICS):
+            shard[name] = _values(dense[y, :, m], METRIC_DECIMALS[name])
+        files[f"year-{year}.json"] = shard
+    if by_state:
+        for s, state in enumerate(states):
+            shard = {'state': state, 'years': [int(y) for y in years]}
+            for m, name in enumerate(METRICS):
+                shard[name] = _values(dense[:, s, m], METRIC_DECIMALS[name])
+            files[f"state-{state}.json"] = shard
+
+    # Mean over the states with data, as the page used to average each year
+    counts = (~np.isnan(dense)).sum(axis=1)
+    national = np.where(counts > 0, np.nansum(dense, axis=1) / np.maximum(counts, 1), np.nan)
+    index = {
+        'states': states,
+        'years': [int(y) for y in years],
+        'metrics': METRICS,
+        'shards': {str(year): f"year-{year}.json" for year in years},
+        'national': {name: _values(national[:, m], METRIC_DECIMALS[name]) for m, name in enumerate(METRICS)},
+    }
+    if by_state:
+        index['state_shards'] = {state: f"state-{state}.json" for state in states}
+    files[INDEX_NAME] = index
+
+    written = [out_dir / name for name, obj in files.items() if write_if_changed(out_dir / name, _dumps(obj))]
+    for stale in list(out_dir.glob('year-*.json')) + list(out_dir.glob('state-*.json')):
+        if stale.name not in files:
+            stale.unlink()
+    return written
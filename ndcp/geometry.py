@@ -0,0 +1,222 @@
+"""
+Cached geometry helpers for the choropleth maps.
+
+`load_shapes` replaces `gpd.read_file` on the bundled shapefile. The first
+call reads the shapefile once and stores it under `data/.cache/` as GeoParquet
+(a pickle without pyarrow) at every level of detail in `LODS`. The coarser
+levels are simplified as a coverage, so neighboring states still share
+identical borders. A map rendered at a few thousand pixels does not need
+vertices closer together than a pixel: `lod_for` picks the coarsest level
+whose tolerance stays below the pixel size of the output.
+
+The maps used to label each state at `row.geometry.centroid`, recomputed for
+every row of every map. A centroid taken in longitude/latitude can also fall
+outside concave shapes (Florida, Michigan, ...). `label_points` computes a
+representative point for every shape once, in an equal-area projection, and
+caches the table under `data/.cache/` keyed by the shapefile's content hash.
+The points are returned in the shapefile's own CRS, ready to be plotted.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .adjacency import STATE_KEY
+from .cache import CACHE_FORMAT, CACHE_SUFFIX, read_cache, shapefile_digest, write_cache
+from .paths import CACHE_DIR, STATE_SHAPEFILE
+
+# CONUS Albers equal-area projection used to place the label points
+LABEL_CRS = 'EPSG:5070'
+
+# Levels of detail: simplification tolerance in the shapefile's units
+# (degrees for the Census NAD83 files), finest first
+LODS = {
+    'full': 0.0,
+    'high': 0.005,
+    'medium': 0.02,
+    'low': 0.08,
+}
+
+# Longitude span of the continental U.S. maps
+CONUS_WIDTH_DEGREES = 59.0
+
+
+def shapes_path(shapefile, lod, cache_dir=CACHE_DIR):
+    """Return the cache location of one level of detail of a shapefile."""
+    shapefile = Path(shapefile)
+    suffix = CACHE_SUFFIX[CACHE_FORMAT]
+    return Path(cache_dir) / f"{shapefile.stem}-{shapefile_digest(shapefile)[:16]}-{lod}{suffix}"
+
+
+def _write_shapes(gdf, path):
+    tmp_path = path.with_name(path.name + '.tmp')
+    if CACHE_FORMAT == 'parquet':
+        gdf.to_parquet(tmp_path, index=False)
+    else:
+        gdf.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_shapes(path):
+    import geopandas as gpd
+
+    if CACHE_FORMAT == 'parquet':
+        return gpd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def simplify_coverage(geometry, tolerance):
+    """
+    Simplify a GeoSeries of polygons as a coverage, keeping shared borders identical.
+
+    Uses `GeoSeries.simplify_coverage` (geopandas >= 1.1) or
+    `shapely.coverage_simplify` (shapely >= 2.1). With older versions each
+    shape is simplified on its own, which can leave small gaps and overlaps
+    between neighbors at the coarser levels.
+    """
+    import geopandas as gpd
+    import shapely
+
+    if hasattr(geometry, 'simplify_coverage'):
+        return geometry.simplify_coverage(tolerance)
+    if hasattr(shapely, 'coverage_simplify'):
+        return gpd.GeoSeries(shapely.coverage_simplify(np.asarray(geometry.values), tolerance),
+                             index=geometry.index, crs=geometry.crs)
+    print(f"shapely {shapely.__version__} has no coverage simplification; "
+          "simplifying each shape on its own (neighboring borders may not match)")
+    return geometry.simplify(tolerance, preserve_topology=True)
+
+
+def build_shapes(shapefile=STATE_SHAPEFILE, cache_dir=CACHE_DIR):
+    """
+    Read a shapefile once and cache it at every level of detail in `LODS`.
+
+    Returns:
+    --------
+    dict
+        Maps each LOD name to its GeoDataFrame
+    """
+    import geopandas as gpd
+
+    print(f"Building geometry cache for {Path(shapefile).name} (one-time)...")
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    gdf = gpd.read_file(shapefile)
+    shapes = {}
+    for lod, tolerance in LODS.items():
+        level = gdf.copy()
+        if tolerance:
+            # Simplify shared edges once so the simplified states still tile
+            level['geometry'] = simplify_coverage(gdf.geometry, tolerance)
+        _write_shapes(level, shapes_path(shapefile, lod, cache_dir))
+        shapes[lod] = level
+    return shapes
+
+
+def load_shapes(shapefile=STATE_SHAPEFILE, lod='full', cache_dir=CACHE_DIR, refresh=False):
+    """
+    Load a shapefile at a level of detail from the geometry cache.
+
+    Parameters:
+    -----------
+    shapefile : str or Path
+        Boundary shapefile; defaults to the bundled state file
+    lod : str
+        One of `LODS`; 'full' is the shapefile as published
+    cache_dir : str or Path
+        Directory holding the cached geometries
+    refresh : bool
+        Rebuild every level even if cached copies exist
+
+    Returns:
+    --------
+    GeoDataFrame
+    """
+    if lod not in LODS:
+        raise ValueError(f"Unknown level of detail {lod!r}; expected one of {list(LODS)}")
+    cached = shapes_path(shapefile, lod, cache_dir)
+    if cached.exists() and not refresh:
+        return _read_shapes(cached)
+    return build_shapes(shapefile, cache_dir)[lod]
+
+
+def lod_for(width_px, span=CONUS_WIDTH_DEGREES):
+    """
+    Coarsest level of detail whose tolerance is below one output pixel.
+
+    Parameters:
+    -----------
+    width_px : float
+        Width of the map in the output image, in pixels (inches x dpi)
+    span : float
+        Width of the mapped area in the shapefile's units
+    """
+    pixel = span / width_px
+    return max((lod for lod, tolerance in LODS.items() if tolerance < pixel), key=LODS.get)
+
+
+def label_points_path(shapefile, key, cache_dir=CACHE_DIR):
+    """Return the cache location of the label-point table for a shapefile and key column."""
+    shapefile = Path(shapefile)
+    suffix = CACHE_SUFFIX[CACHE_FORMAT]
+    return Path(cache_dir) / f"{shapefile.stem}-{key}-{shapefile_digest(shapefile)[:16]}-labels{suffix}"
+
+
+def label_points(shapefile=STATE_SHAPEFILE, key=STATE_KEY, cache_dir=CACHE_DIR, refresh=False):
+    """
+    Representative label point of every shape, computed once per shapefile.
+
+    Parameters:
+    -----------
+    shapefile : str or Path
+        Boundary shapefile; defaults to the bundled state file
+    key : str
+        Column identifying each shape (`STUSPS` for states, `GEOID` for counties)
+    cache_dir : str or Path
+        Directory holding the cached tables
+    refresh : bool
+        Recompute the points even if a cached table exists
+
+    Returns:
+    --------
+    DataFrame
+        Indexed by `key`, with `label_x` and `label_y` in the shapefile's CRS
+    """
+    cached = label_points_path(shapefile, key, cache_dir)
+    if cached.exists() and not refresh:
+        return read_cache(cached, CACHE_FORMAT).set_index(key)
+
+    import geopandas as gpd
+
+    gdf = load_shapes(shapefile, 'full', cache_dir)
+    # Label the largest part of multi-part shapes (Michigan's lower peninsula,
+    # not the upper one; the mainland rather than an island)
+    parts = gdf[[key, 'geometry']].to_crs(LABEL_CRS).explode(index_parts=False)
+    parts = parts.assign(_area=parts.area).sort_values('_area', ascending=False)
+    largest = parts.drop_duplicates(key).set_index(key).reindex(gdf[key])
+    points = gpd.GeoSeries(largest.geometry.values, crs=LABEL_CRS).representative_point().to_crs(gdf.crs)
+    table = pd.DataFrame({
+        key: gdf[key].astype(str).to_numpy(),
+        'label_x': points.x.to_numpy(),
+        'label_y': points.y.to_numpy(),
+    })
+    write_cache(table, cached, CACHE_FORMAT)
+    return table.set_index(key)
+
+
+def contrast_colors(values, threshold):
+    """
+    Text and box colors for value labels on a sequential color map.
+
+    Values above `threshold` sit on dark fills and get white text on a black
+    box; the rest get black text on a white box. Computed for all labels at
+    once.
+
+    Returns:
+    --------
+    tuple of ndarray
+        (text colors, box colors)
+    """
+    dark = np.asarray(values, dtype=float) > threshold
+    return np.where(dark, 'white', 'black'), np.where(dark, 'black', 'white')
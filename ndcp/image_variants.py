@@ -0,0 +1,124 @@
+"""
+Responsive web variants of the rendered charts.
+
+The publication charts are 300 dpi PNGs several thousand pixels wide, while
+the case-study pages show them a few hundred pixels wide. `write_variants`
+resamples each chart to the widths in `VARIANT_WIDTHS` and writes every
+width twice: as WebP, and as a palette-quantized PNG for browsers without
+WebP. `variants.json` next to them maps each chart to its source size and
+variants, from which `srcset` builds the attribute for an `<img>` or
+`<picture>` element (`ndcp.site_build` does this for every `<img>` of the
+docs pages whose chart has current variants in `images/variants/`):
+
+    <picture>
+      <source type="image/webp" srcset="variants/cost_map-480w.webp 480w, ...">
+      <img src="cost_map.png" srcset="variants/cost_map-480w.png 480w, ..."
+           sizes="(max-width: 960px) 100vw, 960px" width="4500" height="3000">
+    </picture>
+
+The manifest records the digest of every source, so a chart served from the
+render cache unchanged is not encoded again.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from .cache import file_digest
+
+# Output widths in pixels; widths at or above the source width are skipped
+VARIANT_WIDTHS = [480, 960, 1600]
+# Variants live in this subdirectory next to the charts
+VARIANTS_SUBDIR = 'variants'
+VARIANTS_MANIFEST = 'variants.json'
+
+WEBP_QUALITY = 80
+PNG_COLORS = 256
+
+
+def variant_name(source, width, fmt):
+    """`cost_map.png`, 480, 'webp' -> `cost_map-480w.webp`"""
+    return f"{Path(source).stem}-{width}w.{fmt}"
+
+
+def _encode(image, width, out_dir, source):
+    """Write the WebP and quantized PNG of one width; returns their manifest entry."""
+    from PIL import Image
+
+    height = round(image.height * width / image.width)
+    resized = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    webp, png = variant_name(source, width, 'webp'), variant_name(source, width, 'png')
+    resized.save(out_dir / webp, 'WEBP', quality=WEBP_QUALITY, method=6)
+    # Charts are flat colors plus anti-aliasing; a 256-color palette holds them
+    resized.quantize(colors=PNG_COLORS, method=Image.Quantize.FASTOCTREE).save(out_dir / png, optimize=True)
+    return {'width': width, 'height': height, 'webp': webp, 'png': png}
+
+
+def write_variants(sources, out_dir, widths=VARIANT_WIDTHS):
+    """
+    Write the web variants of chart images and update their manifest.
+
+    Parameters:
+    -----------
+    sources : list of str or Path
+        Full-resolution chart PNGs
+    out_dir : str or Path
+        Directory of the variants and `variants.json`
+    widths : list of int
+        Target widths in pixels
+
+    Returns:
+    --------
+    list of Path
+        The variant files and manifest that were (re)written
+    """
+    from PIL import Image
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / VARIANTS_MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    written = []
+    for source in map(Path, sources):
+        if not source.exists():
+            continue
+        digest = file_digest(source)
+        entry = manifest.get(source.name)
+        if (entry is not None and entry['digest'] == digest
+                and all((out_dir / v[fmt]).exists() for v in entry['variants'] for fmt in ('webp', 'png'))):
+            continue
+        with Image.open(source) as image:
+            image = image.convert('RGBA')
+            targets = [w for w in widths if w < image.width] or [image.width]
+            variants = [_encode(image, width, out_dir, source) for width in targets]
+            manifest[source.name] = {'digest': digest, 'width': image.width, 'height': image.height,
+                                     'variants': variants}
+        written += [out_dir / v[fmt] for v in variants for fmt in ('webp', 'png')]
+
+    if written:
+        tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, manifest_path)
+        written.append(manifest_path)
+    return written
+
+
+def variant_files(sources, out_dir):
+    """
+    The variant files of `sources` listed in the manifest of `out_dir`,
+    followed by the manifest itself; empty if there is no manifest.
+    """
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / VARIANTS_MANIFEST
+    if not manifest_path.exists():
+        return []
+    manifest = json.loads(manifest_path.read_text())
+    files = [out_dir / v[fmt] for source in map(Path, sources) if source.name in manifest
+             for v in manifest[source.name]['variants'] for fmt in ('webp', 'png')]
+    return files + [manifest_path]
+
+
+def srcset(entry, fmt='webp', prefix=f'{VARIANTS_SUBDIR}/'):
+    """`srcset` attribute value for one chart's manifest entry, in `fmt` ('webp' or 'png')."""
+    return ', '.join(f"{prefix}{v[fmt]} {v['width']}w" for v in entry['variants'])
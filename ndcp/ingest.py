@@ -0,0 +1,122 @@
+"""
+Streaming, column-projected ingestion of the NDCP workbook.
+
+`pd.read_excel` materializes every cell of the sheet before any column can be
+dropped, so peak memory follows the full 200+-column width of the NDCP. The
+functions here open the workbook in openpyxl's read-only mode, keep only the
+requested columns and StudyYear range while the rows are being parsed, and
+build the frame chunk by chunk. Peak memory therefore scales with the selected
+columns rather than with the sheet.
+"""
+
+from operator import itemgetter
+
+import pandas as pd
+
+from .paths import WORKBOOK_PATH
+
+# Number of worksheet rows converted to a DataFrame at a time
+CHUNK_SIZE = 50_000
+
+YEAR_COLUMN = 'StudyYear'
+
+
+def _open_sheet(path, sheet_name=None):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    ws = wb[sheet_name] if sheet_name is not None else wb.worksheets[0]
+    return wb, ws
+
+
+def _header(rows):
+    return [str(h) if h is not None else f'Unnamed: {i}' for i, h in enumerate(next(rows, ()))]
+
+
+def workbook_columns(path=WORKBOOK_PATH, sheet_name=None):
+    """Return the header row of the workbook without reading any data rows."""
+    wb, ws = _open_sheet(path, sheet_name)
+    try:
+        return _header(ws.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def iter_workbook_chunks(path=WORKBOOK_PATH, columns=None, years=None,
+                         chunk_size=CHUNK_SIZE, sheet_name=None):
+    """
+    Stream the workbook as a sequence of column-projected DataFrame chunks.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Location of the source workbook
+    columns : list of str, optional
+        Columns to keep; all columns are kept when omitted
+    years : tuple of (int, int), optional
+        Inclusive (first, last) StudyYear range; rows outside it are skipped
+        before they are converted
+    chunk_size : int
+        Maximum number of rows per yielded chunk
+    sheet_name : str, optional
+        Worksheet to read; defaults to the first sheet
+
+    Yields:
+    -------
+    DataFrame
+        Up to `chunk_size` rows holding only the selected columns
+    """
+    wb, ws = _open_sheet(path, sheet_name)
+    try:
+        rows = ws.iter_rows(values_only=True)
+        header = _header(rows)
+        names = list(columns) if columns is not None else header
+
+        missing = [c for c in names if c not in header]
+        if missing:
+            raise ValueError(f"Columns not found in {path}: {missing}")
+
+        width = len(header)
+        positions = [header.index(c) for c in names]
+        # itemgetter with a single index returns a scalar, not a tuple
+        pick = itemgetter(*positions) if len(positions) > 1 else (lambda r: (r[positions[0]],))
+
+        year_pos = None
+        if years is not None:
+            if YEAR_COLUMN not in header:
+                raise ValueError(f"Cannot filter by year: {YEAR_COLUMN} not found in {path}")
+            year_pos = header.index(YEAR_COLUMN)
+            first_year, last_year = years
+
+        buffer = []
+        for row in rows:
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            if year_pos is not None:
+                year = row[year_pos]
+                if year is None or not first_year <= year <= last_year:
+                    continue
+            buffer.append(pick(row))
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame.from_records(buffer, columns=names)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=names)
+    finally:
+        wb.close()
+
+
+def stream_workbook(path=WORKBOOK_PATH, columns=None, years=None,
+                    chunk_size=CHUNK_SIZE, sheet_name=None):
+    """
+    Read the workbook with column and StudyYear pushdown, chunk by chunk.
+
+    Takes the same parameters as `iter_workbook_chunks` and returns the
+    concatenated frame. Columns that were entirely empty in some chunks are
+    re-inferred so numeric columns come back as numeric dtypes.
+    """
+    chunks = list(iter_workbook_chunks(path, columns, years, chunk_size, sheet_name))
+    if not chunks:
+        names = list(columns) if columns is not None else workbook_columns(path, sheet_name)
+        return pd.DataFrame(columns=names)
+    return pd.concat(chunks, ignore_index=True).infer_objects()
@@ -0,0 +1,273 @@
+"""
+Precomputed (state, year, measure) lookup index.
+
+`get_state_value` answers "what is the value of column C for state X in year
+Y" by scanning the frame with boolean masks on every call. `StateYearIndex`
+builds the answers once from a processed frame: a dense state x year x
+measure array of means with a validity mask, plus the state, neighbor-year
+and global fallbacks used for imputation. Single lookups are dictionary and
+array indexing; batch lookups are NumPy gathers.
+"""
+
+import numpy as np
+import pandas as pd
+
+STATE_COLUMN = 'State_Abbreviation'
+YEAR_COLUMN = 'StudyYear'
+
+# Define state neighbors for missing value imputation (hand-written default;
+# ndcp.adjacency.state_neighbors() derives the graph for every state)
+STATE_NEIGHBORS = {
+    'IN': ['IL', 'KY', 'MI', 'OH'],  # Indiana's neighbors
+    'NM': ['AZ', 'CO', 'OK', 'TX']   # New Mexico's neighbors
+}
+
+# Fallback strategies in the order they are tried
+STRATEGIES = ['state_year', 'state', 'neighbor_year', 'global']
+
+
+def _series_mean(s):
+    # Same reduction as `df[mask][column].mean()` in get_state_value; the cython
+    # groupby mean sums in a different order and can differ in the last bit
+    return s.mean()
+
+
+def _plain_index(table):
+    """Replace categorical index levels with plain object levels so lookups are type-agnostic."""
+    if isinstance(table.index, pd.MultiIndex):
+        table.index = pd.MultiIndex.from_arrays(
+            [np.asarray(table.index.get_level_values(i), dtype=object)
+             for i in range(table.index.nlevels)])
+    else:
+        table.index = pd.Index(np.asarray(table.index, dtype=object))
+    return table
+
+
+def group_means(df, keys, columns):
+    """
+    Mean of each column per group, reduced exactly like `Series.mean`.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        The input dataframe containing the data
+    keys : list of str
+        Grouping columns
+    columns : list of str
+        Columns to average
+
+    Returns:
+    --------
+    DataFrame
+        One row per observed group, indexed by plain (non-categorical) keys
+    """
+    # Aggregate column by column: a frame-level UDF would see 2-D blocks, whose
+    # column means are reduced differently from a single Series
+    grouped = df.groupby(keys, observed=True, sort=True)
+    return _plain_index(pd.concat({col: grouped[col].agg(_series_mean) for col in columns}, axis=1))
+
+
+def neighbor_year_means(df, columns, neighbors=STATE_NEIGHBORS,
+                        state_col=STATE_COLUMN, year_col=YEAR_COLUMN):
+    """
+    Pooled mean of each column over a state's neighbors, per year.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        The input dataframe containing the data
+    columns : list of str
+        Columns to average
+    neighbors : dict
+        Maps a state abbreviation to the abbreviations of its neighbors
+    state_col, year_col : str
+        Names of the state and year columns
+
+    Returns:
+    --------
+    DataFrame
+        Indexed by (state, year) for the states listed in `neighbors`
+    """
+    pairs = pd.DataFrame(
+        [(state, n) for state, ns in neighbors.items() for n in ns],
+        columns=['_state', state_col],
+    )
+    rows = pd.DataFrame({
+        state_col: np.asarray(df[state_col], dtype=object),
+        year_col: np.asarray(df[year_col]),
+        '_pos': np.arange(len(df)),
+    })
+    for col in columns:
+        rows[col] = df[col].to_numpy()
+
+    # One copy of each neighbor row per state that borders it, in original row order
+    expanded = pairs.merge(rows, on=state_col).sort_values('_pos', kind='stable')
+    means = group_means(expanded, ['_state', year_col], columns)
+    return means.rename_axis([state_col, year_col])
+
+
+class StateYearIndex:
+    """
+    Dense state x year x measure table of means with imputation fallbacks.
+
+    Attributes:
+    -----------
+    states, years, columns : list
+        Labels of the three array axes
+    values : ndarray, shape (states, years, columns)
+        Mean of each measure for each state and year (NaN where no data)
+    valid : ndarray of bool, same shape as `values`
+        True where `values` holds an observed mean
+    state_values : ndarray, shape (states, columns)
+        Mean of each measure per state across all years
+    neighbor_values : ndarray, shape (states, years, columns)
+        Pooled mean of the neighboring states in the same year
+    global_values : ndarray, shape (columns,)
+        Mean of each measure over the whole frame
+    """
+
+    def __init__(self, states, years, columns, values, state_values, neighbor_values, global_values):
+        self.states = list(states)
+        self.years = list(years)
+        self.columns = list(columns)
+        self.values = values
+        self.valid = ~np.isnan(values)
+        self.state_values = state_values
+        self.neighbor_values = neighbor_values
+        self.global_values = global_values
+
+        self._state_pos = pd.Index(self.states, dtype=object)
+        self._year_pos = pd.Index(self.years, dtype=object)
+        self._state_lookup = {state: i for i, state in enumerate(self.states)}
+        self._year_lookup = {year: i for i, year in enumerate(self.years)}
+        self._column_pos = {col: i for i, col in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, df, columns, neighbors=STATE_NEIGHBORS,
+                   state_col=STATE_COLUMN, year_col=YEAR_COLUMN):
+        """Build the index from a county-level frame in one pass per strategy."""
+        columns = list(columns)
+        state_year = group_means(df, [state_col, year_col], columns)
+        state = group_means(df, [state_col], columns)
+        neighbor_year = neighbor_year_means(df, columns, neighbors, state_col, year_col)
+
+        states = sorted(set(state.index) | set(neighbors))
+        years = sorted(set(state_year.index.get_level_values(1)))
+        grid = pd.MultiIndex.from_product([states, years])
+        shape = (len(states), len(years), len(columns))
+
+        return cls(
+            states, years, columns,
+            values=state_year.reindex(grid).to_numpy(dtype=float).reshape(shape),
+            state_values=state.reindex(pd.Index(states, dtype=object)).to_numpy(dtype=float),
+            neighbor_values=neighbor_year.reindex(grid).to_numpy(dtype=float).reshape(shape),
+            global_values=df[columns].mean().to_numpy(dtype=float),
+        )
+
+    @classmethod
+    def from_sums(cls, counts, sums, neighbors=STATE_NEIGHBORS):
+        """
+        Build the index from per (state, year) counts and sums of each column.
+
+        Used when the rows are streamed and never held in memory at once (see
+        `ndcp.streaming.GroupStats`). Every fallback is a ratio of pooled sums
+        to pooled counts, so the means agree with `from_frame` up to rounding.
+
+        Parameters:
+        -----------
+        counts, sums : DataFrame
+            Indexed by (state, year), one column per measure
+        neighbors : dict
+            Maps a state abbreviation to the abbreviations of its neighbors
+        """
+        columns = list(sums.columns)
+        counts, sums = _plain_index(counts.copy()), _plain_index(sums.copy())
+        states = sorted(set(sums.index.get_level_values(0)) | set(neighbors))
+        years = sorted(set(sums.index.get_level_values(1)))
+        grid = pd.MultiIndex.from_product([states, years])
+        shape = (len(states), len(years), len(columns))
+        n = counts.reindex(grid).fillna(0.0).to_numpy(dtype=float).reshape(shape)
+        total = sums.reindex(grid).fillna(0.0).to_numpy(dtype=float).reshape(shape)
+
+        # Row s of `border` marks the neighbors of state s
+        pos = {state: i for i, state in enumerate(states)}
+        border = np.zeros((len(states), len(states)))
+        for state, ns in neighbors.items():
+            border[pos[state], [pos[s] for s in ns if s in pos]] = 1.0
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = lambda t, c: np.where(c > 0, t / np.where(c > 0, c, 1.0), np.nan)
+            return cls(
+                states, years, columns,
+                values=ratio(total, n),
+                state_values=ratio(total.sum(axis=1), n.sum(axis=1)),
+                neighbor_values=ratio(np.einsum('st,tym->sym', border, total),
+                                      np.einsum('st,tym->sym', border, n)),
+                global_values=ratio(total.sum(axis=(0, 1)), n.sum(axis=(0, 1))),
+            )
+
+    def _positions(self, states, years, columns):
+        si = self._state_pos.get_indexer(np.asarray(states, dtype=object))
+        yi = self._year_pos.get_indexer(np.asarray(years, dtype=object))
+        ci = np.array([self._column_pos[c] for c in (columns or self.columns)], dtype=int)
+        return si, yi, ci
+
+    def gather_strategies(self, states, years, columns=None):
+        """
+        Candidate values from every fallback strategy for a batch of keys.
+
+        Parameters:
+        -----------
+        states, years : array-like
+            Parallel arrays of state abbreviations and years
+        columns : list of str, optional
+            Measures to return; defaults to every indexed measure
+
+        Returns:
+        --------
+        dict
+            Maps each name in `STRATEGIES` to a (keys x columns) array,
+            NaN where the strategy has no data for that key
+        """
+        si, yi, ci = self._positions(states, years, columns)
+        known_state = (si >= 0)[:, None]
+        known_both = ((si >= 0) & (yi >= 0))[:, None]
+        s, y = np.maximum(si, 0), np.maximum(yi, 0)
+
+        return {
+            'state_year': np.where(known_both, self.values[s[:, None], y[:, None], ci], np.nan),
+            'state': np.where(known_state, self.state_values[s[:, None], ci], np.nan),
+            'neighbor_year': np.where(known_both, self.neighbor_values[s[:, None], y[:, None], ci], np.nan),
+            'global': np.broadcast_to(self.global_values[ci], (len(si), len(ci))),
+        }
+
+    def gather(self, states, years, columns=None, fallback=True):
+        """
+        Look up a batch of (state, year) keys as a single array gather.
+
+        With `fallback=True` each value comes from the first strategy in
+        `STRATEGIES` that has data; otherwise only the exact state-year
+        means are returned.
+        """
+        candidates = self.gather_strategies(states, years, columns)
+        result = candidates['state_year'].copy()
+        if fallback:
+            for name in STRATEGIES[1:]:
+                result = np.where(np.isnan(result), candidates[name], result)
+        return result
+
+    def get(self, state, column, year, fallback=True):
+        """Return the value for one state, column and year (same answer as `get_state_value`)."""
+        c = self._column_pos[column]
+        s = self._state_lookup.get(state)
+        y = self._year_lookup.get(year)
+
+        if s is not None and y is not None and self.valid[s, y, c]:
+            return float(self.values[s, y, c])
+        if not fallback:
+            return np.nan
+        if s is not None and not np.isnan(self.state_values[s, c]):
+            return float(self.state_values[s, c])
+        if s is not None and y is not None and not np.isnan(self.neighbor_values[s, y, c]):
+            return float(self.neighbor_values[s, y, c])
+        return float(self.global_values[c])
@@ -0,0 +1,193 @@
+"""
+Processed NDCP data stored as one partition per StudyYear.
+
+Historic vintages of the NDCP do not change, yet every run re-imputes and
+re-derives all of 2008-2018. The helpers here keep the processed frame under
+`data/.cache/processed/<name>/` as `StudyYear=<year>` files next to a
+`manifest.json` that records the input fingerprint of each partition. When a
+new workbook arrives only the partitions whose fingerprint changed are
+rebuilt; the rest are read back as they are.
+
+A year's fingerprint covers its own raw rows plus every value it borrows from
+outside the year during imputation (state means across years, the global
+mean) and the neighbor lists it relies on, so adding a vintage that shifts
+those means also rebuilds the years that depend on them, and nothing else.
+
+Each partition keeps the row labels of the source frame in a `ROW_INDEX`
+column; `read_partitions` sorts on it and restores them as the index, so the
+rows come back in the order (and with the labels) of a full, unpartitioned run.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import CACHE_FORMAT, CACHE_SUFFIX, read_cache, write_cache
+from .lookup import STATE_COLUMN, YEAR_COLUMN
+from .paths import CACHE_DIR
+
+PARTITION_ROOT = CACHE_DIR / 'processed'
+MANIFEST_NAME = 'manifest.json'
+
+# Column holding the source row label of each stored row
+ROW_INDEX = '_row'
+
+
+def _hash_frame(df):
+    """Order-sensitive digest of a frame's values and column names."""
+    digest = hashlib.sha256(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest
+
+
+def year_fingerprints(df, columns, index, neighbors, config='',
+                      state_col=STATE_COLUMN, year_col=YEAR_COLUMN):
+    """
+    Fingerprint the inputs that determine each year's processed rows.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Raw (unimputed) rows for all years
+    columns : list of str
+        Columns that are imputed
+    index : StateYearIndex
+        Lookup index built from the full raw frame
+    neighbors : dict
+        Neighbor lists used for imputation
+    config : str
+        Anything else that changes the output (processing version, flags)
+
+    Returns:
+    --------
+    dict
+        Maps each year present in `df` to a hex digest
+    """
+    years = np.asarray(df[year_col])
+    fingerprints = {}
+    for year in sorted(set(years.tolist())):
+        rows = df[years == year]
+        digest = _hash_frame(rows)
+        digest.update(config.encode())
+
+        # Values borrowed from outside the year by the cells that need them
+        candidates = index.gather_strategies(rows[state_col], rows[year_col], columns)
+        missing = rows[columns].isna().to_numpy()
+        needs_state = missing & np.isnan(candidates['state_year'])
+        needs_neighbor = needs_state & np.isnan(candidates['state'])
+        needs_global = needs_neighbor & np.isnan(candidates['neighbor_year'])
+
+        digest.update(np.where(needs_state, candidates['state'], 0.0).tobytes())
+        digest.update(np.where(needs_global, candidates['global'], 0.0).tobytes())
+        states = np.asarray(rows[state_col], dtype=object)[needs_neighbor.any(axis=1)]
+        for state in sorted(set(states.tolist())):
+            digest.update(f"{state}:{','.join(neighbors.get(state, []))};".encode())
+
+        fingerprints[int(year)] = digest.hexdigest()
+    return fingerprints
+
+
+def partition_path(store_dir, year, kind='data'):
+    """Location of a year's processed rows (`kind='data'`) or summary (`kind='summary'`)."""
+    suffix = '' if kind == 'data' else f'.{kind}'
+    return Path(store_dir) / f"StudyYear={year}{suffix}{CACHE_SUFFIX[CACHE_FORMAT]}"
+
+
+def read_manifest(store_dir):
+    path = Path(store_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(store_dir, manifest):
+    path = Path(store_dir) / MANIFEST_NAME
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def sync_partitions(df, fingerprints, build, store_dir, summarize=None, year_col=YEAR_COLUMN):
+    """
+    Rebuild only the year partitions whose fingerprint changed.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Raw rows for all years that should be stored
+    fingerprints : dict
+        Output of `year_fingerprints`, restricted to the years to store
+    build : callable
+        Turns the raw rows of the changed years into processed rows
+    store_dir : str or Path
+        Directory holding the partitions and the manifest
+    summarize : callable, optional
+        Turns one year's processed rows into a small aggregate frame that is
+        stored next to the partition
+
+    Returns:
+    --------
+    list of int
+        Years that were rebuilt
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(store_dir)
+
+    changed = [year for year, fp in fingerprints.items()
+               if manifest.get(str(year)) != fp or not partition_path(store_dir, year).exists()]
+
+    if changed:
+        processed = build(df[np.isin(np.asarray(df[year_col]), changed)])
+        years = np.asarray(processed[year_col])
+        for year in changed:
+            part = processed[years == year]
+            stored = part.rename_axis(ROW_INDEX).reset_index()
+            write_cache(stored, partition_path(store_dir, year), CACHE_FORMAT)
+            if summarize is not None:
+                summary = summarize(part.reset_index(drop=True))
+                write_cache(summary, partition_path(store_dir, year, 'summary'), CACHE_FORMAT)
+            manifest[str(year)] = fingerprints[year]
+
+    # Drop partitions for years that are no longer in the input
+    for year in [y for y in manifest if int(y) not in fingerprints]:
+        for kind in ('data', 'summary'):
+            partition_path(store_dir, year, kind).unlink(missing_ok=True)
+        del manifest[year]
+
+    _write_manifest(store_dir, manifest)
+    return changed
+
+
+def read_partitions(store_dir, years=None, kind='data'):
+    """
+    Concatenate the stored partitions (or their summaries).
+
+    Processed rows are returned in their source order, indexed by their
+    source row labels; summaries are concatenated in year order.
+
+    Parameters:
+    -----------
+    store_dir : str or Path
+        Directory holding the partitions and the manifest
+    years : iterable of int, optional
+        Years to read; all stored years by default
+    kind : str
+        'data' for the processed rows, 'summary' for the per-year aggregates
+    """
+    stored = sorted(int(y) for y in read_manifest(store_dir))
+    if years is not None:
+        stored = [y for y in stored if y in set(years)]
+    parts = [read_cache(partition_path(store_dir, y, kind), CACHE_FORMAT) for y in stored]
+    if not parts:
+        return pd.DataFrame()
+    frame = pd.concat(parts, ignore_index=True)
+    if kind == 'data' and ROW_INDEX in frame:
+        frame = frame.sort_values(ROW_INDEX, kind='stable').set_index(ROW_INDEX).rename_axis(None)
+    return frame
@@ -0,0 +1,25 @@
+"""
+Shared filesystem locations for the childcare cost analysis pipelines.
+
+Every milestone script resolves the National Database of Childcare Prices
+workbook relative to its own directory; these constants give them a single
+place to agree on where the data and derived caches live.
+"""
+
+from pathlib import Path
+
+# Repository root (the directory that contains `data/`, `docs/` and `milestones/`)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Raw inputs
+DATA_DIR = REPO_ROOT / 'data'
+WORKBOOK_PATH = DATA_DIR / 'nationaldatabaseofchildcareprices.xlsx'
+
+# Census cartographic boundary files bundled with milestone5
+SHAPE_DIR = REPO_ROOT / 'milestones' / 'milestone5' / 'data'
+STATE_SHAPEFILE = SHAPE_DIR / 'cb_2018_us_state_20m' / 'cb_2018_us_state_20m.shp'
+# Not bundled; the matching county file is used when placed alongside
+COUNTY_SHAPEFILE = SHAPE_DIR / 'cb_2018_us_county_20m' / 'cb_2018_us_county_20m.shp'
+
+# Derived artifacts that can always be rebuilt from the raw inputs
+CACHE_DIR = DATA_DIR / '.cache'
@@ -0,0 +1,287 @@
+"""
+Lean HTML export for the plotly dashboards.
+
+`fig.write_html` inlines the whole of plotly.js (about 4.8 MB) and every
+trace's data into each page. `write_lean_html` writes a figure as three
+parts instead:
+
+* one shared, versioned copy of plotly.js next to the pages, written once
+  and cached by the browser across pages;
+* the figure as a compact JSON payload in a sibling `<page>.figure.json`,
+  the only file a rebuild rewrites when just the data changes;
+* a minimal HTML page that loads the bundle and fetches the payload.
+
+Browsers do not fetch files from disk (`file://`), so with `inline=True`
+the page also carries a copy of the payload in a
+`<script type="application/json">` tag, used when the fetch fails.
+
+In the payload numeric trace arrays are rounded, and when the bundled
+plotly.js understands them (2.28 and later) stored as base64 typed arrays
+(`{"dtype", "bdata"}`) in the smallest dtype that holds them. Older bundles
+get the rounded values as plain lists.
+
+Files are only rewritten when their contents change.
+"""
+
+import base64
+import html
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .cache import write_if_changed
+
+# Decimal places kept in float trace data
+DEFAULT_DECIMALS = 4
+
+# Integer dtypes tried in order for integral arrays (typed-array codes used by plotly.js)
+_INT_DTYPES = ['i1', 'u1', 'i2', 'u2', 'i4', 'u4']
+
+# First plotly.js release that decodes `{"dtype", "bdata"}` typed arrays
+TYPED_ARRAY_PLOTLYJS = (2, 28)
+
+_SHELL = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{bundle}"></script>
+<style>html, body, #figure {{ margin: 0; width: 100%; height: 100%; }}</style>
+</head>
+<body>
+<div id="figure"></div>{inline}
+<script>
+function inlineFigure(error) {{
+  const tag = document.getElementById("figure-data");
+  if (!tag) throw error;
+  return JSON.parse(tag.textContent);
+}}
+fetch("{payload}")
+  .then(response => {{
+    if (!response.ok) throw new Error(`{payload} is not available (HTTP ${{response.status}})`);
+    return response.json();
+  }})
+  .catch(inlineFigure)
+  .then(fig => Plotly.newPlot("figure", fig.data, fig.layout, {{responsive: true}}))
+  .catch(error => {{
+    document.getElementById("figure").textContent = `The figure could not be loaded: ${{error.message}}`;
+  }});
+</script>
+</body>
+</html>
+"""
+
+_INLINE = """
+<script type="application/json" id="figure-data">{payload}</script>"""
+
+# Suffix of the payload file written next to each page
+PAYLOAD_SUFFIX = '.figure.json'
+
+
+def plotly_bundle_name():
+    """File name of the shared plotly.js bundle, versioned so browsers can cache it."""
+    from plotly.offline import get_plotlyjs_version
+
+    return f"plotly-{get_plotlyjs_version()}.min.js"
+
+
+def write_plotly_bundle(dest_dir):
+    """Write the plotly.js bundle shipped with the plotly package into `dest_dir` (once)."""
+    from plotly.offline import get_plotlyjs
+
+    path = Path(dest_dir) / plotly_bundle_name()
+    if not path.exists():
+        write_if_changed(path, get_plotlyjs())
+    return path
+
+
+def supports_typed_arrays(version=None):
+    """True when plotly.js `version` (default: the bundled one) decodes typed-array specs."""
+    if version is None:
+        from plotly.offline import get_plotlyjs_version
+
+        version = get_plotlyjs_version()
+    parts = tuple(int(p) for p in str(version).split('.')[:2] if p.isdigit())
+    return parts >= TYPED_ARRAY_PLOTLYJS
+
+
+def _numeric_array(values):
+    """`values` (a list, array or typed-array spec) as a 1-D/2-D real ndarray, or None."""
+    if isinstance(values, dict):
+        raw = base64.b64decode(values['bdata'])
+        array = np.frombuffer(raw, dtype=np.dtype(values['dtype']))
+        if 'shape' in values:
+            array = array.reshape([int(n) for n in str(values['shape']).split(',')])
+    else:
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            return None
+    if array.ndim not in (1, 2) or array.size == 0 or array.dtype.kind not in 'iuf':
+        return None
+    return array
+
+
+def rounded_list(values, decimals=DEFAULT_DECIMALS):
+    """
+    Round a numeric array for plain JSON: integral arrays as ints, NaN as None.
+
+    The fallback of `typed_array` for plotly.js bundles older than 2.28.
+    Returns None when `values` is not a rectangular array of real numbers.
+    """
+    array = _numeric_array(values)
+    if array is None:
+        return None
+    array = np.round(array.astype(float), decimals)
+    finite = np.isfinite(array)
+    integral = np.all(array[finite] == np.round(array[finite]))
+    objects = array.astype(object)
+    if integral:
+        objects[finite] = array[finite].astype(np.int64)
+    objects[~finite] = None
+    return objects.tolist()
+
+
+def typed_array(values, decimals=DEFAULT_DECIMALS):
+    """
+    Encode a numeric array as a plotly.js typed-array spec.
+
+    Values are rounded to `decimals` places. Integral arrays use the
+    smallest integer dtype that holds them; other arrays use float32 when
+    that keeps every value within the rounding, float64 otherwise.
+
+    Returns:
+    --------
+    dict or None
+        `{"dtype", "bdata"}` (plus `"shape"` for 2-D arrays), or None when
+        `values` is not a rectangular array of real numbers
+    """
+    array = _numeric_array(values)
+    if array is None:
+        return None
+
+    array = np.round(array.astype(float), decimals)
+    finite = array[np.isfinite(array)]
+    encoded = None
+    if len(finite) == len(array.ravel()) and np.all(finite == np.round(finite)):
+        for code in _INT_DTYPES:
+            info = np.iinfo(np.dtype(code))
+            if finite.min() >= info.min and finite.max() <= info.max:
+                encoded = array.astype(code)
+                break
+    if encoded is None:
+        single = array.astype('f4')
+        close = np.all(np.abs(single[np.isfinite(array)] - finite) <= 0.5 * 10.0 ** -decimals)
+        encoded = single if close else array
+
+    spec = {'dtype': encoded.dtype.str.lstrip('<>|='),
+            'bdata': base64.b64encode(np.ascontiguousarray(encoded).tobytes()).decode('ascii')}
+    if encoded.ndim == 2:
+        spec['shape'] = f"{encoded.shape[0]},{encoded.shape[1]}"
+    return spec
+
+
+# Attributes shown as given when no template formats them; never re-encoded
+_DISPLAY_KEYS = {'text', 'hovertext'}
+
+
+def _takes_numbers(key, validator):
+    """True for data attributes that accept a numeric array (not the displayed text)."""
+    kind = type(validator).__name__
+    if key in _DISPLAY_KEYS or kind == 'StringValidator':
+        return False
+    return kind == 'DataArrayValidator' or getattr(validator, 'array_ok', False)
+
+
+def _compact(obj, spec, decimals, encode):
+    """Replace the numeric data arrays of a plotly object's JSON `spec` with `encode(array, decimals)`."""
+    from plotly.basedatatypes import BasePlotlyType
+
+    for key, value in spec.items():
+        try:
+            validator = obj._get_validator(key)
+        except (KeyError, ValueError, AttributeError):
+            continue
+        child = getattr(obj, key, None)
+        if isinstance(child, BasePlotlyType) and isinstance(value, dict):
+            _compact(child, value, decimals, encode)
+        elif isinstance(value, (list, tuple, np.ndarray, dict)) and _takes_numbers(key, validator):
+            encoded = encode(value, decimals)
+            if encoded is not None:
+                spec[key] = encoded
+
+
+def compact_figure_json(fig, decimals=DEFAULT_DECIMALS, typed=None):
+    """
+    Figure as compact JSON text: rounded trace data, no whitespace.
+
+    Trace arrays become typed arrays when `typed` is true, plain rounded
+    lists otherwise; by default typed arrays are used only if the bundled
+    plotly.js decodes them (`supports_typed_arrays`).
+    """
+    from plotly.utils import PlotlyJSONEncoder
+
+    if typed is None:
+        typed = supports_typed_arrays()
+    encode = typed_array if typed else rounded_list
+    spec = fig.to_plotly_json()
+    for trace, trace_spec in zip(fig.data, spec['data']):
+        _compact(trace, trace_spec, decimals, encode)
+    return json.dumps(spec, cls=PlotlyJSONEncoder, separators=(',', ':'))
+
+
+def payload_path(html_path):
+    """The JSON payload file of the page at `html_path` (`dashboard.html` -> `dashboard.figure.json`)."""
+    html_path = Path(html_path)
+    return html_path.with_name(html_path.stem + PAYLOAD_SUFFIX)
+
+
+def write_lean_html(fig, html_path, bundle_dir=None, decimals=DEFAULT_DECIMALS, title=None, inline=False):
+    """
+    Write a figure as a small HTML page, its JSON payload and a shared plotly.js bundle.
+
+    Parameters:
+    -----------
+    fig : plotly.graph_objects.Figure
+        Figure to export
+    html_path : str or Path
+        Page to write
+    bundle_dir : str or Path, optional
+        Directory of the shared plotly.js bundle; defaults to the page's directory
+    decimals : int
+        Decimal places kept in float trace data
+    title : str, optional
+        Page title; defaults to the figure title or the file name
+    inline : bool
+        Also embed the payload in the page, for opening it from disk
+        (`file://`), where the payload file cannot be fetched
+
+    Returns:
+    --------
+    list of Path
+        The files that were (re)written
+    """
+    html_path = Path(html_path)
+    bundle_path = Path(bundle_dir or html_path.parent) / plotly_bundle_name()
+    had_bundle = bundle_path.exists()
+    write_plotly_bundle(bundle_path.parent)
+
+    if title is None:
+        title = fig.layout.title.text or html_path.stem
+    payload = compact_figure_json(fig, decimals)
+    data_path = payload_path(html_path)
+    shell = _SHELL.format(
+        title=html.escape(str(title)),
+        bundle=Path(os.path.relpath(bundle_path, html_path.parent)).as_posix(),
+        payload=data_path.name,
+        # '<' only occurs inside JSON strings; escaping it keeps "</script>" out of the tag
+        inline=_INLINE.format(payload=payload.replace('<', '\\u003c')) if inline else '',
+    )
+
+    written = [] if had_bundle else [bundle_path]
+    for path, text in [(data_path, payload), (html_path, shell)]:
+        if write_if_changed(path, text):
+            written.append(path)
+    return written
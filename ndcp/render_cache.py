@@ -0,0 +1,177 @@
+"""
+Content-addressed cache of rendered chart files.
+
+A chart only needs to be drawn again when its inputs, its code or the
+plotting style change. `RenderCache` keys every chart on a fingerprint of
+those three things and keeps the files it produced under
+`data/.cache/render/<name>/`: the PNGs themselves are stored once per
+content hash in `blobs/`, and `manifest.json` maps each chart to its key and
+the hashes of its outputs. On a hit the outputs are left alone (or restored
+from the blob store if they were deleted or overwritten) and the chart is
+not rendered at all.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_digest
+from .paths import CACHE_DIR
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def fingerprint(value, digest=None):
+    """
+    Stable SHA-256 digest of chart inputs.
+
+    Handles DataFrames, Series and arrays (by content), dicts, lists and
+    tuples (recursively), plain scalars, functions (by source) and objects
+    such as `AggregateCube` (through their attributes).
+    """
+    top = digest is None
+    digest = hashlib.sha256() if top else digest
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        labels = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((type(value).__name__, labels, list(value.index.names))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            fingerprint(value[key], digest)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}[{len(value)}]".encode())
+        for item in value:
+            fingerprint(item, digest)
+    elif value is None or isinstance(value, (str, bytes, int, float, bool, np.generic)):
+        digest.update(repr(value).encode())
+    elif inspect.isfunction(value):
+        digest.update(inspect.getsource(value).encode())
+    elif hasattr(value, '__dict__'):
+        digest.update(type(value).__qualname__.encode())
+        fingerprint(vars(value), digest)
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest() if top else digest
+
+
+def package_digest(package_dir=Path(__file__).parent):
+    """
+    SHA-256 digest of the sources of a package (by default `ndcp` itself).
+
+    Charts are shaped by package code as well as by their own functions
+    (label points, shape levels of detail, cube means, sketch medians, ...),
+    so every render cache key includes this digest: any change to the
+    package re-renders the charts rather than serving stale images.
+    """
+    digest = hashlib.sha256()
+    package_dir = Path(package_dir)
+    for path in sorted(package_dir.rglob('*.py')):
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Manifest of rendered charts plus a content-addressed store of their files.
+
+    Attributes:
+    -----------
+    cache_dir : Path
+        Directory holding `manifest.json` and `blobs/`
+    hits, misses : list of str
+        Charts served from the cache and charts that had to be rendered
+    """
+
+    def __init__(self, name, cache_dir=CACHE_DIR / 'render'):
+        self.cache_dir = Path(cache_dir) / name
+        self.blob_dir = self.cache_dir / 'blobs'
+        self.hits = []
+        self.misses = []
+        path = self.cache_dir / MANIFEST_NAME
+        self.manifest = json.loads(path.read_text()) if path.exists() else {}
+
+    def fetch(self, chart, key, outputs):
+        """
+        Make `outputs` match the cached render of `chart` for `key`.
+
+        Returns True (a hit) when the key matches and every output is
+        present in the blob store; missing or modified outputs are restored.
+        Returns False when the chart has to be rendered.
+        """
+        entry = self.manifest.get(chart)
+        outputs = [Path(p) for p in outputs]
+        if (entry is None or entry['key'] != key
+                or sorted(entry['outputs']) != sorted(p.name for p in outputs)
+                or not all((self.blob_dir / h).exists() for h in entry['outputs'].values())):
+            self.misses.append(chart)
+            return False
+
+        for path in outputs:
+            blob = entry['outputs'][path.name]
+            if not path.exists() or file_digest(path) != blob:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.blob_dir / blob, path)
+        self.hits.append(chart)
+        return True
+
+    def store(self, chart, key, outputs):
+        """Record freshly rendered `outputs` of `chart` under `key`."""
+        outputs = [Path(p) for p in outputs]
+        if not all(p.exists() for p in outputs):
+            return
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        hashes = {}
+        for path in outputs:
+            blob = file_digest(path)
+            if not (self.blob_dir / blob).exists():
+                shutil.copyfile(path, self.blob_dir / blob)
+            hashes[path.name] = blob
+        self.manifest[chart] = {'key': key, 'outputs': hashes}
+
+    def save(self):
+        """Write the manifest and drop blobs no chart refers to any more."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / MANIFEST_NAME
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, path)
+
+        live = {h for entry in self.manifest.values() for h in entry['outputs'].values()}
+        if self.blob_dir.exists():
+            for blob in self.blob_dir.iterdir():
+                if blob.name not in live:
+                    blob.unlink()
+
+    def report(self):
+        """One-line summary of hits and misses."""
+        return f"Render cache: {len(self.hits)} hit(s), {len(self.misses)} miss(es)"
+
+
+def publish(paths, dest_dir):
+    """
+    Copy files into `dest_dir`, skipping those whose content is already there.
+
+    Returns the list of file names that were copied.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    copied = []
+    for path in map(Path, paths):
+        if not path.exists():
+            continue
+        target = dest_dir / path.name
+        if not target.exists() or file_digest(target) != file_digest(path):
+            shutil.copyfile(path, target)
+            copied.append(path.name)
+    return copied
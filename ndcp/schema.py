@@ -0,0 +1,104 @@
+"""
+Compact typed schema for the NDCP frame.
+
+The workbook loads with object strings for the state and county names, int64
+years and float64 prices, and the derived columns added by the pipelines make
+the frame even larger. `apply_schema` casts the known columns to compact
+dtypes:
+
+- repeated labels (states, counties, area types) become categoricals, so
+  groupbys on them run over integer codes;
+- StudyYear becomes int16 and FIPS codes / household counts become int32;
+- price and ratio measures optionally become float32.
+
+Integer casts are only applied when a column is whole-valued, has no missing
+values and fits the target range, so the values themselves never change.
+Groupbys on the categorical columns should pass `observed=True`.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality labels stored as categoricals
+CATEGORY_COLUMNS = [
+    'State_Name', 'State_Abbreviation', 'County_Name',
+    'Urban_Rural', 'County_Type',
+]
+
+# Integer identifiers and counts with their compact dtypes
+INTEGER_COLUMNS = {
+    'StudyYear': 'int16',
+    'County_FIPS_Code': 'int32',
+    'TotalPop': 'int32',
+    'H_Under6_BothWork': 'int32',
+    'H_Under6_SingleM': 'int32',
+    'H_6to17_BothWork': 'int32',
+    'H_6to17_SingleM': 'int32',
+}
+
+# Prices, incomes and derived ratios that may be stored as float32
+MEASURE_COLUMNS = [
+    'MCInfant', 'MCToddler', 'MCPreschool',
+    'MFCCInfant', 'MFCCToddler', 'MFCCPreschool',
+    'MHI_2018', 'MHI', 'FLFPR_20to64',
+    'Annual_Cost_Infant', 'Annual_Cost_Toddler', 'Annual_Cost_Preschool',
+    'Cost_Burden', 'Cost_Income_Ratio', 'Working_Parent_Ratio',
+]
+
+
+def frame_memory(df):
+    """Return the deep memory usage of a DataFrame in bytes."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _fits_integer(series, dtype):
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return False
+    values = series.to_numpy()
+    if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+        return False
+    info = np.iinfo(dtype)
+    return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+
+
+def apply_schema(df, float32=False, verbose=True):
+    """
+    Cast the known NDCP columns of a frame to compact dtypes.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Loaded or processed NDCP data; unknown columns are left untouched
+    float32 : bool
+        Also store the price and ratio measures as float32
+    verbose : bool
+        Print the memory usage before and after the conversion
+
+    Returns:
+    --------
+    DataFrame
+        A new frame with the compact dtypes applied
+    """
+    before = frame_memory(df)
+    # Shallow copy: converted columns are replaced, the caller's frame is untouched
+    df = df.copy(deep=False)
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in df.columns and df[col].dtype != dtype and _fits_integer(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+
+    if float32:
+        for col in MEASURE_COLUMNS:
+            if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+                df[col] = df[col].astype('float32')
+
+    if verbose:
+        after = frame_memory(df)
+        saved = (1 - after / before) * 100 if before else 0.0
+        print(f"Compact schema: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({saved:.0f}% saved)")
+
+    return df
@@ -0,0 +1,290 @@
+"""
+Static build of the `docs/` site for deployment.
+
+`docs/` is served as written: the same charts live in both `docs/images`
+and `docs/output/images`, and pages, scripts and data go out uncompressed
+under names a browser has to revalidate on every visit. `build_site` copies
+the site into a separate output directory and
+
+* fingerprints images, stylesheets and scripts (`cost_map.<hash>.png`), so
+  they can be served with a far-future cache lifetime;
+* writes each distinct file once: copies with identical contents all map to
+  the same fingerprinted file;
+* wraps each `<img>` of a page whose chart has current web variants
+  (`images/variants/`, see `ndcp.image_variants`) in a `<picture>` element
+  with WebP and PNG `srcset`s, so browsers download a chart at the size
+  they show it;
+* rewrites the references in pages, stylesheets and scripts to the
+  fingerprinted names, building each stylesheet and script after the
+  assets it refers to so its own hash covers their new names;
+* writes `.gz` (and, when the `brotli` package is installed, `.br`)
+  siblings of the text and data files for servers that negotiate
+  precompressed files (nginx `gzip_static`, Apache, a CDN). GitHub Pages
+  compresses on its own and never serves these siblings, so the Pages
+  workflow builds with `precompress=False`.
+
+HTML pages keep their names since they are the entry points, and the files
+under `data/` keep theirs since the dashboard scripts build those URLs at
+run time. `asset-manifest.json` in the output maps every source path to
+its built path.
+"""
+
+import gzip
+import graphlib
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+from .cache import file_digest
+from .image_variants import VARIANTS_MANIFEST, VARIANTS_SUBDIR, srcset
+from .paths import REPO_ROOT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DOCS_DIR = REPO_ROOT / 'docs'
+SITE_DIR = REPO_ROOT / 'build' / 'site'
+MANIFEST_NAME = 'asset-manifest.json'
+
+# Files renamed after their content hash
+FINGERPRINT_SUFFIXES = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.css', '.js']
+# Files whose references to fingerprinted assets are rewritten
+REWRITE_SUFFIXES = {'.html', '.css', '.js'}
+# Files that get precompressed siblings
+COMPRESS_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.bin'}
+# Directories left to the build or to local tooling
+SKIP_DIRS = {'.git', '__pycache__'}
+
+FINGERPRINT_LENGTH = 10
+
+# Rendered width of the charts in the pages, for the `sizes` of their variants
+IMAGE_SIZES = '(max-width: 960px) 100vw, 960px'
+
+# Relative asset paths in quotes, url(...) or a srcset list ("a.webp 480w, b.webp 960w")
+_REFERENCE = re.compile(
+    r"""(?:(?<=["'(])|(?<=,\s))((?:\./|\.\./)*[\w\-./]+\.(?:png|jpe?g|gif|svg|webp|ico|css|js))"""
+    r"""(?=[?#"')]|\s+\d+(?:\.\d+)?[wx]\b)""",
+    re.IGNORECASE,
+)
+_IMG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_SRC = re.compile(r"""\ssrc=(["'])([^"']+)\1""", re.IGNORECASE)
+
+
+def fingerprinted_name(path, data):
+    """`name.ext` -> `name.<content hash>.ext`"""
+    path = Path(path)
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+def _source_files(src):
+    for root, dirs, files in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            yield (Path(root) / name).relative_to(src)
+
+
+def rewrite_references(text, path, mapping):
+    """
+    Replace references to assets in `mapping` within a file's text.
+
+    References are resolved against the file's own directory first and then
+    against the site root (scripts refer to images relative to the page that
+    loads them), and rewritten in the same form.
+
+    Parameters:
+    -----------
+    text : str
+        Contents of the file at `path`
+    path : Path
+        File location relative to the site root
+    mapping : dict
+        Source path -> built path, both relative to the site root (POSIX)
+    """
+    def replace(match):
+        ref = match.group(1)
+        root, target = _resolve(ref, path, mapping)
+        if target is None:
+            return ref
+        built = os.path.relpath(mapping[target], root).replace(os.sep, '/')
+        return ('./' + built) if ref.startswith('./') else built
+
+    return _REFERENCE.sub(replace, text)
+
+
+def _resolve(ref, path, known):
+    """(root, source path) of a reference in the file at `path`, or (None, None) if not in `known`."""
+    for root in (path.parent, Path('.')):
+        target = os.path.normpath(root / ref).replace(os.sep, '/')
+        if target in known:
+            return root, target
+    return None, None
+
+
+def _dependency_order(src, assets):
+    """
+    Assets ordered so every stylesheet and script comes after the assets it
+    references, since its fingerprint depends on their built names.
+
+    Raises ValueError for circular references, which no choice of content
+    hashes can satisfy.
+    """
+    known = {path.as_posix(): path for path in assets}
+    graph = {}
+    for path in assets:
+        # A dict rather than a set keeps the order, and so the build, deterministic
+        graph[path] = {}
+        if path.suffix.lower() in REWRITE_SUFFIXES:
+            for ref in _REFERENCE.findall((src / path).read_text('utf-8')):
+                target = _resolve(ref, path, known)[1]
+                if target is not None and target != path.as_posix():
+                    graph[path][known[target]] = None
+    try:
+        return list(graphlib.TopologicalSorter(graph).static_order())
+    except graphlib.CycleError as error:
+        cycle = ' -> '.join(p.as_posix() for p in error.args[1])
+        raise ValueError(f"Circular asset references cannot be fingerprinted: {cycle}") from None
+
+
+def responsive_images(text, path, src):
+    """
+    Wrap the `<img>` tags of a page in `<picture>` elements listing their web variants.
+
+    Only images with a `variants/variants.json` entry next to them whose
+    digest matches the image are expanded, so stale variants are never
+    served; tags that already have a `srcset` are left alone.
+
+    Parameters:
+    -----------
+    text : str
+        Contents of the page at `path`
+    path : Path
+        Page location relative to the site root
+    src : Path
+        Site root
+    """
+    manifests = {}
+
+    def variants_of(ref):
+        image = src / path.parent / ref
+        manifest_path = image.parent / VARIANTS_SUBDIR / VARIANTS_MANIFEST
+        if manifest_path not in manifests:
+            manifests[manifest_path] = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        entry = manifests[manifest_path].get(image.name)
+        if entry is None or not image.exists() or entry['digest'] != file_digest(image):
+            return None
+        return entry
+
+    def expand(match):
+        tag = match.group(0)
+        attr = _SRC.search(tag)
+        if attr is None or 'srcset=' in tag.lower():
+            return tag
+        ref = attr.group(2)
+        if ref.startswith('/') or ':' in ref:
+            return tag
+        entry = variants_of(ref)
+        if entry is None:
+            return tag
+        prefix = posixpath.join(posixpath.dirname(ref), VARIANTS_SUBDIR) + '/'
+        img = f'{tag[:attr.end()]} srcset="{srcset(entry, "png", prefix)}" sizes="{IMAGE_SIZES}"{tag[attr.end():]}'
+        return (f'<picture><source type="image/webp" srcset="{srcset(entry, "webp", prefix)}" '
+                f'sizes="{IMAGE_SIZES}">{img}</picture>')
+
+    return _IMG.sub(expand, text)
+
+
+def _write_compressed(path, data):
+    """Write `.gz`/`.br` siblings of `path` when they are smaller than `data`."""
+    written = []
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, packed in variants:
+        if len(packed) < len(data):
+            sibling = path.with_name(path.name + suffix)
+            sibling.write_bytes(packed)
+            written.append(sibling)
+    return written
+
+
+def build_site(src=DOCS_DIR, out=SITE_DIR, precompress=True):
+    """
+    Build the deployable copy of the docs site.
+
+    Parameters:
+    -----------
+    src : str or Path
+        Site sources (`docs/`)
+    out : str or Path
+        Output directory; replaced on every build
+    precompress : bool
+        Write `.gz`/`.br` siblings; only useful on hosts that serve them
+
+    Returns:
+    --------
+    dict
+        The asset manifest (source path -> built path)
+    """
+    src, out = Path(src).resolve(), Path(out).resolve()
+    if out == src or src in out.parents or out in src.parents:
+        raise ValueError(f"Output directory {out} must be outside the sources {src}")
+    if precompress and brotli is None:
+        print("brotli not installed; writing gzip siblings only")
+
+    files = list(_source_files(src))
+    rank = {suffix: i for i, suffix in enumerate(FINGERPRINT_SUFFIXES)}
+    assets = sorted((p for p in files if p.suffix.lower() in rank),
+                    key=lambda p: (rank[p.suffix.lower()], len(p.parts), p.as_posix()))
+    assets = _dependency_order(src, assets)
+    others = [p for p in files if p.suffix.lower() not in rank]
+
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    mapping, by_digest, outputs = {}, {}, {}
+    for path in assets:
+        data = (src / path).read_bytes()
+        if path.suffix.lower() in REWRITE_SUFFIXES:
+            data = rewrite_references(data.decode('utf-8'), path, mapping).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in by_digest:
+            # Same content as an earlier file: share its built copy
+            mapping[path.as_posix()] = by_digest[digest]
+            continue
+        built = fingerprinted_name(path, data).as_posix()
+        mapping[path.as_posix()] = by_digest[digest] = built
+        outputs[built] = data
+
+    for path in others:
+        data = (src / path).read_bytes()
+        if path.suffix.lower() in REWRITE_SUFFIXES:
+            text = data.decode('utf-8')
+            if path.suffix.lower() == '.html':
+                text = responsive_images(text, path, src)
+            data = rewrite_references(text, path, mapping).encode('utf-8')
+        outputs[path.as_posix()] = data
+
+    manifest = dict(sorted(mapping.items()))
+    outputs[MANIFEST_NAME] = json.dumps(manifest, indent=2).encode('utf-8')
+
+    source_bytes = sum((src / p).stat().st_size for p in files)
+    compressed = []
+    for name, data in outputs.items():
+        target = out / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        if precompress and target.suffix.lower() in COMPRESS_SUFFIXES:
+            compressed += _write_compressed(target, data)
+
+    built_bytes = sum(len(data) for data in outputs.values())
+    print(f"Built {len(outputs)} file(s) into {out}: {source_bytes / 1e6:.1f} MB -> {built_bytes / 1e6:.1f} MB "
+          f"({len(assets) - len(by_digest)} duplicate asset(s) dropped, {len(compressed)} precompressed sibling(s))")
+    return manifest
@@ -0,0 +1,199 @@
+"""
+Mergeable quantile sketches for income brackets and percentile annotations.
+
+`pd.qcut` and `Series.quantile` sort the whole column. `QuantileSketch` is a
+KLL-style sketch (Karnin, Lang and Liberty, 2016): values are appended to a
+stack of compactors, and whenever a level overflows it is sorted and every
+other item is promoted to the next level with twice the weight. Memory is
+O(k log(n / k)) and two sketches merge by concatenating their levels, so
+chunks or worker processes can each build one and combine them at the end.
+
+The rank error is about `epsilon(k)` of n with high probability; `k` is
+chosen from a requested error bound with `k_for_epsilon`. The compaction
+coin flips use a seeded generator so a run is reproducible. While no level
+has overflowed (n up to about k) the sketch holds every value and its
+quantiles are exact ranks.
+
+`quantile`, `median` and `qcut` take `eps=None` to use the exact pandas
+functions, so callers can switch backends with one argument.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Default normalized rank error when a sketch is requested without a bound
+DEFAULT_EPSILON = 0.01
+
+# Capacity decay between compactor levels
+_DECAY = 2 / 3
+_MIN_CAPACITY = 8
+
+
+def epsilon(k):
+    """Approximate normalized rank error (99% confidence) of a sketch with parameter `k`."""
+    return 2.296 / k ** 0.9723
+
+
+def k_for_epsilon(eps):
+    """Smallest `k` whose `epsilon(k)` is at most `eps`."""
+    return max(_MIN_CAPACITY, math.ceil((2.296 / eps) ** (1 / 0.9723)))
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantiles of a stream of numbers.
+
+    Attributes:
+    -----------
+    k : int
+        Capacity of the top compactor; larger is more accurate
+    n : int
+        Number of (non-missing) values seen
+    min, max : float
+        Exact extremes of the values seen
+    """
+
+    def __init__(self, eps=DEFAULT_EPSILON, k=None, seed=0):
+        self.k = k if k is not None else k_for_epsilon(eps)
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def epsilon(self):
+        """Rank error bound of this sketch."""
+        return epsilon(self.k)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(_MIN_CAPACITY, int(math.ceil(self.k * _DECAY ** depth)))
+
+    def update(self, values):
+        """Add an array of values (NaN is ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.k = max(self.k, other.k)
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            items = self._levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd leftover stays behind so the total weight is preserved
+                keep = items[:len(items) % 2]
+                pairs = items[len(keep):]
+                promoted = pairs[self._rng.integers(2)::2]
+                self._levels[h] = keep
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+
+    def _weighted(self):
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=float)
+                                  for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s) for `q` in [0, 1].
+
+        q=0 and q=1 return the exact minimum and maximum.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            result = np.full(len(qs), np.nan)
+        else:
+            items, cumulative = self._weighted()
+            ranks = qs * cumulative[-1]
+            result = items[np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)]
+            result = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, result))
+        return result if np.ndim(q) else float(result[0])
+
+
+def sketch_of(values, eps=DEFAULT_EPSILON, chunk_size=None):
+    """Build a sketch from an array, optionally feeding it in chunks."""
+    sketch = QuantileSketch(eps)
+    values = np.asarray(values, dtype=float)
+    step = chunk_size or max(len(values), 1)
+    for start in range(0, len(values), step):
+        sketch.update(values[start:start + step])
+    return sketch
+
+
+def quantile(values, q, eps=None):
+    """
+    Quantile of `values`: exact (`Series.quantile`) when `eps` is None,
+    otherwise from a sketch with rank error `eps`.
+    """
+    if eps is None:
+        return pd.Series(values).quantile(q)
+    return sketch_of(values, eps).quantile(q)
+
+
+def median(values, eps=None):
+    """Median of `values`: exact (`Series.median`) when `eps` is None; see `quantile`."""
+    if eps is None:
+        return pd.Series(values).median()
+    return sketch_of(values, eps).quantile(0.5)
+
+
+def qcut(values, q, labels=None, eps=None, sketch=None):
+    """
+    Quantile-based discretization like `pd.qcut`.
+
+    With `eps` (or a prebuilt, possibly merged, `sketch`) the bin edges come
+    from the sketch and the values are assigned with `pd.cut`; the outer
+    edges are the exact minimum and maximum so every value falls in a bin.
+
+    Parameters:
+    -----------
+    values : Series or array-like
+        Values to discretize
+    q : int
+        Number of equal-frequency bins
+    labels : list, optional
+        Bin labels, as in `pd.qcut`
+    eps : float, optional
+        Rank error of the sketch; exact `pd.qcut` when None and no sketch
+    sketch : QuantileSketch, optional
+        Sketch to take the edges from instead of building one from `values`
+    """
+    if eps is None and sketch is None:
+        return pd.qcut(values, q=q, labels=labels)
+    if sketch is None:
+        sketch = sketch_of(values, eps)
+    edges = sketch.quantile(np.linspace(0, 1, q + 1))
+    # Ties in the data can produce repeated edges; nudge them so bins stay ordered
+    edges = np.maximum.accumulate(edges)
+    for i in range(1, len(edges)):
+        if edges[i] <= edges[i - 1]:
+            edges[i] = np.nextafter(edges[i - 1], np.inf)
+    return pd.cut(values, bins=edges, labels=labels, include_lowest=True)
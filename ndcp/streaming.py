@@ -0,0 +1,166 @@
+"""
+Out-of-core per-group statistics for data that does not fit in memory.
+
+`GroupStats` keeps count, mean, M2 (sum of squared deviations), min and max
+of each measure per group. A chunk is summarized with one groupby and merged
+into the running totals with the pairwise update of Chan et al., the
+parallel form of Welford's algorithm. Accumulators built from different
+chunks, files or worker processes merge the same way, and memory follows the
+number of groups instead of the number of rows.
+
+`iter_chunks` streams the workbook with numeric columns coerced, so a chunk
+in which a column happens to be empty still comes back as float.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .cube import AggregateCube
+from .ingest import CHUNK_SIZE, iter_workbook_chunks
+from .lookup import _plain_index
+from .paths import WORKBOOK_PATH
+from .schema import INTEGER_COLUMNS, MEASURE_COLUMNS
+
+_NUMERIC_COLUMNS = set(INTEGER_COLUMNS) | set(MEASURE_COLUMNS)
+
+
+def iter_chunks(path=WORKBOOK_PATH, columns=None, years=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream the workbook like `iter_workbook_chunks`, with numeric columns as numbers.
+
+    Columns listed in `ndcp.schema` as integers or measures are converted with
+    `pd.to_numeric`; empty cells become NaN.
+    """
+    for chunk in iter_workbook_chunks(path, columns, years, chunk_size):
+        chunk = chunk.infer_objects()
+        for col in chunk.columns:
+            if col in _NUMERIC_COLUMNS:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        yield chunk
+
+
+class GroupStats:
+    """
+    Mergeable count, mean, M2, min and max of each measure per group.
+
+    Attributes:
+    -----------
+    keys : list of str
+        Grouping columns
+    measures : list of str
+        Summarized columns
+    count, mean, m2, min, max : DataFrame
+        One row per group (plain, non-categorical index) and one column per
+        measure; `m2` is the sum of squared deviations from the mean
+    """
+
+    def __init__(self, keys, measures):
+        self.keys = list(keys)
+        self.measures = list(measures)
+        empty = pd.DataFrame(columns=self.measures, dtype='float64')
+        self.count = self.mean = self.m2 = self.min = self.max = empty
+
+    def update(self, chunk):
+        """Fold one chunk of rows into the accumulators."""
+        values = chunk[self.measures].astype('float64')
+        grouped = pd.concat([chunk[self.keys], values], axis=1).groupby(
+            self.keys, observed=True, sort=False)[self.measures]
+        count = grouped.count().astype('float64')
+        part = {
+            'count': count,
+            'mean': grouped.mean(),
+            'm2': grouped.var(ddof=0).fillna(0.0) * count,
+            'min': grouped.min(),
+            'max': grouped.max(),
+        }
+        self._merge({name: _plain_index(frame) for name, frame in part.items()})
+        return self
+
+    def merge(self, other):
+        """Fold another `GroupStats` over the same keys and measures into this one."""
+        self._merge({name: getattr(other, name) for name in ('count', 'mean', 'm2', 'min', 'max')})
+        return self
+
+    def _merge(self, part):
+        if self.count.empty:
+            for name, frame in part.items():
+                setattr(self, name, frame.astype('float64'))
+            return
+        index = self.count.index.union(part['count'].index)
+        a = {name: getattr(self, name).reindex(index) for name in ('count', 'mean', 'm2', 'min', 'max')}
+        b = {name: frame.reindex(index) for name, frame in part.items()}
+
+        na = a['count'].fillna(0.0).to_numpy()
+        nb = b['count'].fillna(0.0).to_numpy()
+        ma = np.nan_to_num(a['mean'].to_numpy())
+        mb = np.nan_to_num(b['mean'].to_numpy())
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mb - ma
+            mean = np.where(n > 0, ma + delta * nb / n, np.nan)
+            m2 = (np.nan_to_num(a['m2'].to_numpy()) + np.nan_to_num(b['m2'].to_numpy())
+                  + np.where(n > 0, delta ** 2 * na * nb / n, 0.0))
+
+        frame = lambda arr: pd.DataFrame(arr, index=index, columns=self.measures)
+        self.count = frame(n)
+        self.mean = frame(mean)
+        self.m2 = frame(m2)
+        self.min = frame(np.fmin(a['min'].to_numpy(dtype=float), b['min'].to_numpy(dtype=float)))
+        self.max = frame(np.fmax(a['max'].to_numpy(dtype=float), b['max'].to_numpy(dtype=float)))
+
+    def describe(self, measure):
+        """Count, mean, sample standard deviation (ddof=1), min and max of one measure per group."""
+        n = self.count[measure]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2[measure] / (n - 1).where(n > 1))
+        result = pd.DataFrame({
+            'count': n.astype('int64'),
+            'mean': self.mean[measure],
+            'std': std,
+            'min': self.min[measure],
+            'max': self.max[measure],
+        }).sort_index()
+        result.index.names = self.keys
+        return result
+
+    def to_cube(self):
+        """Convert the accumulators into an `AggregateCube` over the same groups."""
+        index = self.count.index
+        if not isinstance(index, pd.MultiIndex):
+            index = pd.MultiIndex.from_arrays([index])
+        index = index.set_names(self.keys)
+
+        total = self.mean.fillna(0.0) * self.count
+        stats = {
+            'count': self.count,
+            'sum': total,
+            'sumsq': self.m2 + total * self.mean.fillna(0.0),
+            'min': self.min,
+            'max': self.max,
+        }
+        cells = pd.concat({name: frame.set_axis(index) for name, frame in stats.items()}, axis=1)
+        cells = cells.swaplevel(axis=1).sort_index(axis=1).sort_index()
+        return AggregateCube(cells, self.keys, self.measures)
+
+
+def stream_group_stats(chunks, keys, measures, prepare=None):
+    """
+    Accumulate `GroupStats` over an iterable of chunks.
+
+    Parameters:
+    -----------
+    chunks : iterable of DataFrame
+        For example `iter_chunks(path, columns)`
+    keys, measures : list of str
+        Grouping columns and summarized columns
+    prepare : callable, optional
+        Applied to each chunk first (imputation, derived columns, ...)
+
+    Returns:
+    --------
+    GroupStats
+    """
+    stats = GroupStats(keys, measures)
+    for chunk in chunks:
+        stats.update(prepare(chunk) if prepare is not None else chunk)
+    return stats
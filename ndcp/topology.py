@@ -0,0 +1,236 @@
+"""
+TopoJSON export of the boundary shapefiles for the browser maps.
+
+The web dashboard draws its maps with plotly's built-in
+`locationmode='USA-states'`, which has no counties, and the shapefiles
+bundled with the project are never shipped to the site. `write_topology`
+converts a shapefile into TopoJSON (https://github.com/topojson/topojson-specification)
+at every level of detail in `ndcp.geometry.LODS`:
+
+* coordinates are quantized to an integer grid (`QUANTIZATION` cells across
+  the bounding box, coarser for the coarser levels);
+* every border shared by two shapes is stored once, as an arc, and the
+  shapes refer to their arcs by index (negative for reversed);
+* arc points are delta encoded: small integers that compress well.
+
+The levels come from the coverage-simplified geometry cache, in which
+neighboring shapes keep identical borders, so the arcs are shared at every
+level. `docs/js/ndcp-topology.js` decodes a file back into GeoJSON features
+for plotly's `geojson` choropleths.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .adjacency import STATE_KEY
+from .cache import write_if_changed
+from .geometry import LODS, load_shapes
+from .paths import COUNTY_SHAPEFILE, REPO_ROOT, STATE_SHAPEFILE
+
+TOPOLOGY_DIR = REPO_ROOT / 'docs' / 'data' / 'topology'
+
+# Grid cells across the bounding box at each level of detail; one cell stays
+# below half the level's simplification tolerance over the 360 degrees the
+# U.S. files span (Alaska crosses the antimeridian)
+QUANTIZATION = {
+    'full': 1_000_000,
+    'high': 100_000,
+    'medium': 30_000,
+    'low': 10_000,
+}
+
+# Layers exported by default: name -> (shapefile, key column, properties kept)
+LAYERS = {
+    'states': (STATE_SHAPEFILE, STATE_KEY, ['NAME', 'STATEFP']),
+    'counties': (COUNTY_SHAPEFILE, 'GEOID', ['NAME', 'STATEFP']),
+}
+
+
+def _rings(geometry):
+    """Polygons of a (multi)polygon as lists of rings, exterior first."""
+    if geometry is None or geometry.is_empty:
+        return []
+    polygons = geometry.geoms if geometry.geom_type == 'MultiPolygon' else [geometry]
+    return [[ring.coords for ring in [p.exterior, *p.interiors]] for p in polygons]
+
+
+def _quantize_ring(coords, translate, scale):
+    """Ring on the integer grid, without repeated points or the closing point."""
+    points = np.round((np.asarray(coords)[:, :2] - translate) / scale).astype(np.int64)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    points = points[keep]
+    if len(points) > 1 and tuple(points[0]) == tuple(points[-1]):
+        points = points[:-1]
+    return [tuple(p) for p in points.tolist()]
+
+
+def _junctions(rings):
+    """Points where shapes meet or part: their neighbors differ between occurrences."""
+    neighbors, junctions = {}, set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            pair = tuple(sorted((ring[i - 1], ring[(i + 1) % n])))
+            seen = neighbors.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut(ring, junctions):
+    """
+    Split a closed ring into arcs at its junctions (each arc includes both ends).
+
+    Returns the arcs and whether the ring had no junction, in which case its
+    single arc is the whole ring.
+    """
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        return [ring + ring[:1]], True
+    start = cuts[0]
+    rotated = ring[start:] + ring[:start] + [ring[start]]
+    bounds = [i - start for i in cuts] + [len(ring)]
+    return [rotated[a:b + 1] for a, b in zip(bounds[:-1], bounds[1:])], False
+
+
+def _canonical(arc, whole):
+    """
+    Lookup keys of an arc, forward and reversed.
+
+    A whole ring may be stored starting anywhere, so it is rotated to its
+    smallest point first; both copies of a ring shared whole (an enclave)
+    then produce the same arc.
+    """
+    if not whole:
+        return tuple(arc), tuple(reversed(arc))
+    body = arc[:-1]
+    start = body.index(min(body))
+    forward = body[start:] + body[:start]
+    backward = list(reversed(forward))
+    back_start = backward.index(min(backward))
+    backward = backward[back_start:] + backward[:back_start]
+    return tuple(forward + forward[:1]), tuple(backward + backward[:1])
+
+
+def _delta(arc):
+    first = np.asarray(arc[0])
+    steps = np.diff(np.asarray(arc), axis=0)
+    return [first.tolist()] + steps.tolist()
+
+
+def build_topology(gdf, name, key, properties=(), quantization=QUANTIZATION['full']):
+    """
+    Convert polygons into a TopoJSON topology with shared, delta-encoded arcs.
+
+    Parameters:
+    -----------
+    gdf : GeoDataFrame
+        Polygons and multipolygons (in longitude/latitude)
+    name : str
+        Name of the topology object holding the shapes
+    key : str
+        Column used as each shape's `id`
+    properties : list of str
+        Columns copied into each shape's properties
+    quantization : int
+        Number of grid cells across the bounding box
+
+    Returns:
+    --------
+    dict
+        TopoJSON topology
+    """
+    x0, y0, x1, y1 = (float(v) for v in gdf.total_bounds)
+    translate = np.array([x0, y0])
+    scale = np.array([max(x1 - x0, 1e-12), max(y1 - y0, 1e-12)]) / (quantization - 1)
+
+    shapes = []
+    for geometry in gdf.geometry:
+        polygons = []
+        for rings in _rings(geometry):
+            quantized = [_quantize_ring(ring, translate, scale) for ring in rings]
+            # Rings that collapse on the grid are dropped; so is a polygon whose exterior did
+            if len(quantized[0]) >= 3:
+                polygons.append([ring for ring in quantized if len(ring) >= 3])
+        shapes.append(polygons)
+
+    junctions = _junctions([ring for polygons in shapes for rings in polygons for ring in rings])
+    arcs, index = [], {}
+
+    def arc_ids(ring):
+        ids = []
+        pieces, whole = _cut(ring, junctions)
+        for arc in pieces:
+            forward, backward = _canonical(arc, whole)
+            if forward in index:
+                ids.append(index[forward])
+            elif backward in index:
+                ids.append(~index[backward])
+            else:
+                index[forward] = len(arcs)
+                arcs.append(list(forward))
+                ids.append(index[forward])
+        return ids
+
+    geometries = []
+    for (_, row), polygons in zip(gdf.iterrows(), shapes):
+        entry = {'id': str(row[key]),
+                 'properties': {p: row[p].item() if isinstance(row[p], np.generic) else row[p]
+                                for p in properties if p in row}}
+        if not polygons:
+            entry['type'] = None
+        elif len(polygons) == 1:
+            entry.update(type='Polygon', arcs=[arc_ids(ring) for ring in polygons[0]])
+        else:
+            entry.update(type='MultiPolygon', arcs=[[arc_ids(ring) for ring in rings] for rings in polygons])
+        geometries.append(entry)
+
+    return {
+        'type': 'Topology',
+        'bbox': [x0, y0, x1, y1],
+        'transform': {'scale': scale.tolist(), 'translate': translate.tolist()},
+        'objects': {name: {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': [_delta(arc) for arc in arcs],
+    }
+
+
+def topology_path(name, lod, out_dir=TOPOLOGY_DIR):
+    """Location of one layer at one level of detail: `<name>-<lod>.json`."""
+    return Path(out_dir) / f"{name}-{lod}.json"
+
+
+def write_topology(shapefile, name, key, properties=(), lods=None, out_dir=TOPOLOGY_DIR):
+    """
+    Write a shapefile as TopoJSON at several levels of detail.
+
+    Parameters:
+    -----------
+    shapefile : str or Path
+        Boundary shapefile
+    name : str
+        Layer name, used for the file names and the topology object
+    key : str
+        Column used as each shape's `id`
+    properties : list of str
+        Columns copied into each shape's properties
+    lods : list of str, optional
+        Levels of `ndcp.geometry.LODS` to write; defaults to all of them
+    out_dir : str or Path
+        Output directory
+
+    Returns:
+    --------
+    dict
+        Maps each level to its file and size in bytes
+    """
+    written = {}
+    for lod in lods or list(LODS):
+        gdf = load_shapes(shapefile, lod)
+        topology = build_topology(gdf, name, key, properties, QUANTIZATION[lod])
+        path = topology_path(name, lod, out_dir)
+        write_if_changed(path, json.dumps(topology, separators=(',', ':')))
+        written[lod] = (path, path.stat().st_size)
+    return written
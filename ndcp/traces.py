@@ -0,0 +1,60 @@
+"""
+Vectorized inputs for the dashboard traces.
+
+The plotly dashboard used to derive its trace arrays row by row, with
+`DataFrame.apply(..., axis=1)` and one boolean mask over the whole frame per
+income level for the trend lines. The helpers here build the same arrays
+from whole columns at once: a single stable sort replaces the per-group
+masks, and the ratios and scaled sizes are plain array arithmetic. Trace
+building then costs one pass per chart, whatever the number of states,
+brackets or years.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def percent_ratio(numerator, denominator):
+    """`numerator / denominator` in percent, elementwise."""
+    return (np.asarray(numerator, dtype=float) / np.asarray(denominator, dtype=float)) * 100
+
+
+def scale_range(values, low, high):
+    """
+    Linearly map values onto [low, high] (for marker sizes).
+
+    The minimum maps to `low` and the maximum to `high`.
+    """
+    values = np.asarray(values, dtype=float)
+    vmin, vmax = np.nanmin(values), np.nanmax(values)
+    return low + (values - vmin) * (high - low) / (vmax - vmin)
+
+
+def split_by(frame, column, order=None):
+    """
+    Split a frame into one sub-frame per value of `column` in a single pass.
+
+    Replaces `frame[frame[column] == value]` for every value, which scans
+    the whole frame once per group.
+
+    Parameters:
+    -----------
+    frame : DataFrame
+        Rows to split; row order within each group is preserved
+    column : str
+        Grouping column
+    order : list, optional
+        Group values to return, in this order; groups without rows come back
+        empty. Defaults to the sorted distinct values.
+
+    Returns:
+    --------
+    dict
+        Maps each group value to its rows
+    """
+    keys = np.asarray(frame[column], dtype=object)
+    levels = list(order) if order is not None else sorted(pd.unique(keys))
+    codes = pd.Index(levels, dtype=object).get_indexer(keys)
+    rows = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[rows], np.arange(len(levels) + 1))
+    return {level: frame.iloc[rows[bounds[i]:bounds[i + 1]]] for i, level in enumerate(levels)}
@@ -0,0 +1,34 @@
+import shutil
+
+from ndcp.adjacency import adjacency_cache_path, load_adjacency
+from ndcp.paths import STATE_SHAPEFILE
+
+
+def copy_shapefile(dest):
+    for part in STATE_SHAPEFILE.parent.glob(f"{STATE_SHAPEFILE.stem}.*"):
+        shutil.copy(part, dest / part.name)
+    return dest / STATE_SHAPEFILE.name
+
+
+def test_state_neighbors(tmp_path):
+    graph = load_adjacency(copy_shapefile(tmp_path), cache_dir=tmp_path / 'cache')
+
+    assert set(graph.neighbors('IN')) == {'IL', 'KY', 'MI', 'OH'}
+    # Rook contiguity: Four Corners states touch only at a point
+    assert 'AZ' not in graph.neighbors('CO')
+    assert graph.neighbors('HI') == []
+
+
+def test_attribute_edits_rebuild_and_prune(tmp_path):
+    shapefile, cache = copy_shapefile(tmp_path), tmp_path / 'cache'
+    load_adjacency(shapefile, cache_dir=cache)
+    before = adjacency_cache_path(shapefile, 'STUSPS', cache)
+
+    # Same geometry, edited attribute table
+    dbf = shapefile.with_suffix('.dbf')
+    dbf.write_bytes(dbf.read_bytes().replace(b'Indiana', b'Indiane'))
+    after = adjacency_cache_path(shapefile, 'STUSPS', cache)
+    load_adjacency(shapefile, cache_dir=cache)
+
+    assert after != before
+    assert list(cache.glob('*-adjacency.npz')) == [after]
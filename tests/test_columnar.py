@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ndcp.columnar import (COUNTY_COLUMNS, KEY, NUMBER, columnar_json, county_export_frame,
+                           encode_column, read_columnar, write_columnar)
+
+
+def county_rows(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'State_Abbreviation': pd.Categorical(rng.choice(['AL', 'IN', 'NM', 'TX', 'WY'], n)),
+        'County_FIPS_Code': rng.integers(1001, 56045, n).astype('int32'),
+        'StudyYear': rng.integers(2008, 2019, n).astype('int16'),
+        'MCInfant': rng.uniform(80, 400, n),
+        'MCToddler': rng.uniform(80, 400, n),
+        'MCPreschool': rng.uniform(80, 400, n),
+        'MHI_2018': rng.uniform(25_000, 140_000, n),
+        'TotalPop': rng.integers(0, 10_000_000, n).astype('int32'),
+        'H_Under6_BothWork': rng.integers(0, 500_000, n).astype('int32'),
+        'FLFPR_20to64': rng.uniform(40, 90, n),
+    })
+    frame.loc[::7, 'MCInfant'] = np.nan
+    frame.loc[3, 'MHI_2018'] = 0.0  # infinite cost burden
+    return county_export_frame(frame)
+
+
+@pytest.mark.parametrize('rows', [0, 1, 5, 200, 3001])
+def test_round_trip(tmp_path, rows):
+    frame = county_rows(max(rows, 1)).iloc[:rows].reset_index(drop=True)
+    path = tmp_path / 'county_costs.bin'
+    header = write_columnar(frame, path)
+    back = read_columnar(path)
+
+    assert header['rows'] == rows == len(back)
+    assert list(back.columns) == list(COUNTY_COLUMNS)
+    for name, (kind, _, scale) in COUNTY_COLUMNS.items():
+        if kind == KEY:
+            assert back[name].tolist() == [v.item() if isinstance(v, np.generic) else v
+                                           for v in np.asarray(frame[name], dtype=object)]
+        else:
+            expected = frame[name].to_numpy(dtype=float)
+            expected = np.where(np.isfinite(expected), expected, np.nan)
+            np.testing.assert_allclose(back[name], expected, atol=0.5 / scale + 1e-9, equal_nan=True)
+
+
+def test_columns_start_where_the_header_says(tmp_path):
+    path = tmp_path / 'county_costs.bin'
+    header = write_columnar(county_rows(), path)
+    raw = path.read_bytes()
+    header_len = int.from_bytes(raw[8:12], 'little')
+    first = header['columns'][0]
+    assert first['offset'] == -(-(12 + header_len) // 8) * 8
+    for entry in header['columns']:
+        assert entry['offset'] % 8 == 0
+
+
+def test_missing_and_infinite_values_use_the_missing_code():
+    encoded, entry = encode_column([1.5, np.nan, np.inf, -np.inf], NUMBER, 'i2', 100)
+    assert encoded.tolist() == [150, entry['missing'], entry['missing'], entry['missing']]
+
+
+def test_out_of_range_values_are_rejected():
+    with pytest.raises(ValueError):
+        encode_column([70_000], NUMBER, 'u2', 1)
+    with pytest.raises(ValueError):
+        # The largest code is reserved for missing values
+        encode_column([65_535], NUMBER, 'u2', 1)
+
+
+def test_json_fallback_matches_binary(tmp_path):
+    import json
+
+    frame = county_rows()
+    path = tmp_path / 'county_costs.bin'
+    write_columnar(frame, path)
+    back = read_columnar(path)
+    fallback = json.loads(columnar_json(frame))
+    for name, values in fallback['columns'].items():
+        binary = [None if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in back[name]]
+        if COUNTY_COLUMNS[name][0] == NUMBER:
+            np.testing.assert_allclose(np.array(values, dtype=float), np.array(binary, dtype=float),
+                                       atol=1e-9, equal_nan=True)
+        else:
+            assert values == binary
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ndcp.covariance import CovarianceAccumulator
+
+MEASURES = ['MCInfant', 'MCToddler', 'MHI_2018', 'TotalPop']
+
+
+def county_rows(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(25_000, 140_000, n)
+    frame = pd.DataFrame({
+        'State_Abbreviation': pd.Categorical(rng.choice(['IL', 'IN', 'NM', 'TX', 'WY'], n)),
+        'StudyYear': rng.integers(2008, 2019, n).astype('int16'),
+        'Urban_Rural': rng.choice(['Urban', 'Rural'], n, p=[0.2, 0.8]),
+        'MCInfant': income / 250 + rng.normal(0, 40, n),
+        'MCToddler': income / 300 + rng.normal(0, 30, n),
+        'MHI_2018': income,
+        # Large magnitude with a small spread, where naive sums lose precision
+        'TotalPop': 5e7 + rng.normal(0, 1e3, n),
+    })
+    for col, frac in [('MCInfant', 0.1), ('MCToddler', 0.25), ('MHI_2018', 0.05)]:
+        frame.loc[rng.random(n) < frac, col] = np.nan
+    return frame
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return county_rows()
+
+
+def test_covariance_matches_pandas(rows):
+    acc = CovarianceAccumulator.from_frame(rows, MEASURES, dims=['State_Abbreviation', 'StudyYear'])
+
+    pd.testing.assert_frame_equal(acc.corr(), rows[MEASURES].corr(), atol=1e-10)
+    pd.testing.assert_frame_equal(acc.cov(), rows[MEASURES].cov(), rtol=1e-7)
+    subset = ['MCInfant', 'MHI_2018']
+    selected = rows[rows['StudyYear'].isin([2010, 2011]) & (rows['State_Abbreviation'] == 'TX')]
+    pd.testing.assert_frame_equal(acc.corr(subset, where={'StudyYear': [2010, 2011], 'State_Abbreviation': 'TX'}),
+                                  selected[subset].corr(), atol=1e-10)
+
+
+def test_streamed_and_merged_covariance_match(rows):
+    streamed = CovarianceAccumulator(MEASURES, dims=['StudyYear'])
+    for start in range(0, len(rows), 300):
+        streamed.update(rows.iloc[start:start + 300])
+    # Accumulators over halves with different shifts, merged
+    merged = CovarianceAccumulator.from_frame(rows.iloc[:700], MEASURES, dims=['StudyYear'])
+    merged.merge(CovarianceAccumulator.from_frame(rows.iloc[700:], MEASURES, dims=['StudyYear']))
+
+    expected = rows[MEASURES].corr()
+    pd.testing.assert_frame_equal(streamed.corr(), expected, atol=1e-10)
+    pd.testing.assert_frame_equal(merged.corr(), expected, atol=1e-10)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ndcp.cube import AggregateCube
+
+MEASURES = ['MCInfant', 'MCToddler', 'MHI_2018', 'TotalPop']
+DIMS = ['State_Abbreviation', 'StudyYear', 'Urban_Rural']
+
+
+def county_rows(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(25_000, 140_000, n)
+    frame = pd.DataFrame({
+        'State_Abbreviation': pd.Categorical(rng.choice(['IL', 'IN', 'NM', 'TX', 'WY'], n)),
+        'StudyYear': rng.integers(2008, 2019, n).astype('int16'),
+        'Urban_Rural': rng.choice(['Urban', 'Rural'], n, p=[0.2, 0.8]),
+        'MCInfant': income / 250 + rng.normal(0, 40, n),
+        'MCToddler': income / 300 + rng.normal(0, 30, n),
+        'MHI_2018': income,
+        'TotalPop': rng.integers(1_000, 10_000_000, n).astype('float64'),
+    })
+    for col, frac in [('MCInfant', 0.1), ('MCToddler', 0.25), ('MHI_2018', 0.05)]:
+        frame.loc[rng.random(n) < frac, col] = np.nan
+    return frame
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return county_rows()
+
+
+@pytest.fixture(scope='module')
+def cube(rows):
+    return AggregateCube.from_frame(rows, MEASURES, dims=DIMS)
+
+
+@pytest.mark.parametrize('by', [['State_Abbreviation'], ['StudyYear'], ['State_Abbreviation', 'Urban_Rural']])
+def test_cube_matches_groupby(rows, cube, by):
+    grouped = rows.groupby(by, observed=True)
+
+    pd.testing.assert_frame_equal(cube.mean(by), grouped[MEASURES].mean(), check_names=False, rtol=1e-12)
+    for measure in ['MCInfant', 'MHI_2018']:
+        described = cube.describe(by, measure)
+        np.testing.assert_allclose(described['std'], grouped[measure].std(), rtol=1e-9)
+        np.testing.assert_array_equal(described['count'], grouped[measure].count())
+        np.testing.assert_array_equal(described['min'], grouped[measure].min())
+        np.testing.assert_array_equal(described['max'], grouped[measure].max())
+
+
+def test_cube_filters_and_totals(rows, cube):
+    latest = rows[rows['StudyYear'] == 2018]
+    means = cube.mean('State_Abbreviation', ['MCInfant'], where={'StudyYear': 2018})
+    np.testing.assert_allclose(means['MCInfant'], latest.groupby('State_Abbreviation', observed=True)['MCInfant'].mean(),
+                               rtol=1e-12)
+
+    overall = cube.mean()
+    np.testing.assert_allclose(overall.iloc[0], rows[MEASURES].mean(), rtol=1e-12)
+    totals = cube.total('StudyYear', ['TotalPop'], where={'Urban_Rural': 'Urban'})
+    urban = rows[rows['Urban_Rural'] == 'Urban']
+    np.testing.assert_allclose(totals['TotalPop'], urban.groupby('StudyYear')['TotalPop'].sum(), rtol=1e-12)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from ndcp.partitions import read_partitions, sync_partitions
+
+
+def raw_rows(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'State_Abbreviation': rng.choice(['IN', 'NM', 'TX'], n),
+        'StudyYear': rng.integers(2008, 2012, n),
+        'MCInfant': rng.uniform(80, 400, n),
+    })
+    # Source labels that are neither sorted by year nor contiguous, as after filtering
+    return frame.set_axis(np.arange(n) * 3 + 5)
+
+
+def fingerprints_of(frame, tag=''):
+    return {int(year): f"{year}{tag}" for year in frame['StudyYear'].unique()}
+
+
+def test_rows_come_back_in_source_order(tmp_path):
+    frame = raw_rows()
+    rebuilt = sync_partitions(frame, fingerprints_of(frame), lambda rows: rows, tmp_path)
+
+    assert sorted(rebuilt) == sorted(frame['StudyYear'].unique().tolist())
+    pd.testing.assert_frame_equal(read_partitions(tmp_path), frame)
+
+
+def test_only_changed_years_are_rebuilt(tmp_path):
+    frame = raw_rows()
+    sync_partitions(frame, fingerprints_of(frame), lambda rows: rows, tmp_path)
+
+    changed = fingerprints_of(frame)
+    changed[2009] += '-new'
+    doubled = frame.assign(MCInfant=frame['MCInfant'] * 2)
+    rebuilt = sync_partitions(doubled, changed, lambda rows: rows, tmp_path)
+
+    expected = frame.copy()
+    in_2009 = expected['StudyYear'] == 2009
+    expected.loc[in_2009, 'MCInfant'] *= 2
+    assert rebuilt == [2009]
+    pd.testing.assert_frame_equal(read_partitions(tmp_path), expected)
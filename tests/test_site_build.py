@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from ndcp.site_build import MANIFEST_NAME, build_site
+
+
+def write(root, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def test_scripts_reference_the_built_names_of_later_scripts(tmp_path):
+    src, out = tmp_path / 'docs', tmp_path / 'site'
+    # a.js sorts before z.js but loads it, and z.js loads an image
+    write(src, {
+        'index.html': '<script src="js/a.js"></script>',
+        'js/a.js': "loadScript('js/z.js');",
+        'js/z.js': "img.src = 'images/map.png';",
+        'images/map.png': 'png',
+    })
+    manifest = build_site(src, out, precompress=False)
+
+    assert json.loads((out / MANIFEST_NAME).read_text()) == manifest
+    assert manifest['images/map.png'] in (out / manifest['js/z.js']).read_text()
+    assert manifest['js/z.js'] in (out / manifest['js/a.js']).read_text()
+    assert manifest['js/a.js'] in (out / 'index.html').read_text()
+    assert not list(out.rglob('*.gz'))
+
+
+def test_circular_references_are_rejected(tmp_path):
+    write(tmp_path / 'docs', {'a.js': "load('b.js');", 'b.js': "load('a.js');"})
+    with pytest.raises(ValueError, match='Circular'):
+        build_site(tmp_path / 'docs', tmp_path / 'site')
+
+
+def test_images_with_current_variants_get_a_picture(tmp_path):
+    from PIL import Image
+
+    from ndcp.image_variants import write_variants
+
+    src, out = tmp_path / 'docs', tmp_path / 'site'
+    write(src, {'page.html': '<img src="images/chart.png" alt="Chart"> <img src="images/stale.png">'})
+    (src / 'images').mkdir()
+    for name in ['chart.png', 'stale.png']:
+        Image.new('RGB', (1200, 800), 'navy').save(src / 'images' / name)
+    write_variants([src / 'images' / 'chart.png', src / 'images' / 'stale.png'], src / 'images' / 'variants')
+    # Re-rendered after its variants were written
+    Image.new('RGB', (1200, 800), 'teal').save(src / 'images' / 'stale.png')
+
+    manifest = build_site(src, out, precompress=False)
+    page = (out / 'page.html').read_text()
+
+    assert page.count('<picture>') == 1
+    for variant in ['chart-480w.webp', 'chart-960w.webp', 'chart-480w.png', 'chart-960w.png']:
+        built = manifest[f'images/variants/{variant}']
+        assert (out / built).exists() and built in page
+    assert f'<img src="{manifest["images/stale.png"]}">' in page
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from ndcp.sketch import QuantileSketch, epsilon, k_for_epsilon, sketch_of
+
+QS = np.linspace(0.01, 0.99, 99)
+
+
+def rank_error(sorted_values, estimates, qs):
+    """Distance of each estimate's rank range from the requested quantile, as a fraction of n."""
+    n = len(sorted_values)
+    below = np.searchsorted(sorted_values, estimates, side='left') / n
+    at_or_below = np.searchsorted(sorted_values, estimates, side='right') / n
+    return np.maximum(0, np.maximum(below - qs, qs - at_or_below))
+
+
+def prices(n, seed):
+    rng = np.random.default_rng(seed)
+    # Skewed, with many ties once rounded to whole dollars
+    return np.round(rng.lognormal(5, 0.5, n))
+
+
+def test_k_meets_the_requested_epsilon():
+    for eps in [0.001, 0.005, 0.01, 0.05, 0.2]:
+        assert epsilon(k_for_epsilon(eps)) <= eps
+
+
+@pytest.mark.parametrize('eps', [0.01, 0.05])
+@pytest.mark.parametrize('n', [50, 10_000, 200_000])
+def test_rank_error_within_epsilon(eps, n):
+    values = prices(n, seed=n)
+    sketch = sketch_of(values, eps, chunk_size=4096)
+
+    assert sketch.n == n
+    errors = rank_error(np.sort(values), sketch.quantile(QS), QS)
+    assert errors.max() <= eps
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+
+
+def test_small_inputs_are_exact():
+    values = prices(40, seed=1)
+    sketch = sketch_of(values, 0.01)
+    ranks = np.ceil(QS * len(values)).astype(int) - 1
+    np.testing.assert_array_equal(sketch.quantile(QS), np.sort(values)[ranks])
+
+
+@pytest.mark.parametrize('parts', [2, 7])
+def test_merged_sketches_stay_within_epsilon(parts):
+    eps = 0.01
+    values = prices(150_000, seed=parts)
+    sketches = [QuantileSketch(eps, seed=i).update(chunk) for i, chunk in enumerate(np.array_split(values, parts))]
+    merged = sketches[0]
+    for other in sketches[1:]:
+        merged.merge(other)
+
+    assert merged.n == len(values)
+    # The bound holds per quantile with 99% confidence: allow one of the 99 queries just past it
+    errors = rank_error(np.sort(values), merged.quantile(QS), QS)
+    assert (errors > eps).sum() <= 1
+    assert errors.max() <= 1.5 * eps
+
+
+def test_missing_values_are_ignored():
+    values = prices(5000, seed=3)
+    with_gaps = values.copy()
+    with_gaps[::10] = np.nan
+    sketch = sketch_of(with_gaps, 0.01)
+
+    present = np.sort(with_gaps[~np.isnan(with_gaps)])
+    assert sketch.n == len(present)
+    assert rank_error(present, sketch.quantile(QS), QS).max() <= 0.01
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ndcp.cube import AggregateCube
+from ndcp.streaming import GroupStats, stream_group_stats
+
+MEASURES = ['MCInfant', 'MHI_2018']
+KEYS = ['State_Abbreviation', 'StudyYear']
+
+
+def county_rows(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'State_Abbreviation': rng.choice(['IL', 'IN', 'NM', 'TX', 'WY'], n),
+        'StudyYear': rng.integers(2008, 2019, n),
+        'MCInfant': rng.uniform(80, 400, n),
+        'MHI_2018': rng.uniform(25_000, 140_000, n),
+    })
+    frame.loc[rng.random(n) < 0.1, 'MCInfant'] = np.nan
+    # A group that is missing entirely in every chunk
+    frame.loc[frame['State_Abbreviation'] == 'WY', 'MCInfant'] = np.nan
+    return frame
+
+
+def chunks(frame, size):
+    return (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+@pytest.mark.parametrize('size', [97, 1000, 5000])
+def test_streamed_stats_match_groupby(size):
+    rows = county_rows()
+    stats = stream_group_stats(chunks(rows, size), KEYS, MEASURES)
+    grouped = rows.groupby(KEYS)
+
+    for measure in MEASURES:
+        described = stats.describe(measure)
+        expected = grouped[measure]
+        np.testing.assert_array_equal(described['count'], expected.count())
+        np.testing.assert_allclose(described['mean'], expected.mean(), rtol=1e-12)
+        np.testing.assert_allclose(described['std'], expected.std(), rtol=1e-9)
+        np.testing.assert_array_equal(described['min'], expected.min())
+        np.testing.assert_array_equal(described['max'], expected.max())
+
+
+def test_merged_stats_match_one_pass():
+    rows = county_rows()
+    merged = GroupStats(KEYS, MEASURES).update(rows.iloc[:1200])
+    merged.merge(GroupStats(KEYS, MEASURES).update(rows.iloc[1200:]))
+    whole = GroupStats(KEYS, MEASURES).update(rows)
+
+    for measure in MEASURES:
+        pd.testing.assert_frame_equal(merged.describe(measure), whole.describe(measure), rtol=1e-12)
+
+
+def test_to_cube_matches_a_cube_of_the_rows():
+    rows = county_rows()
+    streamed = stream_group_stats(chunks(rows, 500), KEYS, MEASURES).to_cube()
+    direct = AggregateCube.from_frame(rows, MEASURES, dims=KEYS)
+
+    pd.testing.assert_frame_equal(streamed.mean('StudyYear'), direct.mean('StudyYear'), rtol=1e-12)
+    pd.testing.assert_frame_equal(streamed.std('State_Abbreviation'), direct.std('State_Abbreviation'), rtol=1e-9)
@@ -0,0 +1,101 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from ndcp.geometry import load_shapes
+from ndcp.paths import STATE_SHAPEFILE
+from ndcp.topology import QUANTIZATION, build_topology
+
+
+def decode_arcs(topology):
+    """Same decoding as decodeArcs in docs/js/ndcp-topology.js."""
+    scale = np.asarray(topology['transform']['scale'])
+    translate = np.asarray(topology['transform']['translate'])
+    return [np.cumsum(np.asarray(arc, dtype=float), axis=0) * scale + translate for arc in topology['arcs']]
+
+
+def ring_coordinates(ids, arcs):
+    """Same joining as ringCoordinates in docs/js/ndcp-topology.js."""
+    ring = []
+    for arc_id in ids:
+        points = arcs[~arc_id][::-1] if arc_id < 0 else arcs[arc_id]
+        ring.extend(points[1:] if ring else points)
+    return np.asarray(ring)
+
+
+def decode(topology, name):
+    """Shapes of a topology object as shapely geometries, keyed by id."""
+    arcs = decode_arcs(topology)
+    shapes = {}
+    for geometry in topology['objects'][name]['geometries']:
+        polygons = geometry['arcs'] if geometry['type'] == 'MultiPolygon' else [geometry['arcs']]
+        shapes[geometry['id']] = MultiPolygon([
+            Polygon(ring_coordinates(rings[0], arcs), [ring_coordinates(ids, arcs) for ids in rings[1:]])
+            for rings in polygons
+        ])
+    return shapes
+
+
+def arc_ids(geometry):
+    rings = geometry['arcs'] if geometry['type'] == 'Polygon' else [r for p in geometry['arcs'] for r in p]
+    return {i if i >= 0 else ~i for ring in rings for i in ring}
+
+
+@pytest.fixture
+def tiles():
+    # On a 0..10 grid with 11 cells every coordinate is quantized exactly
+    lake = box(5, 4, 7, 6)
+    return gpd.GeoDataFrame({
+        'key': ['west', 'east', 'lake', 'islands'],
+        'NAME': ['West', 'East', 'Lake', 'Islands'],
+        'geometry': [
+            box(0, 0, 4, 10),
+            Polygon(box(4, 0, 8, 10).exterior.coords, [lake.exterior.coords]),
+            lake,
+            MultiPolygon([box(9, 0, 10, 1), box(9, 9, 10, 10)]),
+        ],
+    })
+
+
+def test_round_trip(tiles):
+    topology = json.loads(json.dumps(build_topology(tiles, 'tiles', 'key', ['NAME'], quantization=11)))
+    decoded = decode(topology, 'tiles')
+
+    assert topology['transform']['scale'] == [1.0, 1.0]
+    for key, geometry in zip(tiles['key'], tiles.geometry):
+        assert decoded[key].equals(geometry), key
+    names = {g['id']: g['properties']['NAME'] for g in topology['objects']['tiles']['geometries']}
+    assert names == dict(zip(tiles['key'], tiles['NAME']))
+
+
+def test_shared_borders_are_stored_once(tiles):
+    topology = build_topology(tiles, 'tiles', 'key', quantization=11)
+    geometries = {g['id']: g for g in topology['objects']['tiles']['geometries']}
+
+    # The west/east border and the lake shore are each one arc, used by both sides
+    assert arc_ids(geometries['west']) & arc_ids(geometries['east'])
+    assert arc_ids(geometries['lake']) <= arc_ids(geometries['east'])
+    uses = [i for g in geometries.values() for i in arc_ids(g)]
+    assert sorted(set(uses)) == list(range(len(topology['arcs'])))
+    assert max(uses.count(i) for i in set(uses)) == 2
+    # Arcs are delta encoded as integers on the grid
+    assert all(isinstance(v, int) for arc in topology['arcs'] for point in arc for v in point)
+
+
+def test_states_decode_within_the_grid(tmp_path):
+    states = load_shapes(STATE_SHAPEFILE, 'low', cache_dir=tmp_path)
+    topology = build_topology(states, 'states', 'STUSPS', quantization=QUANTIZATION['low'])
+    decoded = decode(topology, 'states')
+    cell = max(topology['transform']['scale'])
+
+    assert set(decoded) == set(states['STUSPS'])
+    for key, geometry in zip(states['STUSPS'], states.geometry):
+        # Quantization moves each point by at most half a grid cell
+        assert decoded[key].hausdorff_distance(geometry) <= cell
+    # Neighbors share the arcs of their common border
+    geometries = {g['id']: g for g in topology['objects']['states']['geometries']}
+    assert arc_ids(geometries['IN']) & arc_ids(geometries['OH'])
+    assert not arc_ids(geometries['IN']) & arc_ids(geometries['TX'])